@@ -0,0 +1,68 @@
+"""Per-frame cost of each screen capture backend.
+
+    python -m benchmarks.bench_capture [--bbox L T R B] [--count N] [--archive FILE]
+
+Times grab() (the backend's NumPy frame) and grab_image() (the PIL image
+the capture loop uses) for every backend that works here, plus the bytes
+Python allocates per grab, which shows which backends reuse their
+buffer. The replay backend is included when --archive is given (or a
+synthetic archive is generated).
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from rust_capture.capture_backends import GDIBackend, MSSBackend, PILBackend, ReplayBackend
+from benchmarks.bench_ocr_backends import percentile
+from benchmarks.bench_ocr_pipeline import make_fixture
+
+
+def measure(fn, count):
+    fn()  # warm-up: first grab allocates buffers / opens handles
+    times = []
+    for _ in range(count):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(count):
+        fn()
+    allocated = (tracemalloc.get_traced_memory()[1] - before) / count
+    tracemalloc.stop()
+    return times, allocated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bbox", type=int, nargs=4, default=[580, 385, 1877, 1178])
+    parser.add_argument("--count", type=int, default=50)
+    parser.add_argument("--archive", help="frame archive for the replay backend")
+    args = parser.parse_args()
+
+    archive = args.archive or make_fixture(os.path.join(tempfile.mkdtemp(), "capture_fixture.zip"), 10)
+    factories = [
+        ("gdi", lambda: GDIBackend(args.bbox)),
+        ("mss", lambda: MSSBackend(args.bbox)),
+        ("pil", lambda: PILBackend(args.bbox)),
+        ("replay", lambda: ReplayBackend(None, archive)),
+    ]
+    print(f"{'backend':>8} {'call':>11} {'p50':>8} {'p95':>8} {'alloc/grab':>12}")
+    for name, factory in factories:
+        try:
+            backend = factory()
+            backend.grab()
+        except Exception as e:
+            print(f"{name:>8} skipped: {e}")
+            continue
+        for call in ("grab", "grab_image"):
+            times, allocated = measure(getattr(backend, call), args.count)
+            print(f"{name:>8} {call:>11} {percentile(times, 50):8.2f} {percentile(times, 95):8.2f} "
+                  f"{allocated / 1024:9.0f} KB")
+        backend.close()
+
+
+if __name__ == "__main__":
+    main()
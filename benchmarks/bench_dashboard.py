@@ -0,0 +1,164 @@
+"""Dashboard data path at scale: JSON load and tab refreshes under offscreen Qt.
+
+    python -m benchmarks.bench_dashboard [--sizes N ...] [--repeat N] [--seed S]
+        [--budget SECONDS] [--json FILE] [--compare BASELINE] [--tolerance F]
+
+For each size a seeded synthetic player_data.json (benchmarks.synthetic_data)
+is written and timed through load_data, TableTab.update_table,
+SearchTab.update_results, LeaderboardTab.refresh_data and
+DashboardTab.refresh_data. The tabs read the generated file
+(RUST_PLAYER_JSON is pointed at it), as they would the real one. A case
+whose single call would go over --budget at the next size, even scaling
+linearly, is skipped from there on and recorded as null.
+
+--json writes the results as a baseline; --compare reads one and reports
+each case's p50 against it, exiting with status 1 when any is more than
+--tolerance slower.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from benchmarks.bench_ocr_backends import percentile
+from benchmarks.synthetic_data import generate_players, write_json
+
+CASES = ("load_data", "table.update_table", "search.update_results",
+         "leaderboard.refresh_data", "dashboard.refresh_data")
+
+
+def load_modules(data_json):
+    """Import the dashboard with its data file redirected to data_json."""
+    os.environ["RUST_PLAYER_JSON"] = str(data_json)
+    from PySide6.QtWidgets import QApplication
+    from rust_dashboard import data_loader
+    from rust_dashboard.tabs.table import TableTab
+    from rust_dashboard.tabs.search import SearchTab
+    from rust_dashboard.tabs.leaderboard import LeaderboardTab
+    from rust_dashboard.tabs.dashboard import DashboardTab
+    app = QApplication.instance() or QApplication(sys.argv)
+    return app, data_loader, (TableTab, SearchTab, LeaderboardTab, DashboardTab)
+
+
+def timed(fn, app):
+    start = time.perf_counter()
+    fn()
+    elapsed = (time.perf_counter() - start) * 1000
+    app.processEvents()  # let deleteLater() run outside the timing
+    return elapsed
+
+
+def setups(df, data_json, data_loader, tabs):
+    """{case: setup}; a setup builds what the case needs and returns
+    (widget, call). Building a tab runs the timed call once, as a warm-up."""
+    TableTab, SearchTab, LeaderboardTab, DashboardTab = tabs
+
+    def tab(cls, method, pass_df=False):
+        def setup():
+            widget = cls(df)
+            call = getattr(widget, method)
+            return widget, (lambda: call(widget.df)) if pass_df else call
+        return setup
+
+    return {
+        "load_data": lambda: (None, lambda: data_loader.load_data(data_json)),
+        "table.update_table": tab(TableTab, "update_table"),
+        "search.update_results": tab(SearchTab, "update_results"),
+        "leaderboard.refresh_data": tab(LeaderboardTab, "refresh_data", pass_df=True),
+        "dashboard.refresh_data": tab(DashboardTab, "refresh_data", pass_df=True),
+    }
+
+
+def run_size(n, args, app, data_loader, tabs, skip, data_json):
+    write_json(generate_players(n, args.seed), data_json)
+    df = data_loader.load_data(data_json)
+    results = {}
+    for case, setup in setups(df, data_json, data_loader, tabs).items():
+        if case in skip:
+            results[case] = None
+            continue
+        start = time.perf_counter()
+        widget, call = setup()
+        built = time.perf_counter() - start
+        times = [timed(call, app) for _ in range(args.repeat if built < args.budget else 1)]
+        results[case] = {"p50": percentile(times, 50), "p95": percentile(times, 95),
+                         "min": min(times), "calls": len(times)}
+        if hasattr(widget, "timer"):
+            widget.timer.stop()  # SearchTab's JSON watcher
+        widget = call = None
+        app.processEvents()
+    return results
+
+
+def compare(results, baseline):
+    """[(case, size, now, before, ratio)] for every p50 both runs have."""
+    rows = []
+    for case, sizes in results["cases"].items():
+        for size, now in sizes.items():
+            before = baseline.get("cases", {}).get(case, {}).get(size)
+            if now and before:
+                rows.append((case, size, now["p50"], before["p50"], now["p50"] / max(before["p50"], 1e-9)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5, help="timed calls per case and size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget", type=float, default=10.0, help="seconds one call may take")
+    parser.add_argument("--json", help="write the results (a baseline) as JSON here")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p50 slowdown, 0.25 = 25%%")
+    args = parser.parse_args()
+
+    data_json = os.path.join(tempfile.mkdtemp(), "player_data.json")
+    app, data_loader, tabs = load_modules(data_json)
+    import pandas
+    import PySide6
+    results = {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                 "pyside6": PySide6.__version__, "pandas": pandas.__version__,
+                 "seed": args.seed, "repeat": args.repeat},
+        "cases": {case: {} for case in CASES},
+    }
+    skip = set()
+    sizes = sorted(args.sizes)
+    print(f"{'case':>25} {'players':>8} {'p50':>10} {'p95':>10} {'min':>10}  (ms)")
+    for index, n in enumerate(sizes):
+        for case, row in run_size(n, args, app, data_loader, tabs, skip, data_json).items():
+            results["cases"][case][str(n)] = row
+            if row is None:
+                print(f"{case:>25} {n:8d} {'skipped':>10}")
+                continue
+            print(f"{case:>25} {n:8d} {row['p50']:10.1f} {row['p95']:10.1f} {row['min']:10.1f}")
+            grow = sizes[index + 1] / n if index + 1 < len(sizes) else 1
+            if row["min"] * grow > args.budget * 1000:
+                skip.add(case)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"[bench] Results written to {args.json}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = 0
+        print(f"\n{'case':>25} {'players':>8} {'p50':>10} {'baseline':>10} {'ratio':>7}")
+        for case, size, now, before, ratio in compare(results, baseline):
+            slower = ratio > 1 + args.tolerance
+            regressions += slower
+            print(f"{case:>25} {size:>8} {now:10.1f} {before:10.1f} {ratio:7.2f}{'  REGRESSION' if slower else ''}")
+        print(f"[bench] {regressions} regression(s) beyond {args.tolerance:.0%} against {args.compare}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Steam fetch path against the local stand-in server.
+
+    python -m benchmarks.bench_fetch [--players N] [--threads N] [--scenario NAME ...]
+        [--client-timeout S] [--json FILE]
+
+Starts benchmarks.fake_steam_server on a free port, points RUST_STEAM_API
+at it and runs getPlayerData.fetch_player_data over N generated players
+on a thread pool, as getPlayerData.main does, once per fault scenario
+(clean, latency, throttled, rate_limited, timeouts). Reports players/s,
+p50/p95 per-player latency, the server's request counts and how many
+players came back wrong against the generated truth (wrongly private,
+or hours lost to a failed request).
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.bench_ocr_backends import percentile
+from benchmarks.fake_steam_server import Faults, FakeSteamServer
+from benchmarks.synthetic_data import generate_players
+
+SCENARIOS = {
+    "clean": {},
+    "latency": {"latency": 0.05, "jitter": 0.05},
+    "throttled": {"rate_429": 0.2},
+    "rate_limited": {"rate_limit": 50},
+    "timeouts": {"timeout_rate": 0.05, "hang": 2.0},
+}
+
+
+def check(result, truth):
+    """None if result matches the generated player, else what went wrong."""
+    private = truth["flags"]["private_profile"]
+    if result["flags"]["private_profile"] != private:
+        return "private"
+    if abs(result["rust_hours_total"] - truth["rust_hours_total"]) > 0.05 or \
+            abs(result["rust_hours_2weeks"] - truth["rust_hours_2weeks"]) > 0.05:
+        return "hours"
+    return None
+
+
+def run(fetch, players, threads):
+    """(wall s, per-player ms, {problem: count})"""
+    def timed(player):
+        start = time.perf_counter()
+        result = fetch(player["steam_id"], player["profile_url"])
+        return (time.perf_counter() - start) * 1000, result
+
+    wall = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        done = list(executor.map(timed, players))
+    wall = time.perf_counter() - wall
+    problems = {"private": 0, "hours": 0}
+    for (_, result), player in zip(done, players):
+        problem = check(result, player)
+        if problem:
+            problems[problem] += 1
+    return wall, [ms for ms, _ in done], problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=None, help="default: getPlayerData.MAX_THREADS")
+    parser.add_argument("--scenario", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--client-timeout", type=float, default=1.0, help="s per request (RUST_STEAM_TIMEOUT)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the results as JSON here")
+    args = parser.parse_args()
+
+    players = generate_players(args.players, args.seed)
+    server = FakeSteamServer(players).start()
+    os.environ["RUST_STEAM_API"] = server.url
+    os.environ["RUST_STEAM_TIMEOUT"] = str(args.client_timeout)
+    import getPlayerData
+    threads = args.threads or getPlayerData.MAX_THREADS
+
+    print(f"[bench] {len(players)} players, {threads} threads, fake Steam at {server.url}")
+    print(f"{'scenario':>13} {'players/s':>10} {'p50':>8} {'p95':>8} {'requests':>9} {'429':>5} "
+          f"{'hung':>5} {'wrong':>6} {'private':>8} {'hours':>6}")
+    summary = {"players": len(players), "threads": threads, "scenarios": {}}
+    for name in args.scenario:
+        server.api.faults = Faults(seed=args.seed, **SCENARIOS[name])
+        before = dict(server.api.stats)
+        wall, ms, problems = run(getPlayerData.fetch_player_data, players, threads)
+        stats = {key: server.api.stats[key] - before[key] for key in before}
+        row = {"players_per_s": len(players) / wall, "p50_ms": percentile(ms, 50), "p95_ms": percentile(ms, 95),
+               "server": stats, "wrong": sum(problems.values()), **problems}
+        summary["scenarios"][name] = row
+        print(f"{name:>13} {row['players_per_s']:10.1f} {row['p50_ms']:8.1f} {row['p95_ms']:8.1f} "
+              f"{stats['requests']:9d} {stats['429']:5d} {stats['hung']:5d} {row['wrong']:6d} "
+              f"{problems['private']:8d} {problems['hours']:6d}")
+    server.stop()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
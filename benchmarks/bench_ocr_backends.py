@@ -0,0 +1,80 @@
+"""Frame-replay benchmark for the OCR backends.
+
+    python -m benchmarks.bench_ocr_backends [--frames DIR] [--count N]
+
+Replays captured frames (or synthetic mute-list frames) through
+preprocess → OCR for every backend that is available and prints per-frame
+latency. Run from the repository root.
+"""
+import argparse
+import os
+import shutil
+import statistics
+import time
+
+import numpy as np
+
+from rust_capture.preprocess import preprocess
+from rust_capture.ocr_backends import SubprocessTesseract, TesserocrBackend, TESSERACT_CMD
+from benchmarks.frames import load_frames, random_players, scrolling_frames
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def available_backends():
+    backends = []
+    if shutil.which(TESSERACT_CMD) or os.path.exists(TESSERACT_CMD):
+        backends.append(SubprocessTesseract())
+    else:
+        print(f"[bench] subprocess backend skipped: {TESSERACT_CMD} not found")
+    try:
+        backends.append(TesserocrBackend())
+    except Exception as e:
+        print(f"[bench] tesserocr backend skipped: {e}")
+    return backends
+
+
+def run(frames, backend, psm=3):
+    times = []
+    ids = 0
+    for frame in frames:
+        start = time.perf_counter()
+        words = backend.image_to_words(frame, psm=psm)
+        times.append(time.perf_counter() - start)
+        ids += sum(1 for w in words if w["text"].startswith("7656119"))
+    return times, ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", help="directory of captured PNG frames")
+    parser.add_argument("--count", type=int, default=20, help="synthetic frames when --frames is not given")
+    args = parser.parse_args()
+
+    if args.frames:
+        raw = load_frames(args.frames)
+    else:
+        raw = [f for f, _ in scrolling_frames(random_players(200), n_frames=args.count)]
+    frames = [np.array(preprocess(f)) for f in raw]  # own copies: the NumPy engine reuses its buffer
+    print(f"[bench] {len(frames)} frames, {frames[0].shape[1]}x{frames[0].shape[0]} after preprocess")
+
+    backends = available_backends()
+    if not backends:
+        print("[bench] no OCR backend available")
+        return
+    for backend in backends:
+        backend.image_to_words(frames[0])  # warm-up (model load for in-process backends)
+        times, ids = run(frames, backend)
+        ms = [t * 1000 for t in times]
+        print(
+            f"{backend.name:>10}: mean {statistics.mean(ms):7.1f} ms  "
+            f"p50 {percentile(ms, 50):7.1f}  p95 {percentile(ms, 95):7.1f}  "
+            f"fps {len(ms) / sum(times):5.2f}  ids read {ids}"
+        )
+
+
+if __name__ == "__main__":
+    main()
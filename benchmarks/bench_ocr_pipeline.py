@@ -0,0 +1,158 @@
+"""End-to-end replay benchmark: capture → detect → scroll → preprocess → OCR → parse.
+
+    python -m benchmarks.bench_ocr_pipeline [--archive FILE] [--count N] [--columns N]
+        [--regions] [--names] [--backend NAME] [--save-fixture FILE] [--json FILE]
+
+Frames come from a frame archive (record one with RUST_RECORD=file.zip
+while capturing, see rust_capture.sources) or a synthetic labeled
+fixture, laid out in --columns columns like the in-game list (two by
+default; a single column hides the misreads between neighbouring IDs).
+Frames are replayed as fast as possible, in order, so runs are
+deterministic. Reports fps, p50/p95/p99 latency per stage, and SteamID
+precision/recall over the session against the archive's labels, both
+for every ID read and for the IDs multi-frame consensus committed. Needs
+no display and runs wherever Tesseract does. Without Tesseract nothing
+confirms the SteamID fast path, so it reads no IDs unless
+RUST_ID_VERIFY=0 trusts it unchecked.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from rust_capture.sources import ArchiveWriter, ReplaySource
+from rust_capture.preprocess import preprocess, UPSCALE_FACTOR
+from rust_capture.ocr_backends import get_backend
+from rust_capture.change_detect import FrameChangeDetector
+from rust_capture.scroll import ScrollTracker
+from rust_capture.parsing import parse_words
+from rust_capture.digits import read_words
+from rust_capture.regions import RegionOCR, column_regions
+from rust_capture.consensus import IDConsensus
+from benchmarks.frames import random_players, scrolling_frames
+from benchmarks.bench_ocr_backends import percentile
+
+STAGES = ("capture", "detect", "scroll", "preprocess", "ocr", "parse")
+
+
+def make_fixture(path, count, players=200, seed=0, columns=2):
+    writer = ArchiveWriter(path, overwrite=True)
+    frames = scrolling_frames(random_players(players, seed), n_frames=count, columns=columns, seed=seed)
+    for i, (frame, visible) in enumerate(frames):
+        writer.add(frame, ids=visible, t=i * 0.15)
+    writer.close()
+    return writer.path
+
+
+def frame_box(word, top):
+    """Word box (upscaled band coordinates) in frame coordinates."""
+    f = UPSCALE_FACTOR
+    return (word["x"] // f, top + word["y"] // f, (word["x"] + word["w"]) // f, top + (word["y"] + word["h"]) // f)
+
+
+def replay(source, backend, include_names=False, regions=False):
+    """Run every frame of source through the capture stages.
+
+    Returns (timings, found, committed, truth, wall): found is every ID read
+    in any frame, committed what passed IDConsensus.
+    """
+    timings = {stage: [] for stage in STAGES}
+    detector, scroll, consensus = FrameChangeDetector(), ScrollTracker(), IDConsensus()
+    scroll_pos = 0
+    region_ocr = None
+    found, truth = set(), set()
+
+    def timed(stage, fn, *args):
+        start = time.perf_counter()
+        out = fn(*args)
+        timings[stage].append((time.perf_counter() - start) * 1000)
+        return out
+
+    wall = time.perf_counter()
+    for index in range(len(source)):
+        raw = timed("capture", source.grab)
+        labels = source.labels(index)
+        if labels:
+            truth |= labels
+        if not timed("detect", detector.changed, raw):
+            continue
+        band = timed("scroll", scroll.plan, raw)
+        scroll_pos += scroll.last_offset or 0
+        band = consensus.plan_band(band, scroll_pos, raw.height)
+        if band is None:
+            continue
+        top, bottom = band
+        if regions and region_ocr is None:
+            region_ocr = RegionOCR(column_regions(raw.width, raw.height), include_names, backend)
+        if (top, bottom) != (0, raw.height):
+            raw = raw.crop((0, top, raw.width, bottom))
+        if regions:
+            # preprocess + OCR + parse per column, concurrently: timed as one "ocr" stage
+            entries = timed("ocr", region_ocr.read, raw, top)
+        else:
+            img = timed("preprocess", preprocess, raw)
+            words = timed("ocr", read_words, img, backend, include_names)
+            entries = [(sid, name, frame_box(w, top), w.get("conf", 0))
+                       for sid, name, w in timed("parse", parse_words, words, include_names)]
+        found |= {sid for sid, _, _, _ in entries}
+        consensus.observe(entries, scroll_pos)
+    wall = time.perf_counter() - wall
+    if region_ocr:
+        region_ocr.close()
+    return timings, found, set(consensus.committed), truth, wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--archive", help="frame archive to replay (default: synthetic fixture)")
+    parser.add_argument("--count", type=int, default=60, help="synthetic frames when --archive is not given")
+    parser.add_argument("--columns", type=int, default=2, help="mute list columns of the synthetic fixture")
+    parser.add_argument("--save-fixture", help="write the synthetic fixture archive here")
+    parser.add_argument("--regions", action="store_true", help="OCR the two columns concurrently")
+    parser.add_argument("--names", action="store_true", help="also read names (full Tesseract pass)")
+    parser.add_argument("--backend", default=None, help="auto | tesserocr | subprocess")
+    parser.add_argument("--json", help="write the results as JSON here")
+    args = parser.parse_args()
+
+    path = args.archive
+    if not path:
+        path = make_fixture(args.save_fixture or os.path.join(tempfile.mkdtemp(), "ocr_fixture.zip"), args.count,
+                            columns=args.columns)
+    source = ReplaySource(path)
+    backend = get_backend(args.backend)
+
+    timings, found, committed, truth, wall = replay(source, backend, args.names, args.regions)
+    source.close()
+
+    print(f"[bench] {len(source)} frames from {path}, backend {backend.name}, "
+          f"regions {'on' if args.regions else 'off'}, upscale x{UPSCALE_FACTOR}")
+    print(f"[bench] {len(source) / wall:.1f} fps ({wall * 1000 / len(source):.1f} ms/frame incl. skipped frames)")
+    print(f"{'stage':>11} {'calls':>6} {'p50':>8} {'p95':>8} {'p99':>8}  (ms)")
+    summary = {"frames": len(source), "fps": len(source) / wall, "stages": {}}
+    for stage in STAGES:
+        ms = timings[stage]
+        if not ms:
+            continue
+        row = {p: percentile(ms, p) for p in (50, 95, 99)}
+        summary["stages"][stage] = dict(row, calls=len(ms))
+        print(f"{stage:>11} {len(ms):6d} {row[50]:8.2f} {row[95]:8.2f} {row[99]:8.2f}")
+
+    for label, ids in (("read", found), ("committed", committed)):
+        if truth:
+            hits = len(ids & truth)
+            precision = hits / len(ids) if ids else 0.0
+            recall = hits / len(truth)
+            summary[label] = {"ids": len(ids), "precision": precision, "recall": recall}
+            print(f"[bench] SteamIDs {label}: {len(ids)} of {len(truth)} labeled, "
+                  f"precision {precision:.3f}, recall {recall:.3f}")
+        else:
+            print(f"[bench] SteamIDs {label}: {len(ids)} (archive has no labels)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
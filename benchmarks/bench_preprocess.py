@@ -0,0 +1,156 @@
+"""Per-stage timing and equivalence check: PIL preprocess chain vs NumPy engine.
+
+    python -m benchmarks.bench_preprocess [--frames DIR] [--count N] [--ocr]
+
+Both engines run on the same fixture frames (captured PNGs or synthetic
+mute-list frames). The NumPy output is compared against the PIL output
+(mean absolute difference after both are upscaled), and preprocess()
+itself is asserted equivalent: with the NumPy engine, on PIL frames and
+on RGB arrays, it must stay within --max-diff of the PIL chain, write
+into the same output buffer every call and give the same output on a
+second pass (no state left in the reused buffers). The script exits
+non-zero if any of that fails. With --ocr and a working OCR
+backend, SteamID recall of both engines is compared against the fixture
+labels as well.
+"""
+import argparse
+import statistics
+import sys
+import time
+
+import numpy as np
+from PIL import Image, ImageOps, ImageFilter
+
+from rust_capture import preprocess as pre
+from benchmarks.frames import load_frames, random_players, scrolling_frames
+
+
+def time_stage(fn, arg, runs):
+    times = []
+    out = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        out = fn(arg)
+        times.append((time.perf_counter() - start) * 1000)
+    return out, statistics.median(times)
+
+
+def pil_stages(frame, runs):
+    f = pre.UPSCALE_FACTOR
+    gray, t_gray = time_stage(ImageOps.grayscale, frame, runs)
+    contrast, t_ac = time_stage(lambda g: ImageOps.autocontrast(g, cutoff=pre.AUTOCONTRAST_CUTOFF), gray, runs)
+    sharp, t_sh = time_stage(lambda g: g.filter(ImageFilter.UnsharpMask(radius=1, percent=150, threshold=3)), contrast, runs)
+    big, t_up = time_stage(lambda g: g.resize((g.width * f, g.height * f), Image.LANCZOS), sharp, runs)
+    return np.asarray(big), {"gray": t_gray, "autocontrast": t_ac, "sharpen": t_sh, "upscale": t_up}
+
+
+def numpy_stages(frame, runs, interpolation):
+    p = pre.NumpyPreprocessor(interpolation=interpolation)
+    p(frame)  # allocate buffers once, like steady-state capture
+    timings = {}
+    for name, fn in (("gray", p.to_gray), ("autocontrast", p.autocontrast),
+                     ("sharpen", p.sharpen), ("upscale", p.upscale_to_out)):
+        times = []
+        for _ in range(runs):
+            g = p.to_gray(frame)
+            if name in ("sharpen", "upscale"):
+                p.autocontrast(g)
+            if name == "upscale":
+                p.sharpen(g)
+            arg = frame if name == "gray" else g
+            start = time.perf_counter()
+            fn(arg)
+            times.append((time.perf_counter() - start) * 1000)
+        timings[name] = statistics.median(times)
+    out = p(frame).copy()
+    _, timings["binarize"] = time_stage(p.binarize, p.gray.copy(), runs)
+    return out, timings
+
+
+def assert_equivalent(frames, max_diff):
+    """preprocess() with the NumPy engine against the PIL chain it replaces."""
+    engine = pre.PREPROCESS_ENGINE
+    pre.PREPROCESS_ENGINE = "numpy"
+    try:
+        first = []
+        for frame in frames:
+            old = np.asarray(pre.preprocess_pil(frame)).astype(np.int16)
+            for variant in (np.asarray(frame.convert("RGB")), frame):
+                new = pre.preprocess(variant)
+                assert new is pre.numpy_preprocessor().out, "preprocess() allocated a new output"
+                diff = float(np.abs(old - new).mean())
+                assert diff <= max_diff, f"NumPy engine differs from PIL by {diff:.2f} (max {max_diff})"
+            first.append(new.copy())
+        for frame, out in zip(frames, first):
+            assert np.array_equal(pre.preprocess(frame), out), "reused buffers changed a later output"
+    finally:
+        pre.PREPROCESS_ENGINE = engine
+
+
+def recall(frames, labels, engine):
+    from rust_capture.ocr_backends import get_backend
+    from rust_capture.parsing import parse_words
+    backend = get_backend()
+    found = expected = 0
+    for frame, visible in zip(frames, labels):
+        img = engine(frame)
+        ids = {sid for sid, _, _ in parse_words(backend.image_to_words(img))}
+        found += len(ids & visible)
+        expected += len(visible)
+    return found / expected if expected else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", help="directory of captured PNG frames")
+    parser.add_argument("--count", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--interpolation", default="nearest", choices=["nearest", "linear"])
+    parser.add_argument("--max-diff", type=float, default=2.0, help="allowed mean abs diff vs PIL (0-255)")
+    parser.add_argument("--ocr", action="store_true", help="also compare SteamID recall (needs Tesseract)")
+    args = parser.parse_args()
+
+    if args.frames:
+        frames, labels = load_frames(args.frames), None
+    else:
+        pairs = list(scrolling_frames(random_players(200), n_frames=args.count, idle_every=args.count + 1))
+        frames, labels = [f for f, _ in pairs], [v for _, v in pairs]
+
+    pil_total, np_total, diffs = {}, {}, []
+    for frame in frames:
+        pil_out, pil_t = pil_stages(frame, args.runs)
+        np_out, np_t = numpy_stages(frame, args.runs, args.interpolation)
+        diffs.append(float(np.abs(pil_out.astype(np.int16) - np_out.astype(np.int16)).mean()))
+        for k, v in pil_t.items():
+            pil_total[k] = pil_total.get(k, 0) + v / len(frames)
+        for k, v in np_t.items():
+            np_total[k] = np_total.get(k, 0) + v / len(frames)
+
+    print(f"[bench] {len(frames)} frames {frames[0].size[0]}x{frames[0].size[1]}, "
+          f"cv2={'yes' if pre.cv2 is not None else 'no'}, median of {args.runs} runs (ms)")
+    print(f"{'stage':>13} {'PIL':>8} {'NumPy':>8}")
+    for stage in ("gray", "autocontrast", "sharpen", "upscale", "binarize"):
+        pil_ms = pil_total.get(stage)
+        print(f"{stage:>13} {pil_ms if pil_ms is not None else float('nan'):8.2f} {np_total[stage]:8.2f}")
+    print(f"{'total':>13} {sum(pil_total.values()):8.2f} {sum(v for k, v in np_total.items() if k != 'binarize'):8.2f}")
+    mean_diff = statistics.mean(diffs)
+    print(f"[bench] mean abs diff vs PIL: {mean_diff:.2f} (max allowed {args.max_diff})")
+
+    if args.ocr and labels:
+        print(f"[bench] SteamID recall PIL {recall(frames, labels, pre.preprocess_pil):.3f}, "
+              f"NumPy {recall(frames, labels, pre.NumpyPreprocessor(interpolation=args.interpolation)):.3f}, "
+              f"NumPy+threshold {recall(frames, labels, pre.NumpyPreprocessor(threshold=True)):.3f}")
+
+    if mean_diff > args.max_diff:
+        print("[bench] FAIL: NumPy engine output differs from the PIL chain")
+        sys.exit(1)
+    try:
+        assert_equivalent(frames, args.max_diff)
+    except AssertionError as e:
+        print(f"[bench] FAIL: {e}")
+        sys.exit(1)
+    print("[bench] preprocess() equivalent to the PIL chain on every frame, in its reused buffer")
+
+
+if __name__ == "__main__":
+    main()
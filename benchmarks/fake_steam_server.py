@@ -0,0 +1,234 @@
+"""Local stand-in for the Steam Web API, serving generated players.
+
+    python -m benchmarks.fake_steam_server [--port P] [--players N] [--seed S]
+        [--latency MS] [--jitter MS] [--rate-429 F] [--rate-limit RPS]
+        [--timeout-rate F] [--hang S]
+
+then run the fetchers against it with RUST_STEAM_API=http://127.0.0.1:P.
+Implements GetPlayerSummaries, GetOwnedGames, GetRecentlyPlayedGames and
+GetPlayerBans over benchmarks.synthetic_data players. Private profiles
+come back as Steam sends them (communityvisibilitystate 1, no games), as
+do public ones hiding their playtime. Faults are injected per request:
+fixed latency plus jitter, a share of 429 responses, a requests/second
+limit answered with 429 and Retry-After, and a share of requests that
+hang for --hang seconds before answering (client timeouts).
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from benchmarks.synthetic_data import generate_players
+
+RUST_APP_ID = 252490
+
+
+class Faults:
+    def __init__(self, latency=0.0, jitter=0.0, rate_429=0.0, rate_limit=0.0,
+                 timeout_rate=0.0, hang=15.0, retry_after=1, seed=0):
+        self.latency = latency          # s added to every response
+        self.jitter = jitter            # s, uniform extra latency
+        self.rate_429 = rate_429        # share of requests refused with 429
+        self.rate_limit = rate_limit    # requests/s allowed, 0 = unlimited
+        self.timeout_rate = timeout_rate
+        self.hang = hang                # s a "timed out" request stalls
+        self.retry_after = retry_after  # s sent in Retry-After
+        self.rng = random.Random(seed)
+
+
+class FakeSteam:
+    """The API's state: players, faults and request counters."""
+
+    def __init__(self, players, faults=None):
+        self.players = {p["steam_id"]: p for p in players}
+        self.faults = faults or Faults()
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "ok": 0, "429": 0, "hung": 0, "404": 0}
+        self.window = []  # request times within the last second
+
+    def count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def fault(self):
+        """None to answer normally, "429" or "hang"."""
+        f = self.faults
+        with self.lock:
+            self.stats["requests"] += 1
+            roll = f.rng.random()
+            if f.rate_limit:
+                now = time.monotonic()
+                self.window = [t for t in self.window if now - t < 1.0]
+                if len(self.window) >= f.rate_limit:
+                    return "429"
+                self.window.append(now)
+        if roll < f.rate_429:
+            return "429"
+        if roll < f.rate_429 + f.timeout_rate:
+            return "hang"
+        return None
+
+    # --- Methods ---
+    def summary(self, p):
+        private = p["flags"]["private_profile"]
+        entry = {
+            "steamid": p["steam_id"],
+            "communityvisibilitystate": 1 if private else 3,
+            "profilestate": 1,
+            "personaname": p["name"],
+            "profileurl": p["profile_url"],
+            "personastate": 0 if private else int(p["steam_id"]) % 7,
+        }
+        if not private and p["rust_hours_2weeks"] and int(p["steam_id"]) % 5 == 0:
+            entry["gameextrainfo"] = "Rust"
+            entry["gameid"] = str(RUST_APP_ID)
+        return entry
+
+    def rust_game(self, p, recent_only=False):
+        if p["flags"]["private_profile"] or not p["rust_hours_total"]:
+            return None  # private profile or hidden game details
+        if recent_only and not p["rust_hours_2weeks"]:
+            return None
+        return {
+            "appid": RUST_APP_ID,
+            "playtime_forever": int(round(p["rust_hours_total"] * 60)),
+            "playtime_2weeks": int(round(p["rust_hours_2weeks"] * 60)),
+        }
+
+    def call(self, path, query):
+        """(status, body) for an API path and its parsed query string."""
+        ids = [s for s in ",".join(query.get("steamids", [])).split(",") if s]
+        sid = (query.get("steamid") or [""])[0]
+        if path == "/ISteamUser/GetPlayerSummaries/v2/":
+            return 200, {"response": {"players": [self.summary(self.players[s]) for s in ids[:100] if s in self.players]}}
+        if path == "/ISteamUser/GetPlayerBans/v1/":
+            return 200, {"players": [
+                {"SteamId": s, "CommunityBanned": False, "VACBanned": int(s) % 50 == 0,
+                 "NumberOfVACBans": int(int(s) % 50 == 0), "DaysSinceLastBan": 0,
+                 "NumberOfGameBans": 0, "EconomyBan": "none"}
+                for s in ids[:100] if s in self.players]}
+        if path in ("/IPlayerService/GetOwnedGames/v1/", "/IPlayerService/GetRecentlyPlayedGames/v1/"):
+            p = self.players.get(sid)
+            game = p and self.rust_game(p, recent_only="Recently" in path)
+            if p is None or (game is None and p["flags"]["private_profile"]):
+                return 200, {"response": {}}
+            games = [game] if game else []
+            return 200, {"response": {"total_count" if "Recently" in path else "game_count": len(games), "games": games}}
+        return 404, {"error": f"unknown method {path}"}
+
+
+class Handler(BaseHTTPRequestHandler):
+    api = None  # FakeSteam, set by FakeSteamServer
+
+    def do_GET(self):
+        api = self.api
+        fault = api.fault()
+        f = api.faults
+        delay = f.latency + (f.rng.uniform(0, f.jitter) if f.jitter else 0)
+        if fault == "hang":
+            api.count("hung")
+            delay += f.hang
+        if delay:
+            time.sleep(delay)
+        if fault == "429":
+            api.count("429")
+            self.send(429, {"error": "Too Many Requests"}, {"Retry-After": str(f.retry_after)})
+            return
+        url = urlparse(self.path)
+        status, body = api.call(url.path, parse_qs(url.query))
+        api.count("ok" if status == 200 else "404")
+        self.send(status, body)
+
+    def send(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up (timeout)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeSteamServer:
+    """FakeSteam on a background HTTP server; port 0 picks a free one."""
+
+    def __init__(self, players, faults=None, host="127.0.0.1", port=0):
+        self.api = FakeSteam(players, faults)
+        handler = type("BoundHandler", (Handler,), {"api": self.api})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True, name="fake-steam")
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def add_fault_arguments(parser):
+    parser.add_argument("--latency", type=float, default=0, help="ms added to every response")
+    parser.add_argument("--jitter", type=float, default=0, help="ms of uniform extra latency")
+    parser.add_argument("--rate-429", type=float, default=0, help="share of requests answered 429")
+    parser.add_argument("--rate-limit", type=float, default=0, help="requests/s before answering 429")
+    parser.add_argument("--timeout-rate", type=float, default=0, help="share of requests that hang")
+    parser.add_argument("--hang", type=float, default=15, help="s a hanging request stalls")
+    parser.add_argument("--retry-after", type=int, default=1, help="s sent in Retry-After")
+
+
+def faults_from_args(args):
+    return Faults(args.latency / 1000, args.jitter / 1000, args.rate_429, args.rate_limit,
+                  args.timeout_rate, args.hang, args.retry_after, args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dump", help="also write the served players as player_data.json here")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    players = generate_players(args.players, args.seed)
+    if args.dump:
+        with open(args.dump, "w", encoding="utf-8") as f:
+            json.dump(players, f, indent=4)
+    server = FakeSteamServer(players, faults_from_args(args), args.host, args.port)
+    print(f"[fake-steam] {len(players)} players at {server.url} (RUST_STEAM_API={server.url}); Ctrl+C stops")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"[fake-steam] {server.api.stats}")
+
+
+if __name__ == "__main__":
+    main()
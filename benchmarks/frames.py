@@ -0,0 +1,88 @@
+"""Frame fixtures for the OCR benchmarks.
+
+Frames either come from a directory of PNG captures or are rendered
+synthetically to look like the in-game mute list (name above SteamID,
+one player per row), optionally scrolled between frames. Synthetic
+frames use a font the digit templates are not bootstrapped from
+(rust_capture.digits.TEMPLATE_FONTS), so the SteamID fast path is
+measured on glyphs it has to generalize to, as with real captures.
+"""
+import os
+import random
+from pathlib import Path
+from PIL import Image, ImageDraw, ImageFont
+
+BACKGROUND = (24, 24, 24)
+NAME_COLOR = (210, 210, 210)
+ID_COLOR = (160, 160, 160)
+ROW_HEIGHT = 64
+FONT_SIZE = 20
+ID_TOP = 8 + 28  # y of the SteamID line within a row
+FONTS = [os.environ.get("RUST_BENCH_FONT", ""), "DejaVuSerif.ttf", "DejaVuSansMono.ttf",
+         "LiberationSerif-Regular.ttf", "times.ttf", "cour.ttf"]
+
+
+def load_font(size=FONT_SIZE):
+    for name in FONTS:
+        if not name:
+            continue
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default(size=size)
+
+
+def random_players(n, seed=0):
+    rng = random.Random(seed)
+    syllables = ["ra", "zor", "ki", "bear", "pie", "tony", "x", "sweat", "no", "ob", "lord", "gg"]
+    players = []
+    for _ in range(n):
+        name = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        sid = "7656119" + "".join(rng.choice("0123456789") for _ in range(10))
+        players.append((name, sid))
+    return players
+
+
+def render_list(players, width=1297, columns=1, font=None):
+    """Render the whole (tall) mute list; frames are crops of this."""
+    font = font or load_font()
+    rows = (len(players) + columns - 1) // columns
+    img = Image.new("RGB", (width, rows * ROW_HEIGHT + ROW_HEIGHT), BACKGROUND)
+    draw = ImageDraw.Draw(img)
+    col_w = width // columns
+    for i, (name, sid) in enumerate(players):
+        col, row = i % columns, i // columns
+        x, y = col * col_w + 20, row * ROW_HEIGHT
+        draw.text((x, y + 8), name, fill=NAME_COLOR, font=font)
+        draw.text((x, y + ID_TOP), sid, fill=ID_COLOR, font=font)
+    return img
+
+
+def scrolling_frames(players, n_frames=60, height=793, width=1297, columns=1,
+                     scroll_step=ROW_HEIGHT // 2, idle_every=3, seed=0):
+    """Yield (frame, visible_ids) simulating a user scrolling the mute list.
+
+    Every `idle_every`-th frame repeats the previous scroll position, like
+    the real capture loop sampling a list nobody is touching.
+    """
+    rng = random.Random(seed)
+    full = render_list(players, width=width, columns=columns)
+    max_offset = max(0, full.height - height)
+    offset = 0
+    for i in range(n_frames):
+        if i and i % idle_every:
+            offset = min(max_offset, max(0, offset + rng.choice([1, 1, 1, -1]) * scroll_step))
+        frame = full.crop((0, offset, width, offset + height))
+        # an ID counts as visible when its whole text line is inside the frame
+        visible = {
+            sid for idx, (_, sid) in enumerate(players)
+            if offset <= (idx // columns) * ROW_HEIGHT + ID_TOP
+            and (idx // columns) * ROW_HEIGHT + ID_TOP + FONT_SIZE + 4 <= offset + height
+        }
+        yield frame, visible
+
+
+def load_frames(directory):
+    """Load every *.png in a directory, sorted by name."""
+    return [Image.open(p).convert("RGB") for p in sorted(Path(directory).glob("*.png"))]
@@ -0,0 +1,110 @@
+"""Seeded synthetic player data for the dashboard benchmarks.
+
+    python -m benchmarks.synthetic_data N [--seed S] [--json FILE] [--csv FILE]
+
+Writes N players in the player_data.json format (and the matching
+mute_list.csv) with the shape of real captures: most public profiles
+hide their playtime (0 h), about one in ten is private, and the hours
+that are visible follow a long-tailed log-normal, with the last two
+weeks a small, noisy fraction of the total. The same N and seed always
+give the same files.
+"""
+import argparse
+import csv
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from rust_capture.capture_log import HEADER, profile_url
+
+# Fitted to a real capture of 239 players
+PRIVATE_SHARE = 0.09
+HIDDEN_SHARE = 0.58       # public profiles showing 0 h
+FLAGGED_SHARE = 0.01
+LOG_TOTAL = (7.14, 1.04)  # mean/std of log(total hours) where visible
+LOG_RECENT_RATIO = (np.log(0.026), 1.0)
+MAX_TOTAL = 20000.0
+MAX_RECENT = 14 * 24.0
+ID_NAME_SHARE = 0.05      # names OCR never read, stored as the SteamID
+
+SYLLABLES = ["ra", "zor", "ki", "bear", "pie", "tony", "x", "sweat", "no", "ob", "lord", "gg",
+             "big", "chris", "owl", "dan", "mon", "der", "worm", "bull", "ace", "tick"]
+TAGS = ["[KLR] ", "[A.R]", "BT |", "#", "♰ ", "死亡 ", ""]
+
+
+def _name(rng):
+    name = "".join(rng.choice(SYLLABLES, size=rng.integers(2, 5)))
+    style = rng.random()
+    if style < 0.3:
+        name = name.capitalize()
+    elif style < 0.4:
+        name = name.upper()
+    if rng.random() < 0.2:
+        name = rng.choice(TAGS) + name
+    if rng.random() < 0.15:
+        name += str(rng.integers(1, 999))
+    return name
+
+
+def generate_players(n, seed=0):
+    """n player_data.json entries; unique SteamIDs, deterministic for a seed."""
+    rng = np.random.default_rng(seed)
+    ids = 76561197960265728 + rng.choice(10 ** 9, size=n, replace=False) + 10 ** 9
+    kind = rng.random(n)
+    private = kind < PRIVATE_SHARE
+    visible = kind >= PRIVATE_SHARE + HIDDEN_SHARE
+    total = np.where(visible, np.round(np.minimum(rng.lognormal(*LOG_TOTAL, size=n), MAX_TOTAL), 1), 0.0)
+    ratio = np.minimum(rng.lognormal(*LOG_RECENT_RATIO, size=n), 1.0)
+    recent = np.where(visible, np.round(np.minimum(total * ratio, MAX_RECENT), 1), 0.0)
+    flagged = rng.random(n) < FLAGGED_SHARE
+    epoch = datetime(2025, 1, 1)
+
+    players = []
+    for i in range(n):
+        sid = str(ids[i])
+        flags = {"private_profile": bool(private[i])}
+        if flagged[i]:
+            flags["flagged"] = True
+            flags["flagged_at"] = (epoch + timedelta(minutes=int(rng.integers(0, 525600)))).isoformat()
+        players.append({
+            "steam_id": sid,
+            "name": sid if rng.random() < ID_NAME_SHARE else _name(rng),
+            "rust_hours_total": float(total[i]),
+            "rust_hours_2weeks": float(recent[i]),
+            "profile_url": profile_url(sid),
+            "flags": flags,
+        })
+    return players
+
+
+def write_json(players, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(players, f, indent=4)
+    return path
+
+
+def write_csv(players, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows([p["name"], p["steam_id"], p["profile_url"]] for p in players)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("n", type=int, help="number of players")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", default="synthetic_player_data.json")
+    parser.add_argument("--csv", default="synthetic_mute_list.csv")
+    args = parser.parse_args()
+
+    players = generate_players(args.n, args.seed)
+    write_json(players, args.json)
+    write_csv(players, args.csv)
+    print(f"{args.n} players (seed {args.seed}) -> {args.json}, {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,92 @@
 # calibrate_region_preview.py
-import pyautogui
-from PIL import ImageGrab
-
-print("Move your mouse to the TOP-LEFT corner of the mute list and press Enter.")
-input("Press Enter when ready...")
-x1, y1 = pyautogui.position()
-print(f"Top-left: ({x1}, {y1})")
-
-print("Move your mouse to the BOTTOM-RIGHT corner of the mute list and press Enter.")
-input("Press Enter when ready...")
-x2, y2 = pyautogui.position()
-print(f"Bottom-right: ({x2}, {y2})")
-
-# Ensure correct order
-left = min(x1, x2)
-top = min(y1, y2)
-right = max(x1, x2)
-bottom = max(y1, y2)
-
-print(f"Use these coordinates in your capture script:")
-print(f"LEFT = {left}, TOP = {top}, RIGHT = {right}, BOTTOM = {bottom}")
-
-# ---------------- Preview the capture ---------------- #
-print("Previewing the selected area...")
-img = ImageGrab.grab(bbox=(left, top, right, bottom))
-img.show()
+#   python calibrateScreen.py                 pick the corners with the mouse
+#   python calibrateScreen.py --auto          find the mute list on screen (open it in game first)
+#   python calibrateScreen.py --auto --image shot.png [--origin X Y] [--resolution W H]
+#   python calibrateScreen.py --auto --replay frames.zip [--frame N] --resolution W H
+# The result is stored per screen resolution in calibration.json (RUST_CALIBRATION),
+# which rust_ocr loads at each capture start.
+import argparse
+from PIL import Image, ImageGrab
+
+from rust_capture import calibration as calib
+from rust_capture.regions import column_boxes
+
+
+def manual():
+    import pyautogui
+
+    print("Move your mouse to the TOP-LEFT corner of the mute list and press Enter.")
+    input("Press Enter when ready...")
+    x1, y1 = pyautogui.position()
+    print(f"Top-left: ({x1}, {y1})")
+
+    print("Move your mouse to the BOTTOM-RIGHT corner of the mute list and press Enter.")
+    input("Press Enter when ready...")
+    x2, y2 = pyautogui.position()
+    print(f"Bottom-right: ({x2}, {y2})")
+
+    # Ensure correct order
+    left = min(x1, x2)
+    top = min(y1, y2)
+    right = max(x1, x2)
+    bottom = max(y1, y2)
+    box = (left, top, right, bottom)
+    return calib.Calibration(tuple(pyautogui.size()), box, column_boxes(*box), 0)
+
+
+def auto(args):
+    origin = tuple(args.origin or (0, 0))
+    if args.replay:
+        from rust_capture.sources import ReplaySource
+        source = ReplaySource(args.replay, loop=False, realtime=False)
+        frame = source.frame(args.frame)
+        if args.origin is None and source.bbox:
+            origin = tuple(source.bbox[:2])  # recorded frames are crops of their capture box
+    elif args.image:
+        frame = Image.open(args.image).convert("RGB")
+    else:
+        frame = ImageGrab.grab()  # whole screen
+    resolution = tuple(args.resolution) if args.resolution else None
+    if resolution is None and not (args.replay or args.image):
+        resolution = frame.size
+    found = calib.detect(frame, origin=origin, resolution=resolution)
+    if found is None:
+        print("[!] No mute list found — is it open and visible?")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate the mute list capture box.")
+    parser.add_argument("--auto", action="store_true", help="detect the panel and its columns")
+    parser.add_argument("--image", help="detect in a screenshot instead of the screen")
+    parser.add_argument("--replay", help="detect in a frame of a recorded archive (RUST_RECORD)")
+    parser.add_argument("--frame", type=int, default=0, help="archive frame to use")
+    parser.add_argument("--origin", type=int, nargs=2,
+                        help="screen position of the image's top-left pixel (default 0 0, or the archive's box)")
+    parser.add_argument("--resolution", type=int, nargs=2, help="screen resolution the image came from")
+    parser.add_argument("--no-preview", action="store_true")
+    args = parser.parse_args()
+
+    found = auto(args) if args.auto else manual()
+    if found is None:
+        return
+
+    left, top, right, bottom = found.box
+    print(f"Use these coordinates in your capture script:")
+    print(f"LEFT = {left}, TOP = {top}, RIGHT = {right}, BOTTOM = {bottom}")
+    for i, column in enumerate(found.columns):
+        print(f"  col{i + 1}: {column}")
+    if found.row_pitch:
+        print(f"  row pitch: {found.row_pitch} px")
+    path = calib.save(found)
+    print(f"Saved for {calib.resolution_key(found.resolution)} to {path}")
+
+    # ---------------- Preview the capture ---------------- #
+    if not args.no_preview and not (args.image or args.replay):
+        print("Previewing the selected area...")
+        img = ImageGrab.grab(bbox=(left, top, right, bottom))
+        img.show()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,45 @@
-import csv
-import json
 import os
-import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-CSV_INPUT = "mute_list.csv"
-JSON_OUTPUT = "player_data.json"
+from rust_capture.capture_log import CaptureLogReader
+from rust_capture.file_lock import try_lock, unlock, file_lock
+from rust_capture.profiling import profiled
+from rust_capture.paths import MUTE_CSV, PLAYER_JSON, PLAYER_JSON_LOCK
+from rust_capture.player_store import read_players, write_players, merge_players
+from rust_capture.steam_api import steam_get, PLAYER_SUMMARY_URL, OWNED_GAMES_URL, RUST_APP_ID
+
+CSV_INPUT = str(MUTE_CSV)
+CSV_OFFSET = CSV_INPUT + ".offset"  # bytes of CSV_INPUT already processed
+JSON_OUTPUT = str(PLAYER_JSON)
+# One run at a time: a run started while another holds the lock leaves PENDING_FILE
+# and exits, and the running one goes round again for the rows it missed.
+LOCK_FILE = JSON_OUTPUT + ".lock"
+PENDING_FILE = JSON_OUTPUT + ".pending"
+LOCK_STALE = 15 * 60  # s after which a lock left by a killed run is broken
 
-STEAM_KEY = "2D01D80224108A449432583EA81C08B3"
-PLAYER_SUMMARY_URL = "https://api.steampowered.com/ISteamUser/GetPlayerSummaries/v2/"
-OWNED_GAMES_URL = "https://api.steampowered.com/IPlayerService/GetOwnedGames/v1/"
-RUST_APP_ID = 252490
 MAX_THREADS = 5  # concurrent threads
 
 def log(msg):
     print(f"[INFO] {msg}")
 
 def fetch_profile(steam_id):
+    """(summary, failed): summary is None when the request failed (failed
+    is True) or Steam has no account with this ID (failed is False)."""
     try:
-        r = requests.get(
-            PLAYER_SUMMARY_URL,
-            params={"key": STEAM_KEY, "steamids": steam_id},
-            timeout=10,
-        )
-        r.raise_for_status()
-        players = r.json().get("response", {}).get("players", [])
-        return players[0] if players else None
+        data = steam_get(PLAYER_SUMMARY_URL, {"steamids": steam_id})
     except Exception:
-        return None  # silently skip, mark as private later
+        return None, True  # silently skip, mark as private and retry later
+    players = data.get("response", {}).get("players", [])
+    return (players[0] if players else None), False
 
 def fetch_rust_hours(steam_id):
     try:
-        r = requests.get(
-            OWNED_GAMES_URL,
-            params={
-                "key": STEAM_KEY,
-                "steamid": steam_id,
-                "include_played_free_games": 1,
-                "include_appinfo": 0,
-            },
-            timeout=10,
-        )
-        r.raise_for_status()
-        games = r.json().get("response", {}).get("games", [])
+        data = steam_get(OWNED_GAMES_URL, {
+            "steamid": steam_id,
+            "include_played_free_games": 1,
+            "include_appinfo": 0,
+        })
+        games = data.get("response", {}).get("games", [])
         for g in games:
             if g["appid"] == RUST_APP_ID:
                 total = round(g.get("playtime_forever", 0) / 60, 1)
@@ -52,62 +49,99 @@ def fetch_rust_hours(steam_id):
     except Exception:
         return 0, 0
 
+@profiled("getPlayerData.fetch")  # runs on the pool threads
 def fetch_player_data(steam_id, profile_url):
-    profile = fetch_profile(steam_id)
+    profile, failed = fetch_profile(steam_id)
     total, recent = fetch_rust_hours(steam_id)
     name = profile.get("personaname", "UNKNOWN") if profile else "UNKNOWN"
-    private = profile is None
+    # Private profiles are still listed, with communityvisibilitystate 1
+    private = profile is None or profile.get("communityvisibilitystate", 3) != 3
     return {
         "steam_id": steam_id,
         "name": name,
         "rust_hours_total": total,
         "rust_hours_2weeks": recent,
         "profile_url": profile_url,
-        "flags": {"private_profile": private}
+        # fetch_failed: the request failed, worth fetching again later;
+        # not_found: Steam has no such account (e.g. a misread ID), never refetched
+        "flags": {"private_profile": private, "fetch_failed": failed,
+                  "not_found": profile is None and not failed}
     }
 
+def acquire_lock():
+    return try_lock(LOCK_FILE, LOCK_STALE)
+
+def release_lock():
+    unlock(LOCK_FILE)
+
+def clear_pending():
+    try:
+        os.remove(PENDING_FILE)
+    except OSError:
+        pass
+
+@profiled("getPlayerData.main")
 def main():
+    if not acquire_lock():
+        open(PENDING_FILE, "w").close()
+        # the holder checks PENDING_FILE only after releasing, so retry once
+        if not acquire_lock():
+            log("Another getPlayerData.py run is in progress; it will pick up the new rows.")
+            return
+    while True:
+        clear_pending()
+        try:
+            update()
+        finally:
+            release_lock()
+        if not os.path.exists(PENDING_FILE) or not acquire_lock():
+            return
+
+def update():
     if not os.path.exists(CSV_INPUT):
         log(f"{CSV_INPUT} not found. Nothing to do.")
         return
 
     # Load existing JSON
     existing_data = {}
+    reader = CaptureLogReader(CSV_INPUT, CSV_OFFSET)
     if os.path.exists(JSON_OUTPUT):
-        with open(JSON_OUTPUT, "r", encoding="utf-8") as f:
-            existing_data_list = json.load(f)
-            existing_data = {entry["steam_id"]: entry for entry in existing_data_list}
-
-    # Read CSV and filter new Steam IDs
-    with open(CSV_INPUT, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        steam_rows = [
-            row for row in reader
-            if row["steamid"].strip() and row["steamid"].strip() not in existing_data
-        ]
+        existing_data = {entry["steam_id"]: entry for entry in read_players(JSON_OUTPUT)}
+    else:
+        reader.reset()  # no output yet: process the whole CSV
+
+    # Only rows appended to the CSV since the last run
+    steam_rows = [
+        row for row in reader.read_new()
+        if row["steamid"] and row["steamid"] not in existing_data
+    ]
 
     if not steam_rows:
+        reader.commit()
         return
 
-    results = list(existing_data.values())
+    fetched = []
 
     # Fetch data concurrently
     with ThreadPoolExecutor(max_workers=MAX_THREADS) as executor:
         futures = {
-            executor.submit(fetch_player_data, row["steamid"].strip(), row.get("profile_url", "").strip()): row["steamid"].strip()
+            executor.submit(fetch_player_data, row["steamid"], row.get("profile_url", "")): row["steamid"]
             for row in steam_rows
         }
 
         for future in as_completed(futures):
             try:
-                data = future.result()
-                results.append(data)
+                fetched.append(future.result())
             except Exception:
                 pass  # silently skip failed Steam IDs
 
-    # Save JSON
-    with open(JSON_OUTPUT, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=4)
+    # Save JSON under the write lock, merged into the file as it is now: the
+    # dashboard may have flagged players while the fetch ran
+    with file_lock(PLAYER_JSON_LOCK):
+        results = merge_players(read_players(JSON_OUTPUT), fetched)
+        write_players(results, JSON_OUTPUT)
+
+    reader.commit()
 
     log(f"Fetched {len(steam_rows)} new players. Total players: {len(results)}")
     log(f"Done! Output written to {JSON_OUTPUT}")
@@ -0,0 +1,220 @@
+"""Batch runs without the GUI: no Qt, no matplotlib, no hotkeys.
+
+    python headless.py replay FRAMES.zip [--names] [--regions] [--out DIR] [--offline | --no-fetch]
+    python headless.py ids FILE [--out DIR] [--offline | --no-fetch]
+
+replay runs a frame archive (record one with RUST_RECORD=file.zip, see
+rust_capture.sources) through the capture stages: change detection,
+scroll banding, OCR, parsing and multi-frame consensus. ids reads
+SteamIDs from a text file (one per line, optionally "id,name") or a CSV
+with a steamid column. Either way the IDs are then fetched from the Steam
+API (--offline stores placeholders instead, --no-fetch nothing), stored
+in OUT/mute_list.csv and OUT/player_data.json (merged with what is
+already there; placeholders and failed fetches are fetched again on the
+next online run), and summarised
+in OUT/report.json and OUT/report.txt with the dashboard's statistics.
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from rust_capture.sources import ReplaySource, frame_size, crop_rows
+from rust_capture.preprocess import preprocess, UPSCALE_FACTOR
+from rust_capture.ocr_backends import get_backend
+from rust_capture.change_detect import FrameChangeDetector
+from rust_capture.scroll import ScrollTracker
+from rust_capture.parsing import parse_words, steamid_re
+from rust_capture.digits import read_words
+from rust_capture.regions import RegionOCR, column_regions
+from rust_capture.consensus import IDConsensus
+from rust_capture.capture_log import CaptureLogWriter, profile_url
+from rust_dashboard.data_loader import players_frame
+from rust_dashboard.stats import sweatiness, leaderboards
+
+DEFAULT_OUT = "headless_out"
+REPORT_COLUMNS = ["steam_id", "name", "rust_hours_total", "rust_hours_2weeks"]
+
+
+def log(msg):
+    print(f"[HEADLESS] {msg}")
+
+
+# --- Capture ---
+def capture_ids(source, include_names=False, regions=False):
+    """[(sid, name)] committed by consensus over every frame of source."""
+    backend = get_backend()
+    detector, scroll, consensus = FrameChangeDetector(), ScrollTracker(), IDConsensus()
+    scroll_pos = 0
+    region_ocr = None
+    committed = []
+    for _ in range(len(source)):
+        raw = source.grab()
+        if not detector.changed(raw):
+            continue
+        band = scroll.plan(raw)
+        scroll_pos += scroll.last_offset or 0
+        width, height = frame_size(raw)
+        band = consensus.plan_band(band, scroll_pos, height)
+        if band is None:
+            continue
+        top, bottom = band
+        if regions and region_ocr is None:
+            region_ocr = RegionOCR(column_regions(width, height), include_names, backend)
+        raw = crop_rows(raw, top, bottom)
+        if region_ocr:
+            entries = region_ocr.read(raw, top)
+        else:
+            f = UPSCALE_FACTOR
+            words = read_words(preprocess(raw), backend, include_names)
+            entries = [
+                (sid, name, (w["x"] // f, top + w["y"] // f, (w["x"] + w["w"]) // f, top + (w["y"] + w["h"]) // f),
+                 w.get("conf", 0))
+                for sid, name, w in parse_words(words, include_names)
+            ]
+        committed.extend(consensus.observe(entries, scroll_pos))
+    if region_ocr:
+        region_ocr.close()
+    log(f"{len(source)} frames: {detector.stats()}; consensus {consensus.stats()}")
+    return committed
+
+
+def read_ids(path):
+    """[(sid, name)] from a CSV with a steamid column, or one ID (optionally "id,name") per line."""
+    with open(path, newline="", encoding="utf-8") as f:
+        first = f.readline()
+        f.seek(0)
+        if "steamid" in first.lower():
+            rows = [(r.get("steamid", "").strip(), (r.get("name") or "").strip()) for r in csv.DictReader(f)]
+        else:
+            rows = [tuple((line.split(",", 1) + [""])[:2]) for line in f.read().splitlines()]
+    ids, seen = [], set()
+    for sid, name in rows:
+        sid = sid.strip()
+        if steamid_re.fullmatch(sid) and sid not in seen:
+            seen.add(sid)
+            ids.append((sid, name.strip() or sid))
+    return ids
+
+
+# --- Fetch / store ---
+def fetch_players(ids, offline=False):
+    """player_data.json entries for [(sid, name)]."""
+    if offline:
+        return [
+            {"steam_id": sid, "name": name, "rust_hours_total": 0, "rust_hours_2weeks": 0,
+             "profile_url": profile_url(sid), "flags": {"private_profile": True, "offline": True}}
+            for sid, name in ids
+        ]
+    from getPlayerData import fetch_player_data, MAX_THREADS
+    players = []
+    with ThreadPoolExecutor(max_workers=MAX_THREADS) as executor:
+        futures = [executor.submit(fetch_player_data, sid, profile_url(sid)) for sid, _ in ids]
+        for future in as_completed(futures):
+            try:
+                players.append(future.result())
+            except Exception as e:
+                log(f"Fetch failed: {e}")
+    return players
+
+
+def needs_fetch(player):
+    """True for an offline placeholder or a failed fetch; not for an ID
+    Steam has no account for (not_found), which a refetch cannot fix."""
+    flags = player.get("flags", {})
+    return bool(flags.get("offline") or flags.get("fetch_failed"))
+
+
+def store(out, ids, fetch, offline=False):
+    """Append ids to OUT/mute_list.csv, fetch the new ones (and, online, any
+    stored as placeholders) and merge them into OUT/player_data.json;
+    returns every stored player."""
+    log_writer = CaptureLogWriter(out / "mute_list.csv")
+    log_writer.append(ids)
+    log_writer.close()
+
+    json_path = out / "player_data.json"
+    existing = {}
+    if json_path.exists():
+        with open(json_path, "r", encoding="utf-8") as f:
+            existing = {p["steam_id"]: p for p in json.load(f)}
+    new = [(sid, name) for sid, name in ids
+           if sid not in existing or (not offline and needs_fetch(existing[sid]))]
+    if new and fetch:
+        start = time.perf_counter()
+        for player in fetch_players(new, offline):
+            existing[player["steam_id"]] = player
+        log(f"Fetched {len(new)} players in {time.perf_counter() - start:.1f} s")
+    players = list(existing.values())
+    tmp = json_path.with_suffix(".json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(players, f, indent=4)
+    os.replace(tmp, json_path)
+    return players
+
+
+# --- Report ---
+def report(out, players, captured):
+    df = players_frame(players)
+    summary = sweatiness(df)
+    boards = {
+        title: table[REPORT_COLUMNS].to_dict(orient="records")
+        for title, table in leaderboards(df).items()
+    }
+    data = {"captured": len(captured), "players": len(df), "sweatiness": summary, "leaderboards": boards}
+    with open(out / "report.json", "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+    lines = [f"Captured IDs: {len(captured)}", f"Stored players: {len(df)}", ""]
+    if summary:
+        lines += [f"{key.replace('_', ' ').capitalize()}: {value:.2f}" if isinstance(value, float)
+                  else f"{key.replace('_', ' ').capitalize()}: {value}" for key, value in summary.items()]
+    else:
+        lines.append("No public player data available.")
+    for title, rows in boards.items():
+        lines += ["", title]
+        lines += [f"  {r['rust_hours_total']:>8.1f} h total  {r['rust_hours_2weeks']:>6.1f} h 2w  {r['name']} ({r['steam_id']})"
+                  for r in rows]
+    text = "\n".join(lines) + "\n"
+    with open(out / "report.txt", "w", encoding="utf-8") as f:
+        f.write(text)
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="mode", required=True)
+    replay = sub.add_parser("replay", help="capture IDs from a frame archive")
+    replay.add_argument("archive")
+    replay.add_argument("--names", action="store_true", help="read names as well as IDs")
+    replay.add_argument("--regions", action="store_true", help="OCR the two list columns separately")
+    ids = sub.add_parser("ids", help="read IDs from a file")
+    ids.add_argument("file")
+    for p in (replay, ids):
+        p.add_argument("--out", default=DEFAULT_OUT, help="directory for the CSV, JSON and reports")
+        fetching = p.add_mutually_exclusive_group()
+        fetching.add_argument("--offline", action="store_true", help="store placeholders, don't call the Steam API")
+        fetching.add_argument("--no-fetch", action="store_true", help="only capture and store the IDs")
+    args = parser.parse_args()
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    if args.mode == "replay":
+        source = ReplaySource(args.archive, loop=False, realtime=False)
+        captured = capture_ids(source, args.names, args.regions)
+        source.close()
+    else:
+        captured = read_ids(args.file)
+    log(f"{len(captured)} SteamIDs in {time.perf_counter() - start:.1f} s")
+
+    players = store(out, captured, fetch=not args.no_fetch, offline=args.offline)
+    print(report(out, players, captured))
+    log(f"Reports written to {out} ({time.perf_counter() - start:.1f} s total)")
+
+
+if __name__ == "__main__":
+    main()
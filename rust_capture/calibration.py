@@ -0,0 +1,193 @@
+import json
+import os
+import time
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+from rust_capture.digits import text_mask, _runs
+
+CALIBRATION_FILE = Path(os.environ.get("RUST_CALIBRATION", Path(__file__).parent.parent / "calibration.json"))
+EDGE_CONTRAST = 24   # grey-level step between neighbouring pixels that counts as an edge
+MIN_BORDER = 0.25    # unbroken edge run, as a fraction of the row/column, that makes a panel border
+MIN_PANEL = 0.2      # panel spans at least this fraction of the frame each way
+BORDER_INSET = 3     # px skipped inside a border before looking for text
+COLUMN_GAP = 0.04    # blank run, as a fraction of the panel width, that separates columns
+PADDING = 6          # px kept around the ink of each column
+MIN_PITCH = 16       # px; smallest row pitch searched
+MIN_INK, MAX_INK = 0.002, 0.35  # share of text pixels a capture box showing the list has
+PITCH_TOLERANCE = 2  # px a box's measured row pitch may differ from the stored one
+
+# box and columns are (left, top, right, bottom) in screen coordinates;
+# resolution is the (width, height) of the screen they were measured on
+Calibration = namedtuple("Calibration", "resolution box columns row_pitch")
+
+
+def _gray(frame):
+    arr = np.asarray(frame)
+    if arr.ndim == 3:
+        arr = arr[..., :3].mean(axis=2)
+    return arr.astype(np.int16)
+
+
+def _longest_runs(edges):
+    """Length of the longest unbroken run of edge pixels in each row."""
+    idx = np.arange(edges.shape[1])
+    last_gap = np.where(edges, -1, idx)
+    np.maximum.accumulate(last_gap, axis=1, out=last_gap)
+    return (idx - last_gap).max(axis=1)
+
+
+def _border_strength(edges, axis):
+    """Per line, the longest straight edge as a fraction of the line; texture
+    and text give short runs, a panel border one long one."""
+    if axis == 0:
+        edges = edges.T
+    return _longest_runs(edges) / max(1, edges.shape[1])
+
+
+def _borders(strength, min_size):
+    """First and last line with a border-length edge, or None. Text cut by a
+    border breaks its run, so only MIN_BORDER of the line is needed."""
+    if strength.size == 0 or strength.max() < MIN_BORDER:
+        return None
+    lines = np.flatnonzero(strength >= MIN_BORDER)
+    if lines[-1] - lines[0] < min_size:
+        return None
+    return int(lines[0]), int(lines[-1])
+
+
+def find_panel(gray):
+    """(left, top, right, bottom) of the bordered panel in a grey frame; the
+    whole frame when no border stands out."""
+    h, w = gray.shape
+    left, right = 0, w
+    cols = _borders(_border_strength(np.abs(np.diff(gray, axis=1)) > EDGE_CONTRAST, 0), MIN_PANEL * w)
+    if cols:
+        left, right = cols[0] + 1, cols[1] + 1
+    # horizontal borders only count within the vertical ones
+    rows = _borders(_border_strength(np.abs(np.diff(gray[:, left:right], axis=0)) > EDGE_CONTRAST, 1), MIN_PANEL * h)
+    top, bottom = (rows[0] + 1, rows[1] + 1) if rows else (0, h)
+    return left, top, right, bottom
+
+
+def row_pitch(mask):
+    """Row spacing of the list in px (autocorrelation of the ink profile), or 0."""
+    profile = mask.mean(axis=1)
+    profile = profile - profile.mean()
+    n = profile.size
+    if n < 2 * MIN_PITCH or not profile.any():
+        return 0
+    ac = np.correlate(profile, profile, mode="full")[n - 1:]
+    ac /= np.arange(n, 0, -1)  # unbiased: fewer overlapping rows at larger lags
+    lags = ac[MIN_PITCH:n // 2]
+    if lags.size == 0:
+        return 0
+    # first peak close to the best one: the base period rather than a multiple
+    best = lags.max()
+    peaks = [i for i in range(1, lags.size - 1)
+             if lags[i] >= lags[i - 1] and lags[i] >= lags[i + 1] and lags[i] >= 0.8 * best]
+    return int((peaks[0] if peaks else int(lags.argmax())) + MIN_PITCH)
+
+
+def detect(frame, origin=(0, 0), resolution=None):
+    """Calibration from a frame showing the mute list, or None.
+
+    The panel is found from its long straight borders (edge projections),
+    then the text columns inside it from the ink's column profile. A
+    column starts PADDING before its ink and runs to the next column (or
+    the panel edge), since longer names than the ones on screen may turn
+    up; it spans the panel's full height, as the list scrolls through it.
+    origin is the screen position of the frame's top-left pixel.
+    """
+    gray = _gray(frame)
+    h, w = gray.shape
+    left, top, right, bottom = find_panel(gray)
+    inset = BORDER_INSET if (left, top, right, bottom) != (0, 0, w, h) else 0
+    inner = gray[top + inset:bottom - inset, left + inset:right - inset]
+    if inner.size == 0:
+        return None
+    mask = text_mask(inner.astype(np.uint8))
+    runs = _runs(mask.sum(axis=0), min_len=2, max_gap=int(COLUMN_GAP * inner.shape[1]))
+    if not runs:
+        return None
+    ox, oy = origin
+    x0, y0 = ox + left + inset, oy + top + inset
+    y1 = oy + bottom - inset
+    starts = [max(ox + left, x0 + s - PADDING) for s, _ in runs]
+    ends = starts[1:] + [ox + right - inset]
+    columns = [(s, y0, e, y1) for s, e in zip(starts, ends)]
+    box = (min(c[0] for c in columns), y0, max(c[2] for c in columns), y1)
+    return Calibration(tuple(resolution or (ox + w, oy + h)), box, columns, row_pitch(mask))
+
+
+def check(frame, calibration=None):
+    """Quick check that a frame of the capture box shows the list: some but
+    not too much ink, rows at a regular pitch, and that pitch matching the
+    calibration's (when it has one)."""
+    mask = text_mask(_gray(frame).astype(np.uint8))
+    if not MIN_INK <= mask.mean() <= MAX_INK:
+        return False
+    pitch = row_pitch(mask)
+    if not pitch:
+        return False
+    stored = calibration.row_pitch if calibration else 0
+    return not stored or abs(pitch - stored) <= PITCH_TOLERANCE
+
+
+def screen_resolution():
+    """(width, height) of the primary screen, or None where it can't be read."""
+    try:
+        import ctypes
+        user32 = ctypes.windll.user32
+        return user32.GetSystemMetrics(0), user32.GetSystemMetrics(1)
+    except (AttributeError, OSError):
+        pass
+    try:
+        from PIL import ImageGrab
+        return ImageGrab.grab().size
+    except Exception:
+        return None
+
+
+def resolution_key(resolution):
+    return f"{resolution[0]}x{resolution[1]}"
+
+
+def load_all(path=CALIBRATION_FILE):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def load(resolution, path=CALIBRATION_FILE):
+    """The stored Calibration for a screen resolution, or None."""
+    if not resolution:
+        return None
+    entry = load_all(path).get(resolution_key(resolution))
+    if not entry:
+        return None
+    try:
+        return Calibration(
+            tuple(entry["resolution"]), tuple(entry["box"]),
+            [tuple(c) for c in entry["columns"]], entry.get("row_pitch", 0),
+        )
+    except (KeyError, TypeError):
+        print(f"[CALIBRATION] Ignoring malformed entry for {resolution_key(resolution)} in {path}")
+        return None
+
+
+def save(calibration, path=CALIBRATION_FILE):
+    """Store a Calibration under its resolution, keeping other resolutions."""
+    data = load_all(path)
+    entry = calibration._asdict()
+    entry["saved"] = time.strftime("%Y-%m-%d %H:%M:%S")
+    data[resolution_key(calibration.resolution)] = entry
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+    return path
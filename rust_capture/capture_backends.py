@@ -0,0 +1,234 @@
+import os
+import sys
+import threading
+import time
+import numpy as np
+from PIL import Image
+
+try:
+    import mss  # optional, fast cross-platform grabs
+except ImportError:
+    mss = None
+
+CAPTURE_BACKEND = os.environ.get("RUST_CAPTURE_BACKEND", "auto")  # auto | gdi | mss | pil | replay
+
+
+class CaptureBackend:
+    """Grabs one fixed screen box.
+
+    grab() returns an (h, w, channels) uint8 NumPy array in `order` channel
+    order. Backends that reuse a buffer return a view of it, which the
+    next grab() overwrites; grab_rgb() is the same frame as an RGB view
+    and grab_image() gives a PIL image copy. Grab times are kept for
+    stats().
+    """
+
+    name = "base"
+    order = "RGB"
+
+    def __init__(self, bbox):
+        self.bbox = tuple(bbox)
+        left, top, right, bottom = self.bbox
+        self.width, self.height = right - left, bottom - top
+        self.grabs = 0
+        self.grab_ms = 0.0
+
+    def _grab(self):
+        raise NotImplementedError
+
+    def grab(self):
+        start = time.perf_counter()
+        frame = self._grab()
+        self.grab_ms += (time.perf_counter() - start) * 1000
+        self.grabs += 1
+        return frame
+
+    def grab_rgb(self):
+        frame = self.grab()
+        if self.order == "RGB":
+            return frame if frame.shape[2] == 3 else frame[..., :3]
+        return frame[..., 2::-1]  # BGRA -> RGB, no copy
+
+    def grab_image(self):
+        frame = self.grab()
+        if self.order == "RGB":
+            return Image.fromarray(frame)
+        h, w = frame.shape[:2]
+        return Image.frombuffer("RGB", (w, h), frame, "raw", "BGRX", 0, 1)
+
+    def close(self):
+        pass
+
+    def stats(self):
+        mean = self.grab_ms / self.grabs if self.grabs else 0.0
+        return f"{self.name}: {self.grabs} grabs, {mean:.2f} ms/grab"
+
+
+class PILBackend(CaptureBackend):
+    """ImageGrab: a new image per grab. Always available where PIL can grab."""
+
+    name = "pil"
+
+    def __init__(self, bbox):
+        super().__init__(bbox)
+        from PIL import ImageGrab
+        self._imagegrab = ImageGrab
+
+    def _grab(self):
+        return np.asarray(self._imagegrab.grab(bbox=self.bbox))
+
+    def grab_image(self):
+        start = time.perf_counter()
+        img = self._imagegrab.grab(bbox=self.bbox)  # already a PIL image, skip the array round trip
+        self.grab_ms += (time.perf_counter() - start) * 1000
+        self.grabs += 1
+        return img
+
+
+class MSSBackend(CaptureBackend):
+    """mss grabs (XGetImage/XShm on Linux, BitBlt on Windows, CoreGraphics on
+    macOS), returned as a BGRA view of mss' buffer without another copy.
+    mss handles are per thread."""
+
+    name = "mss"
+    order = "BGRA"
+
+    def __init__(self, bbox):
+        if mss is None:
+            raise RuntimeError("mss is not installed")
+        super().__init__(bbox)
+        left, top = self.bbox[:2]
+        self.monitor = {"left": left, "top": top, "width": self.width, "height": self.height}
+        self._local = threading.local()
+
+    def _grab(self):
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = self._local.sct = mss.mss()
+        shot = sct.grab(self.monitor)
+        return np.frombuffer(shot.raw, np.uint8).reshape(shot.height, shot.width, 4)
+
+
+class GDIBackend(CaptureBackend):
+    """Windows BitBlt into a DIB section allocated once.
+
+    The DIB's pixel memory is wrapped as a NumPy array, so a grab is one
+    BitBlt with no allocation or copy. Layered windows (our own overlays)
+    are not captured, since CAPTUREBLT is not used.
+    """
+
+    name = "gdi"
+    order = "BGRA"
+    SRCCOPY = 0x00CC0020
+
+    def __init__(self, bbox):
+        if sys.platform != "win32":
+            raise RuntimeError("GDI capture is Windows only")
+        super().__init__(bbox)
+        import ctypes
+        from ctypes import wintypes
+
+        class BITMAPINFOHEADER(ctypes.Structure):
+            _fields_ = [
+                ("biSize", wintypes.DWORD), ("biWidth", wintypes.LONG), ("biHeight", wintypes.LONG),
+                ("biPlanes", wintypes.WORD), ("biBitCount", wintypes.WORD), ("biCompression", wintypes.DWORD),
+                ("biSizeImage", wintypes.DWORD), ("biXPelsPerMeter", wintypes.LONG), ("biYPelsPerMeter", wintypes.LONG),
+                ("biClrUsed", wintypes.DWORD), ("biClrImportant", wintypes.DWORD),
+            ]
+
+        user32, gdi32 = ctypes.windll.user32, ctypes.windll.gdi32
+        handle = ctypes.c_void_p
+        user32.GetDC.restype = handle
+        user32.GetDC.argtypes = [handle]
+        user32.ReleaseDC.argtypes = [handle, handle]
+        gdi32.CreateCompatibleDC.restype = handle
+        gdi32.CreateCompatibleDC.argtypes = [handle]
+        gdi32.CreateDIBSection.restype = handle
+        gdi32.CreateDIBSection.argtypes = [handle, ctypes.c_void_p, wintypes.UINT,
+                                           ctypes.POINTER(ctypes.c_void_p), handle, wintypes.DWORD]
+        gdi32.SelectObject.restype = handle
+        gdi32.SelectObject.argtypes = [handle, handle]
+        gdi32.BitBlt.argtypes = [handle, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                                 handle, ctypes.c_int, ctypes.c_int, wintypes.DWORD]
+        gdi32.DeleteObject.argtypes = [handle]
+        gdi32.DeleteDC.argtypes = [handle]
+        self.user32, self.gdi32 = user32, gdi32
+
+        header = BITMAPINFOHEADER()
+        header.biSize = ctypes.sizeof(BITMAPINFOHEADER)
+        header.biWidth = self.width
+        header.biHeight = -self.height  # negative: top-down rows
+        header.biPlanes = 1
+        header.biBitCount = 32
+        header.biCompression = 0  # BI_RGB
+
+        self.screen_dc = user32.GetDC(None)
+        self.mem_dc = gdi32.CreateCompatibleDC(self.screen_dc)
+        bits = ctypes.c_void_p()
+        self.bitmap = gdi32.CreateDIBSection(self.mem_dc, ctypes.byref(header), 0, ctypes.byref(bits), None, 0)
+        if not self.bitmap or not bits.value:
+            self.close()
+            raise OSError("CreateDIBSection failed")
+        gdi32.SelectObject(self.mem_dc, self.bitmap)
+        pixels = (ctypes.c_ubyte * (self.width * self.height * 4)).from_address(bits.value)
+        self.buffer = np.frombuffer(pixels, np.uint8).reshape(self.height, self.width, 4)
+
+    def _grab(self):
+        left, top = self.bbox[:2]
+        if not self.gdi32.BitBlt(self.mem_dc, 0, 0, self.width, self.height,
+                                 self.screen_dc, left, top, self.SRCCOPY):
+            raise OSError("BitBlt failed")
+        self.gdi32.GdiFlush()
+        return self.buffer
+
+    def close(self):
+        if getattr(self, "bitmap", None):
+            self.gdi32.DeleteObject(self.bitmap)
+            self.bitmap = None
+        if getattr(self, "mem_dc", None):
+            self.gdi32.DeleteDC(self.mem_dc)
+            self.mem_dc = None
+        if getattr(self, "screen_dc", None):
+            self.user32.ReleaseDC(None, self.screen_dc)
+            self.screen_dc = None
+
+
+class ReplayBackend(CaptureBackend):
+    """Frames from a frame archive (see rust_capture.sources), looped, copied
+    into one preallocated buffer like a real screen backend. For testing."""
+
+    name = "replay"
+
+    def __init__(self, bbox, path):
+        from rust_capture.sources import ReplaySource
+        self.source = ReplaySource(path, loop=True)
+        first = self.source.frame(0)
+        super().__init__(bbox or (0, 0, first.width, first.height))
+        self.buffer = np.empty((first.height, first.width, 3), np.uint8)
+
+    def _grab(self):
+        np.copyto(self.buffer, np.asarray(self.source.grab()))
+        return self.buffer
+
+    def close(self):
+        self.source.close()
+
+
+def get_capture_backend(bbox, name=CAPTURE_BACKEND, replay=None):
+    """Capture backend for bbox; 'auto' prefers GDI on Windows, then mss, then PIL."""
+    if name == "replay":
+        return ReplayBackend(bbox, replay or os.environ.get("RUST_REPLAY"))
+    if name == "auto":
+        candidates = (["gdi"] if sys.platform == "win32" else []) + (["mss"] if mss is not None else []) + ["pil"]
+    else:
+        candidates = [name]
+    backends = {"gdi": GDIBackend, "mss": MSSBackend, "pil": PILBackend}
+    for candidate in candidates:
+        try:
+            backend = backends[candidate](bbox)
+            print(f"[Capture] Using {backend.name} backend")
+            return backend
+        except Exception as e:
+            if candidate == candidates[-1]:
+                raise
+            print(f"[Capture] {candidate} backend unavailable ({e})")
@@ -0,0 +1,128 @@
+import csv
+import io
+import os
+import threading
+import time
+
+HEADER = ["name", "steamid", "profile_url"]
+FSYNC_EVERY = 32       # rows appended between fsyncs
+FSYNC_INTERVAL = 2.0   # seconds; pending rows are fsynced at least this often
+
+
+def profile_url(sid):
+    return f"https://steamcommunity.com/profiles/{sid}"
+
+
+class CaptureLogWriter:
+    """Append-only writer for mute_list.csv.
+
+    Rows are flushed to the OS on every append, so readers see them at
+    once, and fsynced in batches (every FSYNC_EVERY rows or FSYNC_INTERVAL
+    seconds, and on close). IDs already in the file are skipped, so
+    appending the same capture twice is harmless.
+    """
+
+    def __init__(self, path, fsync_every=FSYNC_EVERY, fsync_interval=FSYNC_INTERVAL):
+        self.path = str(path)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.lock = threading.Lock()
+        self.seen = set()
+        if os.path.exists(self.path):
+            with open(self.path, newline="", encoding="utf-8") as f:
+                self.seen = {row["steamid"].strip() for row in csv.DictReader(f) if row.get("steamid")}
+        self.file = open(self.path, "a", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        if self.file.tell() == 0:
+            self.writer.writerow(HEADER)
+        self.pending = 0
+        self.last_sync = time.monotonic()
+
+    def append(self, entries):
+        """Append [(sid, name)] not yet in the log; returns how many were written."""
+        with self.lock:
+            written = 0
+            for sid, name in entries:
+                if sid in self.seen:
+                    continue
+                self.seen.add(sid)
+                self.writer.writerow([name, sid, profile_url(sid)])
+                written += 1
+            if written:
+                self.file.flush()
+                self.pending += written
+            if self.pending and (self.pending >= self.fsync_every
+                                 or time.monotonic() - self.last_sync >= self.fsync_interval):
+                self._sync()
+            return written
+
+    def _sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.pending = 0
+        self.last_sync = time.monotonic()
+
+    def sync(self):
+        with self.lock:
+            if self.pending:
+                self._sync()
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self._sync()
+                self.file.close()
+
+
+class CaptureLogReader:
+    """Returns only the rows appended to the capture CSV since the last read.
+
+    The byte offset of the last complete row is kept in memory, and in
+    `offset_file` when one is given, so a new process resumes where the
+    previous one stopped. A half-written last line is left for the next
+    read. If the file shrinks (recreated), reading restarts from the top.
+    """
+
+    def __init__(self, path, offset_file=None):
+        self.path = str(path)
+        self.offset_file = str(offset_file) if offset_file else None
+        self.offset = 0
+        if self.offset_file and os.path.exists(self.offset_file):
+            try:
+                with open(self.offset_file, encoding="utf-8") as f:
+                    self.offset = int(f.read().strip() or 0)
+            except (OSError, ValueError):
+                self.offset = 0
+        self._next = self.offset
+
+    def read_new(self):
+        """Rows (dicts keyed by HEADER) appended since the last commit()."""
+        if not os.path.exists(self.path):
+            return []
+        if os.path.getsize(self.path) < self.offset:
+            self.offset = 0
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        self._next = self.offset + end
+        lines = data[:end].decode("utf-8", errors="ignore")
+        rows = []
+        for values in csv.reader(io.StringIO(lines, newline="")):
+            if not values or values == HEADER:
+                continue
+            rows.append(dict(zip(HEADER, (v.strip() for v in values))))
+        return rows
+
+    def commit(self):
+        """Mark everything returned by read_new() as processed."""
+        self.offset = self._next
+        if self.offset_file:
+            tmp = self.offset_file + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(str(self.offset))
+            os.replace(tmp, self.offset_file)
+
+    def reset(self):
+        self.offset = self._next = 0
+        self.commit()
@@ -0,0 +1,66 @@
+import numpy as np
+from PIL import Image
+
+DETECT_SIZE = (160, 96)   # thumbnail the comparison runs on
+MAD_THRESHOLD = 1.5       # mean abs diff (0-255) below which frames count as equal
+DHASH_SIZE = 16           # hash is DHASH_SIZE x DHASH_SIZE bits
+DHASH_THRESHOLD = 3       # differing bits below which frames count as equal
+
+
+def thumbnail(img, size=DETECT_SIZE):
+    """Downsampled grayscale copy of a capture as a float32 array."""
+    if not hasattr(img, "convert"):
+        img = Image.fromarray(np.asarray(img))
+    return np.asarray(img.convert("L").resize(size, Image.BILINEAR), dtype=np.float32)
+
+
+def dhash(thumb):
+    """Difference hash of a thumbnail (horizontal gradient signs)."""
+    small = Image.fromarray(thumb.astype(np.uint8)).resize((DHASH_SIZE + 1, DHASH_SIZE), Image.BILINEAR)
+    small = np.asarray(small, dtype=np.int16)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+class FrameChangeDetector:
+    """Tells the capture loop whether a frame is worth running OCR on.
+
+    A frame is compared against the last frame that was *processed*, so a
+    slow drift still triggers OCR once it adds up. method is "mad" (mean
+    absolute difference, sensitive to small scrolls) or "dhash"
+    (perceptual hash, ignores noise and hover highlights).
+    """
+
+    def __init__(self, method="mad", threshold=None, size=DETECT_SIZE):
+        self.method = method
+        self.threshold = threshold if threshold is not None else (
+            MAD_THRESHOLD if method == "mad" else DHASH_THRESHOLD
+        )
+        self.size = size
+        self.reference = None
+        self.last_thumb = None
+        self.skipped = 0
+        self.processed = 0
+
+    def reset(self):
+        self.reference = None
+
+    def difference(self, thumb):
+        if self.method == "dhash":
+            return bin(dhash(thumb) ^ self.reference).count("1")
+        return float(np.abs(thumb - self.reference).mean())
+
+    def changed(self, img):
+        """True (and remember the frame) if img differs from the last processed one."""
+        thumb = self.last_thumb = thumbnail(img, self.size)
+        if self.reference is not None and self.difference(thumb) < self.threshold:
+            self.skipped += 1
+            return False
+        self.reference = dhash(thumb) if self.method == "dhash" else thumb
+        self.processed += 1
+        return True
+
+    def stats(self):
+        total = self.skipped + self.processed
+        rate = self.skipped / total * 100 if total else 0.0
+        return f"{self.processed} frames processed, {self.skipped} skipped ({rate:.0f}% unchanged)"
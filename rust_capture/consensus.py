@@ -0,0 +1,129 @@
+import os
+import threading
+
+MIN_VOTES = int(os.environ.get("RUST_MIN_VOTES", 2))  # agreeing frames before an ID is committed
+HIGH_CONFIDENCE = 90   # a single read at least this confident commits at once
+MAX_AGE = 40           # frames a candidate may go unseen before it is dropped
+
+
+def _wildcards(sid):
+    """Keys shared by every ID that differs from sid in exactly one digit."""
+    return [sid[:i] + "?" + sid[i + 1:] for i in range(len(sid))]
+
+
+def _overlap(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+class Candidate:
+    __slots__ = ("sid", "name", "votes", "conf", "box", "frame", "rows")
+
+    def __init__(self, sid, name, conf, box, frame):
+        self.sid, self.name, self.conf, self.box, self.frame = sid, name, conf, box, frame
+        self.votes = 0
+        self.rows = None  # (top, bottom) in list coordinates: frame rows + scroll position
+
+
+class IDConsensus:
+    """Commits SteamIDs only once several frames agree on them.
+
+    observe() takes one frame's reads, [(sid, name, box, conf)], and returns
+    the IDs that became committed, [(sid, name)]. A candidate is committed
+    after MIN_VOTES frames read it, or at once when a read is at least
+    HIGH_CONFIDENCE. A read one digit away from a committed ID is treated
+    as a misread of it and merged, unless both are seen in the same frame
+    at different places (two real players). Candidates that stop showing
+    up are dropped after MAX_AGE frames.
+
+    Since the capture loops only OCR rows a scroll revealed, a pending ID
+    would rarely be read twice; plan_band() widens the band to the whole
+    frame while a pending ID is in view. scroll_pos is the running sum of
+    ScrollTracker offsets, which maps frame rows to list rows.
+    """
+
+    def __init__(self, min_votes=MIN_VOTES, high_confidence=HIGH_CONFIDENCE, max_age=MAX_AGE):
+        self.min_votes = max(1, min_votes)
+        self.high_confidence = high_confidence
+        self.max_age = max_age
+        self.committed = {}    # sid -> name
+        self.candidates = {}   # sid -> Candidate
+        self.neighbours = {}   # wildcard key -> committed sids
+        self.distinct = set()  # one digit from a committed ID, but seen beside it
+        self.frame = 0
+        self.merged = 0
+        self.expired = 0
+        self.lock = threading.Lock()  # the pipeline plans bands and observes on different threads
+
+    def _near_committed(self, sid):
+        for key in _wildcards(sid):
+            for other in self.neighbours.get(key, ()):
+                if other != sid:
+                    return other
+        return None
+
+    def _commit(self, cand):
+        self.committed[cand.sid] = cand.name
+        for key in _wildcards(cand.sid):
+            self.neighbours.setdefault(key, set()).add(cand.sid)
+        # pending misreads of the new ID go with it
+        for other in list(self.candidates):
+            if other != cand.sid and sum(a != b for a, b in zip(other, cand.sid)) == 1:
+                del self.candidates[other]
+                self.merged += 1
+        del self.candidates[cand.sid]
+
+    def observe(self, entries, scroll_pos=0):
+        with self.lock:
+            return self._observe(entries, scroll_pos)
+
+    def _observe(self, entries, scroll_pos):
+        self.frame += 1
+        boxes = {sid: box for sid, _, box, _ in entries}  # for the same-frame check
+        new = []
+        for sid, name, box, conf in entries:
+            if sid in self.committed:
+                if self.committed[sid] == sid and name != sid:
+                    self.committed[sid] = name  # a name turned up for an ID-only entry
+                continue
+            near = self._near_committed(sid) if sid not in self.distinct else None
+            if near is not None:
+                if not (near in boxes and not _overlap(boxes[near], box)):
+                    self.merged += 1
+                    continue
+                self.distinct.add(sid)  # seen next to its neighbour: a different player
+            cand = self.candidates.get(sid)
+            if cand is None:
+                cand = self.candidates[sid] = Candidate(sid, name, conf, box, self.frame)
+            if cand.frame != self.frame or cand.votes == 0:
+                cand.votes += 1
+            cand.frame, cand.box = self.frame, box
+            cand.rows = (box[1] + scroll_pos, box[3] + scroll_pos)
+            cand.conf = max(cand.conf, conf)
+            if cand.name == sid and name != sid:
+                cand.name = name
+            if cand.votes >= self.min_votes or conf >= self.high_confidence:
+                self._commit(cand)
+                new.append((sid, cand.name))
+
+        for sid in [s for s, c in self.candidates.items() if self.frame - c.frame > self.max_age]:
+            del self.candidates[sid]
+            self.expired += 1
+        return new
+
+    def plan_band(self, band, scroll_pos, height):
+        """The band to OCR: `band` (or None), or the whole frame if a pending
+        ID is in view outside it."""
+        with self.lock:
+            rows = [c.rows for c in self.candidates.values() if c.rows]
+        top, bottom = band or (height, height)
+        for t, b in rows:
+            t, b = t - scroll_pos, b - scroll_pos
+            if b > 0 and t < height and (t < top or b > bottom):
+                return 0, height
+        return band
+
+    def stats(self):
+        return (
+            f"{len(self.committed)} committed, {len(self.candidates)} pending, "
+            f"{self.merged} near-duplicate reads merged, {self.expired} unconfirmed dropped"
+        )
@@ -0,0 +1,388 @@
+import os
+import threading
+import time
+from pathlib import Path
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from rust_capture.parsing import steamid_re
+from rust_capture.line_cache import LineCache, line_key, CACHE_SIZE
+
+TEMPLATES_FILE = Path(__file__).parent.parent / "digit_templates.npz"
+TEMPLATE_FONTS = [os.environ.get("RUST_DIGIT_FONT", ""), "RobotoCondensed-Bold.ttf", "Roboto-Regular.ttf",
+                  "arial.ttf", "DejaVuSans.ttf"]
+FAST_PATH = os.environ.get("RUST_ID_FASTPATH", "1") != "0"
+LINE_CACHE_SIZE = int(os.environ.get("RUST_LINE_CACHE", CACHE_SIZE))  # 0 disables the line cache
+FULL_PAGE_LINES = 6            # more uncached lines than this: one full-page Tesseract pass
+VERIFY_LINES = int(os.environ.get("RUST_ID_VERIFY", 10))  # fast-path reads Tesseract must confirm in a row (0 = trust)
+SPOT_CHECK_EVERY = 50          # once trusted, every Nth fast-path line is still confirmed
+
+GLYPH_W, GLYPH_H = 12, 16      # normalized glyph size
+MAX_DISTANCE = 0.2             # cosine distance above which a glyph is rejected
+MIN_MARGIN = 0.05              # required gap between a glyph's best and second-best template
+MIN_LINE_HEIGHT = 6            # px (preprocessed image)
+WORD_GAP = 0.6                 # column gap, as a fraction of line height, that splits words
+ID_LENGTH = 17
+SAVE_EVERY = 50                # learned samples between template saves
+LOCK_STALE = 30                # s after which a leftover save lock is broken
+
+
+def text_mask(gray):
+    """Boolean mask of text pixels. The minority side of an Otsu split is text,
+    so it works for light-on-dark (the game UI) and dark-on-light alike."""
+    gray = np.asarray(gray)
+    if gray.ndim == 3:
+        gray = gray[..., :3].mean(axis=2).astype(np.uint8)
+    hist = np.bincount(gray[::2, ::2].ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256)
+    w0 = np.cumsum(hist)
+    m0 = np.cumsum(hist * levels)
+    total = w0[-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        between = (m0[-1] * w0 / total - m0) ** 2 / (w0 * (total - w0))
+    if np.isnan(between).all():
+        return np.zeros(gray.shape, bool)  # a single grey level: no text
+    t = int(np.nanargmax(between))
+    bright = gray > t
+    return bright if bright.mean() < 0.5 else ~bright
+
+
+def _runs(profile, min_len=1, max_gap=0):
+    """(start, end) runs of non-zero entries, bridging gaps up to max_gap."""
+    on = np.flatnonzero(profile > 0)
+    if on.size == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(on) > max_gap + 1)
+    starts = np.concatenate(([on[0]], on[breaks + 1]))
+    ends = np.concatenate((on[breaks], [on[-1]])) + 1
+    return [(int(s), int(e)) for s, e in zip(starts, ends) if e - s >= min_len]
+
+
+def segment_lines(mask):
+    """Text lines as (top, bottom) row ranges."""
+    return _runs(mask.sum(axis=1), min_len=MIN_LINE_HEIGHT, max_gap=1)
+
+
+def segment_words(line_mask):
+    """Words in a line as lists of glyph (x0, x1) column ranges."""
+    glyphs = _runs(line_mask.sum(axis=0))
+    if not glyphs:
+        return []
+    gap = max(2, int(line_mask.shape[0] * WORD_GAP))
+    words = [[glyphs[0]]]
+    for g in glyphs[1:]:
+        if g[0] - words[-1][-1][1] >= gap:
+            words.append([])
+        words[-1].append(g)
+    return words
+
+
+def glyph_vector(glyph_mask):
+    """Normalize a glyph crop to a unit GLYPH_W x GLYPH_H vector (aspect kept).
+
+    Each output cell averages a 3x3 grid of samples, which is close to an
+    area resize at a fraction of the cost of a PIL round trip per glyph.
+    """
+    rows = np.flatnonzero(glyph_mask.any(axis=1))
+    if rows.size == 0:
+        return np.zeros(GLYPH_W * GLYPH_H, np.float32)
+    g = glyph_mask[rows[0]:rows[-1] + 1]
+    h, w = g.shape
+    side_w = max(w, int(round(h * GLYPH_W / GLYPH_H)))
+    pad = (side_w - w) // 2
+    ri = ((np.arange(GLYPH_H * 3) + 0.5) * h / (GLYPH_H * 3)).astype(int)
+    ci = ((np.arange(GLYPH_W * 3) + 0.5) * side_w / (GLYPH_W * 3)).astype(int) - pad
+    inside = (ci >= 0) & (ci < w)
+    samples = np.zeros((GLYPH_H * 3, GLYPH_W * 3), np.float32)
+    samples[:, inside] = g[np.ix_(ri, ci[inside])]
+    v = samples.reshape(GLYPH_H, 3, GLYPH_W, 3).mean(axis=(1, 3)).ravel()
+    n = np.linalg.norm(v)
+    return v / n if n else v
+
+
+def render_templates(font_names=TEMPLATE_FONTS, size=40):
+    """Bootstrap digit templates from the first installed font in font_names."""
+    font = None
+    for name in font_names:
+        if not name:
+            continue
+        try:
+            font = ImageFont.truetype(name, size)
+            break
+        except OSError:
+            continue
+    font = font or ImageFont.load_default(size=size)
+    vecs = []
+    for d in "0123456789":
+        img = Image.new("L", (size * 2, size * 2), 0)
+        ImageDraw.Draw(img).text((size // 2, size // 4), d, fill=255, font=font)
+        mask = np.asarray(img) > 127
+        cols = np.flatnonzero(mask.any(axis=0))
+        vecs.append(glyph_vector(mask[:, cols[0]:cols[-1] + 1]))
+    return np.stack(vecs)
+
+
+class DigitTemplates:
+    """Mean glyph vector per digit, refined from SteamIDs Tesseract confirmed."""
+
+    def __init__(self, path=TEMPLATES_FILE):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.learned = 0
+        self.sums, self.counts = self._load()
+        self._update()
+
+    def _load(self):
+        if self.path.exists():
+            try:
+                with np.load(self.path) as data:
+                    sums, counts = data["sums"], data["counts"]
+                if sums.shape == (10, GLYPH_W * GLYPH_H) and counts.shape == (10,):
+                    return sums, counts
+                print(f"[DIGITS] {self.path.name} has the wrong shape, re-rendering the templates")
+            except Exception as e:
+                print(f"[DIGITS] Could not load {self.path.name} ({e}), re-rendering the templates")
+        return render_templates(), np.ones(10)
+
+    def _update(self):
+        t = self.sums / self.counts[:, None]
+        self.templates = t / np.linalg.norm(t, axis=1, keepdims=True)
+
+    def classify(self, vecs):
+        """(digits, distances, margins) for an (n, D) array of glyph vectors;
+        a margin is how much further the second-best template is."""
+        dist = 1.0 - vecs @ self.templates.T
+        rows = np.arange(len(dist))
+        order = np.argsort(dist, axis=1)
+        best, second = dist[rows, order[:, 0]], dist[rows, order[:, 1]]
+        return order[:, 0], best, second - best
+
+    def learn(self, vecs, text):
+        with self.lock:
+            for v, ch in zip(vecs, text):
+                self.sums[int(ch)] += v
+                self.counts[int(ch)] += 1
+            self._update()
+            self.learned += 1
+            if self.learned % SAVE_EVERY == 0:
+                self.save()
+
+    def save(self):
+        """Write the templates atomically. Every OCR worker process learns on
+        its own copy, so each writes its own temp file and the replace is
+        taken under a lock file; a save that finds the lock held is skipped
+        (the next one retries) and the last complete set written wins."""
+        lock = self.path.with_suffix(".lock")
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp.npz")
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - lock.stat().st_mtime > LOCK_STALE:
+                    lock.unlink()  # left behind by a killed worker
+            except OSError:
+                pass
+            return
+        except OSError as e:
+            print(f"[DIGITS] Could not save templates: {e}")
+            return
+        try:
+            np.savez(tmp, sums=self.sums, counts=self.counts)
+            os.replace(tmp, self.path)
+        except OSError as e:  # e.g. Windows refusing the replace while a reader has the file open
+            print(f"[DIGITS] Could not save templates: {e}")
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+        finally:
+            os.close(fd)
+            try:
+                lock.unlink()
+            except OSError:
+                pass
+
+
+class SteamIDRecognizer:
+    """Reads 17-digit SteamIDs straight from glyph shapes.
+
+    Lines are split on the row projection, glyphs on the column projection,
+    and each glyph is matched against DigitTemplates. A word is accepted
+    only if it has 17 glyphs, every glyph is close to its template and
+    clearly closer than to any other (MIN_MARGIN), and the result starts
+    with 7656119. Lines that look like IDs but fail those checks are
+    returned as rejects for Tesseract to read.
+
+    Accepted reads are not trusted on their own: until VERIFY_LINES of
+    them in a row matched Tesseract's read of the same line, and every
+    SPOT_CHECK_EVERY lines after that, read_words has Tesseract confirm
+    the line and uses its words (see check()).
+    """
+
+    def __init__(self, templates=None, verify_lines=VERIFY_LINES):
+        self.templates = templates or DigitTemplates()
+        self.verify_lines = verify_lines
+        self.accepted = 0
+        self.rejected = 0
+        self.verified = 0      # accepted lines Tesseract agreed with since the last disagreement
+        self.mismatched = 0    # accepted lines Tesseract read differently
+        self.unchecked = 0     # accepted lines since the last check
+
+    def _word_vectors(self, mask, top, bottom, glyphs):
+        return np.stack([glyph_vector(mask[top:bottom, x0:x1]) for x0, x1 in glyphs])
+
+    def recognize_line(self, mask, top, bottom):
+        """Return (words, rejected) for one text line of the mask."""
+        words = []
+        candidates = [g for g in segment_words(mask[top:bottom]) if ID_LENGTH - 2 <= len(g) <= ID_LENGTH + 2]
+        for glyphs in candidates:  # no candidates: a name or UI text, not an ID line
+            word = None
+            if len(glyphs) == ID_LENGTH:
+                digits, dist, margin = self.templates.classify(self._word_vectors(mask, top, bottom, glyphs))
+                text = "".join(str(d) for d in digits)
+                worst = float(dist.max())
+                if worst <= MAX_DISTANCE and margin.min() >= MIN_MARGIN and steamid_re.fullmatch(text):
+                    word = {
+                        "text": text,
+                        "x": glyphs[0][0], "y": top,
+                        "w": glyphs[-1][1] - glyphs[0][0], "h": bottom - top,
+                        "conf": round(100 * (1 - worst / MAX_DISTANCE), 1),  # the worst glyph, not the mean
+                    }
+            if not word:
+                self.rejected += 1
+                return words, True
+            words.append(word)
+            self.accepted += 1
+        return words, False
+
+    def needs_check(self):
+        """Whether an accepted line has to be confirmed by Tesseract."""
+        if self.verified < self.verify_lines:
+            return True
+        return bool(SPOT_CHECK_EVERY) and self.unchecked + 1 >= SPOT_CHECK_EVERY
+
+    def check(self, mask, accepted, read):
+        """Compare a line's accepted words with Tesseract's read of it and
+        train the templates on the IDs Tesseract read. An ID Tesseract read
+        differently takes the trust away again; IDs it could not read prove
+        nothing either way."""
+        ids = {w["text"] for w in read if steamid_re.fullmatch(w["text"])}
+        for w in read:
+            if steamid_re.fullmatch(w["text"]):
+                self.learn_from(mask, w)
+        if not accepted or not ids:
+            return
+        self.unchecked = 0
+        if ids <= {w["text"] for w in accepted}:
+            self.verified += 1
+        else:
+            self.verified = 0
+            self.mismatched += 1
+
+    def recognize(self, img):
+        """Return (words, rejected_lines, mask) for a preprocessed image."""
+        mask = text_mask(img)
+        words, rejected = [], []
+        for top, bottom in segment_lines(mask):
+            line_words, failed = self.recognize_line(mask, top, bottom)
+            words.extend(line_words)
+            if failed:
+                rejected.append((top, bottom))
+        return words, rejected, mask
+
+    def learn_from(self, mask, word):
+        """Feed a Tesseract-read SteamID back into the templates."""
+        top, bottom = word["y"], word["y"] + word["h"]
+        x0, x1 = word["x"], word["x"] + word["w"]
+        glyphs = [(a + x0, b + x0) for a, b in _runs(mask[top:bottom, x0:x1].sum(axis=0))]
+        if len(glyphs) == ID_LENGTH:
+            self.templates.learn(self._word_vectors(mask, top, bottom, glyphs), word["text"])
+
+
+_local = threading.local()
+_cache = None
+
+
+def recognizer():
+    rec = getattr(_local, "rec", None)
+    if rec is None:
+        rec = _local.rec = SteamIDRecognizer()
+    return rec
+
+
+def read_words(img, backend, include_names=False, cache=None, psm=3):
+    """OCR words for a preprocessed frame, using the SteamID fast path.
+
+    The frame is segmented into text lines first, and lines already in the
+    line cache (same pixels, seen in an earlier frame) are answered from it.
+    With names requested (or the fast path disabled) the remaining lines go
+    through Tesseract and the IDs it reads train the digit templates.
+    Otherwise they go through the fast path, and ID lines it rejects, or
+    accepts but has to have confirmed (SteamIDRecognizer.needs_check), are
+    sent to Tesseract one line at a time; such a line gets Tesseract's
+    words. psm is the page-segmentation mode of the full-page pass.
+    """
+    cache = line_cache() if cache is None else cache
+    arr = np.asarray(img)
+    mask = text_mask(arr)
+    words, pending = [], []
+    for top, bottom in segment_lines(mask):
+        key = line_key(mask, top, bottom) if cache else None
+        cached = cache.get(key) if key else None
+        if cached is not None:
+            words.extend(cache.place(cached, LineCache.origin(mask, top, bottom)))
+        else:
+            pending.append((top, bottom, key))
+    if not pending:
+        return words
+
+    rec = recognizer() if FAST_PATH else None
+    if include_names or not FAST_PATH:
+        if len(pending) > FULL_PAGE_LINES:
+            page = backend.image_to_words(img, psm=psm)
+        else:
+            page = [w for top, bottom, _ in pending for w in _ocr_line(backend, arr, top, bottom)]
+        for top, bottom, key in pending:
+            line_words = [w for w in page if top <= w["y"] + w["h"] // 2 < bottom]
+            _remember(cache, key, mask, top, bottom, line_words, True)
+            for w in line_words:
+                if rec and steamid_re.fullmatch(w["text"]):
+                    rec.learn_from(mask, w)
+            words.extend(line_words)
+        return words
+
+    for top, bottom, key in pending:
+        line_words, failed = rec.recognize_line(mask, top, bottom)
+        if line_words and not rec.needs_check():
+            rec.unchecked += 1
+        elif failed or line_words:
+            accepted = [] if failed else line_words
+            line_words = _ocr_line(backend, arr, top, bottom)
+            rec.check(mask, accepted, line_words)
+            failed = True  # Tesseract's words: cached only if it read an ID
+        # a line nothing could read is retried next time rather than cached
+        ok = not failed or any(steamid_re.fullmatch(w["text"]) for w in line_words)
+        _remember(cache, key, mask, top, bottom, line_words, ok)
+        words.extend(line_words)
+    return words
+
+
+def _ocr_line(backend, arr, top, bottom, pad=4):
+    t, b = max(0, top - pad), min(arr.shape[0], bottom + pad)
+    words = backend.image_to_words(arr[t:b], psm=7)
+    for w in words:
+        w["y"] += t
+    return words
+
+
+def _remember(cache, key, mask, top, bottom, line_words, ok):
+    if key and ok:
+        cache.store(key, line_words, LineCache.origin(mask, top, bottom))
+
+
+def line_cache():
+    """Process-wide LineCache, or None when RUST_LINE_CACHE=0."""
+    global _cache
+    if _cache is None and LINE_CACHE_SIZE > 0:
+        _cache = LineCache(LINE_CACHE_SIZE)
+    return _cache
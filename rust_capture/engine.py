@@ -0,0 +1,158 @@
+import threading
+
+IDLE = "idle"
+STARTING = "starting"
+RUNNING = "running"
+STOPPING = "stopping"
+
+
+class CaptureResults:
+    """Thread-safe steamid -> name map of everything captured this session."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.names = {}
+
+    def add(self, sid, name):
+        """Record sid; True if it is new."""
+        with self.lock:
+            if sid in self.names:
+                return False
+            self.names[sid] = name
+            return True
+
+    def __contains__(self, sid):
+        with self.lock:
+            return sid in self.names
+
+    def __len__(self):
+        with self.lock:
+            return len(self.names)
+
+    def items(self):
+        with self.lock:
+            return list(self.names.items())
+
+
+class CaptureEngine:
+    """The one capture loop of the process.
+
+    States go idle -> starting -> running -> stopping -> idle. start() and
+    stop() may be called from any thread (hotkeys, buttons) any number of
+    times: start() only launches a worker from idle and stop() only acts
+    on a running one, so a click and a hotkey together still give one
+    loop. A start() while the loop is still stopping is queued and runs
+    once it has stopped (a stop() before then cancels it).
+    `loop(engine, include_names)` runs on the worker thread until
+    engine.running turns False. Listeners get the new state on the thread
+    that changed it, under the engine lock, so they must not call start()
+    or stop() themselves.
+    """
+
+    def __init__(self, loop=None, include_names=False):
+        self.loop = loop
+        self.include_names = include_names
+        self.results = CaptureResults()
+        self.state = IDLE
+        self.thread = None
+        self.restart = False  # start() arrived while stopping
+        self.listeners = []
+        self.lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self.state in (STARTING, RUNNING)
+
+    def on_state(self, callback):
+        self.listeners.append(callback)
+
+    def _set_state(self, state):
+        self.state = state
+        for callback in self.listeners:
+            try:
+                callback(state)
+            except Exception as e:
+                print(f"[ENGINE] State listener failed: {e}")
+
+    def start(self):
+        """Start capturing (or queue it while stopping); False if a loop is
+        already starting or running."""
+        with self.lock:
+            if self.state == STOPPING:
+                if not self.restart:
+                    self.restart = True
+                    print("[ENGINE] Capture still stopping; it will restart once stopped")
+                return True
+            if self.state != IDLE:
+                print(f"[ENGINE] Capture already {self.state}")
+                return False
+            self._launch()
+        return True
+
+    def _launch(self):
+        if self.loop is None:
+            raise RuntimeError("CaptureEngine has no capture loop")
+        self._set_state(STARTING)
+        self.thread = threading.Thread(target=self._run, daemon=True, name="capture")
+        self.thread.start()
+
+    def stop(self, wait=False, timeout=None):
+        """Ask the loop to finish; with wait, join it. False if nothing was running."""
+        with self.lock:
+            if self.state == STOPPING and self.restart:
+                self.restart = False
+                print("[ENGINE] Queued restart cancelled")
+                return True
+            if self.state not in (STARTING, RUNNING):
+                return False
+            self._set_state(STOPPING)
+            thread = self.thread
+        if wait and thread is not None:
+            thread.join(timeout)
+        return True
+
+    def join(self, timeout=None):
+        thread = self.thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self):
+        with self.lock:
+            if self.state == STARTING:
+                self._set_state(RUNNING)
+        try:
+            self.loop(self, self.include_names)
+        except Exception as e:
+            print(f"[ENGINE] Capture loop failed: {e}")
+        finally:
+            with self.lock:
+                self.thread = None
+                self._set_state(IDLE)
+                if self.restart:
+                    self.restart = False
+                    self._launch()
+
+    # Button/hotkey slots: no arguments, so Qt's `checked` is not taken for one
+    def start_capture(self):
+        self.start()
+
+    def stop_capture(self):
+        self.stop()
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine(loop=None, include_names=None):
+    """The process-wide CaptureEngine; the first caller with a loop sets it."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = CaptureEngine(loop, bool(include_names))
+        else:
+            if _engine.loop is None:
+                _engine.loop = loop
+            if include_names is not None:
+                _engine.include_names = include_names
+        return _engine
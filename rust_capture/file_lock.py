@@ -0,0 +1,49 @@
+import os
+import time
+from contextlib import contextmanager
+
+WAIT_POLL = 0.05  # s between attempts while waiting for a lock
+
+
+def try_lock(path, stale):
+    """Create the lock file at path; False if another process holds it. A
+    lock older than stale seconds was left by a killed process and is broken."""
+    for _ in range(2):
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) < stale:
+                    return False
+                print(f"[LOCK] Breaking stale lock {path}")
+                os.remove(path)
+            except OSError:
+                pass
+            continue
+        os.write(fd, str(os.getpid()).encode())
+        os.close(fd)
+        return True
+    return False
+
+
+def unlock(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+@contextmanager
+def file_lock(path, timeout=5.0, stale=30.0):
+    """Hold the lock file at path for a with block, waiting up to timeout
+    seconds for it (TimeoutError after that). For short critical sections
+    such as a read-modify-write of a JSON file."""
+    deadline = time.monotonic() + timeout
+    while not try_lock(path, stale):
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"{path} is held by another process")
+        time.sleep(WAIT_POLL)
+    try:
+        yield
+    finally:
+        unlock(path)
@@ -0,0 +1,86 @@
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+
+CACHE_SIZE = 4096   # rows remembered (LRU)
+KEY_HEIGHT = 12     # rows are normalized to this height before hashing
+MAX_KEY_WIDTH = 320
+
+
+def line_key(mask, top, bottom):
+    """Hash of a text row's normalized ink, or None for an empty row.
+
+    The row is cropped to its ink bounding box (so scrolling and small
+    horizontal shifts don't matter), box-sampled to KEY_HEIGHT rows with
+    the aspect ratio kept, and thresholded to bits before hashing.
+    """
+    line = mask[top:bottom]
+    cols = np.flatnonzero(line.any(axis=0))
+    rows = np.flatnonzero(line.any(axis=1))
+    if cols.size == 0:
+        return None
+    g = line[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+    h, w = g.shape
+    kw = max(1, min(MAX_KEY_WIDTH, int(round(w * KEY_HEIGHT / h))))
+    ri = ((np.arange(KEY_HEIGHT * 2) + 0.5) * h / (KEY_HEIGHT * 2)).astype(int)
+    ci = ((np.arange(kw * 2) + 0.5) * w / (kw * 2)).astype(int)
+    cells = g[np.ix_(ri, ci)].reshape(KEY_HEIGHT, 2, kw, 2).mean(axis=(1, 3))
+    bits = np.packbits(cells >= 0.5)
+    return hashlib.blake2b(kw.to_bytes(2, "little") + bits.tobytes(), digest_size=16).digest()
+
+
+class LineCache:
+    """LRU map from row-image hash to the words OCR read in that row.
+
+    Words are stored relative to the row's ink box, so a hit can be placed
+    wherever the row has scrolled to.
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            words = self.entries.get(key)
+            if words is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return words
+
+    def put(self, key, words):
+        with self.lock:
+            self.entries[key] = words
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    @staticmethod
+    def origin(mask, top, bottom):
+        """(x, y) of the row's ink box, the reference point for stored words."""
+        line = mask[top:bottom]
+        cols = np.flatnonzero(line.any(axis=0))
+        rows = np.flatnonzero(line.any(axis=1))
+        return int(cols[0]), top + int(rows[0])
+
+    def store(self, key, words, origin):
+        ox, oy = origin
+        self.put(key, [dict(w, x=w["x"] - ox, y=w["y"] - oy) for w in words])
+
+    def place(self, words, origin):
+        ox, oy = origin
+        return [dict(w, x=w["x"] + ox, y=w["y"] + oy) for w in words]
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return f"{self.hits} hits, {self.misses} misses ({self.hit_rate * 100:.0f}% hit rate), {len(self.entries)} rows cached"
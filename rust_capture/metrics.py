@@ -0,0 +1,190 @@
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+ENABLED = os.environ.get("RUST_METRICS", "0") != "0"
+SUMMARY_INTERVAL = float(os.environ.get("RUST_METRICS_INTERVAL", 30))  # s between printed summaries, 0 = never
+DUMP_FILE = os.environ.get("RUST_METRICS_FILE")  # JSON written at exit (and by dump())
+SUB_BITS = 4  # 16 sub-buckets per power of two: values are kept to within ~6%
+
+
+class Histogram:
+    """HDR-style histogram of durations, in integer microseconds.
+
+    Values below 2**SUB_BITS are exact; above that each power of two is
+    split into 2**SUB_BITS buckets, so memory grows with the log of the
+    range and percentiles are accurate to about 6%.
+    """
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @staticmethod
+    def _bucket(us):
+        shift = us.bit_length() - SUB_BITS - 1
+        if shift <= 0:
+            return us
+        return (shift << SUB_BITS) + (us >> shift)
+
+    @staticmethod
+    def _value(bucket):
+        """Midpoint of a bucket, in microseconds."""
+        shift = (bucket >> SUB_BITS) - 1
+        if shift <= 0:
+            return bucket
+        mantissa = bucket - ((shift + 1) << SUB_BITS) + (1 << SUB_BITS)
+        return (mantissa << shift) + (1 << (shift - 1))
+
+    def record(self, us):
+        b = self._bucket(us)
+        self.counts[b] = self.counts.get(b, 0) + 1
+        self.count += 1
+        self.total += us
+        if us > self.max:
+            self.max = us
+
+    def percentile(self, p):
+        if not self.count:
+            return 0
+        rank = p / 100 * self.count
+        seen = 0
+        for b in sorted(self.counts):
+            seen += self.counts[b]
+            if seen >= rank:
+                return min(self._value(b), self.max)
+        return self.max
+
+    def summary(self):
+        """count, mean/p50/p95/p99/max in ms."""
+        ms = 1000.0
+        return {
+            "count": self.count,
+            "mean": self.total / self.count / ms if self.count else 0.0,
+            "p50": self.percentile(50) / ms,
+            "p95": self.percentile(95) / ms,
+            "p99": self.percentile(99) / ms,
+            "max": self.max / ms,
+        }
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    """Named stage timers and counters.
+
+    timer(name) is a context manager recording the block's wall time;
+    record() and count() add values directly. With enabled=False every
+    call returns at once without touching any state.
+    """
+
+    def __init__(self, enabled=ENABLED, summary_interval=SUMMARY_INTERVAL, dump_file=DUMP_FILE):
+        self.enabled = enabled
+        self.summary_interval = summary_interval
+        self.dump_file = dump_file
+        self.histograms = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self._reporter = None
+
+    def timer(self, name):
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._timer(name)
+
+    @contextmanager
+    def _timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds):
+        if not self.enabled:
+            return
+        us = int(seconds * 1e6)
+        with self.lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = Histogram()
+                self._start_reporter()
+            hist.record(us)
+
+    def count(self, name, n=1):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "time": time.time(),
+                "uptime": time.time() - self.started,
+                "stages": {name: h.summary() for name, h in sorted(self.histograms.items())},
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def format(self, snap=None):
+        snap = snap or self.snapshot()
+        lines = [f"{'stage':<24}{'n':>7}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}  ms"]
+        for name, s in snap["stages"].items():
+            lines.append(f"{name:<24}{s['count']:>7}{s['p50']:>8.1f}{s['p95']:>8.1f}{s['p99']:>8.1f}{s['max']:>8.1f}")
+        for name, n in snap["counters"].items():
+            lines.append(f"{name:<24}{n:>7}")
+        return "\n".join(lines)
+
+    def dump(self, path=None):
+        """Write a snapshot as JSON (for offline comparison); returns the path."""
+        path = path or self.dump_file
+        if not path or not self.enabled:
+            return None
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp, path)
+        return path
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.started = time.time()
+
+    def _start_reporter(self):
+        if self._reporter is not None or self.summary_interval <= 0:
+            return
+        self._reporter = threading.Thread(target=self._report, daemon=True, name="metrics-report")
+        self._reporter.start()
+
+    def _report(self):
+        while True:
+            time.sleep(self.summary_interval)
+            print("[METRICS]\n" + self.format())
+
+
+metrics = Metrics()
+timer = metrics.timer
+record = metrics.record
+count = metrics.count
+
+if ENABLED and DUMP_FILE:
+    atexit.register(metrics.dump)
@@ -0,0 +1,180 @@
+import io
+import os
+import shutil
+import subprocess
+import threading
+import time
+
+TESSERACT_CMD = (
+    os.environ.get("TESSERACT_CMD")
+    or shutil.which("tesseract")
+    or r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+)
+TESSDATA_PATH = os.environ.get("TESSDATA_PREFIX")
+OCR_BACKEND = os.environ.get("RUST_OCR_BACKEND", "auto")  # auto | tesserocr | subprocess
+OCR_LANG = "eng"
+
+_child_cpu = 0.0  # CPU seconds of every tesseract subprocess run by this process
+_child_lock = threading.Lock()
+
+
+def child_cpu():
+    """CPU seconds spent so far in tesseract subprocesses started by this
+    process. The callers' own CPU clocks don't see it; they add the
+    difference over a frame to their scheduler with add_work()."""
+    with _child_lock:
+        return _child_cpu
+
+
+def _reap(proc, start):
+    """Wait for proc and add its CPU time to child_cpu(). os.wait4 gives
+    that child's own usage; where it's missing (Windows) the call's wall
+    time stands in as an estimate."""
+    global _child_cpu
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)  # reaped: Popen mustn't wait again
+        cpu = usage.ru_utime + usage.ru_stime
+    else:
+        proc.wait()
+        cpu = time.perf_counter() - start
+    with _child_lock:
+        _child_cpu += cpu
+    return proc.returncode
+
+
+def parse_tsv(text):
+    """Tesseract TSV output → list of word dicts (header line optional)."""
+    words = []
+    for line in text.splitlines():
+        parts = line.rstrip("\r\n").split("\t")
+        if len(parts) < 12 or parts[0] == "level" or not parts[11].strip():
+            continue
+        try:
+            conf = float(parts[10])
+        except ValueError:
+            conf = -1.0
+        words.append({
+            "text": parts[11].strip(),
+            "x": int(parts[6]),
+            "y": int(parts[7]),
+            "w": int(parts[8]),
+            "h": int(parts[9]),
+            "conf": conf,
+        })
+    return words
+
+
+def to_pil(img):
+    """Backends take PIL images or NumPy arrays."""
+    if hasattr(img, "__array_interface__") and not hasattr(img, "save"):
+        from PIL import Image
+        return Image.fromarray(img)
+    return img
+
+
+class OCRBackend:
+    name = "base"
+
+    def image_to_words(self, img, psm=3):
+        raise NotImplementedError
+
+
+class SubprocessTesseract(OCRBackend):
+    """Spawns tesseract.exe per call. Always available, slowest.
+
+    The image is piped through stdin and the TSV read from stdout, so there
+    are no temp files, but model loading still happens on every call.
+    """
+
+    name = "subprocess"
+
+    def __init__(self, cmd=TESSERACT_CMD):
+        self.cmd = cmd
+
+    def image_to_words(self, img, psm=3):
+        buf = io.BytesIO()
+        to_pil(img).save(buf, format="PNG", compress_level=1)
+        start = time.perf_counter()
+        try:
+            proc = subprocess.Popen(
+                [self.cmd, "stdin", "stdout", "--oem", "1", "--psm", str(psm), "tsv"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError:
+            return []
+        # Not run()/communicate(): those reap the child themselves and its
+        # CPU time is lost. Tesseract reads the whole image before writing.
+        try:
+            with proc.stdin:
+                proc.stdin.write(buf.getvalue())
+            out = proc.stdout.read()
+        except OSError:
+            out = b""
+        proc.stdout.close()
+        if _reap(proc, start) != 0:
+            return []
+        return parse_tsv(out.decode("utf-8", errors="ignore"))
+
+
+class TesserocrBackend(OCRBackend):
+    """In-process Tesseract via tesserocr; the model stays loaded.
+
+    TessBaseAPI is not thread-safe, so each thread gets its own API object
+    per page-segmentation mode.
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, lang=OCR_LANG, path=TESSDATA_PATH):
+        import tesserocr  # optional dependency
+        self.tesserocr = tesserocr
+        self.lang = lang
+        self.path = path
+        self._local = threading.local()
+        self._api(3)  # load the model now so a missing install fails here
+
+    def _api(self, psm):
+        apis = getattr(self._local, "apis", None)
+        if apis is None:
+            apis = self._local.apis = {}
+        api = apis.get(psm)
+        if api is None:
+            kwargs = {"lang": self.lang, "psm": psm, "oem": self.tesserocr.OEM.LSTM_ONLY}
+            if self.path:
+                kwargs["path"] = self.path
+            api = apis[psm] = self.tesserocr.PyTessBaseAPI(**kwargs)
+        return api
+
+    def image_to_words(self, img, psm=3):
+        api = self._api(psm)
+        api.SetImage(to_pil(img))
+        return parse_tsv(api.GetTSVText(0) or "")
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend(name=None):
+    """Shared backend instance; 'auto' prefers tesserocr and falls back."""
+    global _backend
+    name = name or OCR_BACKEND
+    with _backend_lock:
+        if _backend is not None and name in ("auto", _backend.name):
+            return _backend
+        backend = None
+        if name in ("auto", "tesserocr"):
+            try:
+                backend = TesserocrBackend()
+            except Exception as e:
+                if name == "tesserocr":
+                    raise
+                print(f"[OCR] tesserocr unavailable ({e}), using tesseract subprocess")
+        if backend is None:
+            backend = SubprocessTesseract()
+        print(f"[OCR] Using {backend.name} backend")
+        _backend = backend
+        return backend
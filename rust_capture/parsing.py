@@ -0,0 +1,33 @@
+import re
+
+steamid_re = re.compile(r"7656119\d{10}")
+
+
+def clean_name(name_raw):
+    return re.sub(r"[^A-Za-z0-9_\- ]", " ", name_raw).strip()
+
+
+def parse_words(words, include_names=False):
+    """Pick SteamIDs (and the name line above each) out of OCR words.
+
+    Returns [(sid, name, word)], where name is the SteamID itself unless
+    include_names is set and a name was found.
+    """
+    entries = []
+    for steam in words:
+        if not steamid_re.fullmatch(steam["text"]):
+            continue
+        sid = steam["text"]
+        sx, sy, sw = steam["x"], steam["y"], steam["w"]
+
+        name = sid
+        if include_names:
+            candidates = [
+                w for w in words
+                if w["y"] < sy and sy - w["y"] < 90
+                and abs((w["x"] + w["w"]//2) - (sx + sw//2)) < 300
+            ]
+            if candidates:
+                name = clean_name(sorted(candidates, key=lambda w: sy - w["y"])[0]["text"])
+        entries.append((sid, name, steam))
+    return entries
@@ -0,0 +1,11 @@
+import os
+from pathlib import Path
+
+# Data files live next to the scripts unless overridden (e.g. for batch runs)
+ROOT = Path(__file__).parent.parent
+MUTE_CSV = Path(os.environ.get("RUST_MUTE_CSV", ROOT / "mute_list.csv"))
+PLAYER_JSON = Path(os.environ.get("RUST_PLAYER_JSON", ROOT / "player_data.json"))
+# Held (rust_capture.file_lock) by every read-modify-write of PLAYER_JSON
+PLAYER_JSON_LOCK = PLAYER_JSON.with_name(PLAYER_JSON.name + ".write.lock")
+# Flagged players' presence log, kept with the player data by default
+PRESENCE_HISTORY = Path(os.environ.get("RUST_PRESENCE_HISTORY", PLAYER_JSON.parent / "presence_history.jsonl"))
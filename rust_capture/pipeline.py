@@ -0,0 +1,291 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from rust_capture.preprocess import preprocess, UPSCALE_FACTOR
+from rust_capture.ocr_backends import get_backend, child_cpu
+from rust_capture.parsing import parse_words
+from rust_capture.change_detect import FrameChangeDetector
+from rust_capture.scroll import ScrollTracker
+from rust_capture.digits import read_words
+from rust_capture.regions import RegionOCR
+from rust_capture.consensus import IDConsensus
+from rust_capture.scheduler import CaptureScheduler
+from rust_capture.metrics import timer, record, count
+from rust_capture.profiling import section
+from rust_capture.engine import CaptureResults
+from rust_capture.sources import frame_size, crop_rows, from_bytes
+
+# 0 = run the serial capture loop instead of the pipeline
+OCR_WORKERS = int(os.environ.get("RUST_OCR_WORKERS", max(1, min(4, (os.cpu_count() or 2) // 2))))
+FRAME_QUEUE_SIZE = 2     # frames waiting for a worker; older ones are merged into newer ones
+
+
+# --- Worker process side ---
+# Under spawn (Windows) a worker also re-imports the main module; main.py and
+# rust_ocr.py keep Qt, keyboard and the dashboard out of their import path.
+def _init_worker():
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")  # one Tesseract thread per process
+    get_backend()  # load the model once per process
+
+
+_region_ocr = None
+
+
+def _worker_cpu():
+    """This worker's CPU (all its threads) plus its tesseract subprocesses'."""
+    return time.process_time() + child_cpu()
+
+
+def ocr_frame(mode, size, data, top, include_names, regions=None):
+    """OCR one (band of a) frame. Runs in a worker process; args are picklable.
+
+    Returns ([(sid, name, box, conf)], region_timings, cpu_seconds); with
+    regions, each is OCR'd concurrently and timings maps region name to ms.
+    """
+    global _region_ocr
+    start = _worker_cpu()
+    raw = from_bytes(mode, size, data)  # a view of the pickled bytes, not another copy
+    if regions:
+        if _region_ocr is None or _region_ocr.regions != list(regions):
+            _region_ocr = RegionOCR(regions, include_names)
+        return _region_ocr.read(raw, top), _region_ocr.timings, _worker_cpu() - start
+    img = preprocess(raw)
+    words = read_words(img, get_backend(), include_names)
+    entries = []
+    for sid, name, w in parse_words(words, include_names):
+        box = (
+            w["x"] // UPSCALE_FACTOR,
+            top + w["y"] // UPSCALE_FACTOR,
+            (w["x"] + w["w"]) // UPSCALE_FACTOR,
+            top + (w["y"] + w["h"]) // UPSCALE_FACTOR,
+        )
+        entries.append((sid, name, box, w.get("conf", 0)))
+    return entries, {}, _worker_cpu() - start
+
+
+# --- Parent process side ---
+def merge_band(band, stale, scroll_pos, height):
+    """band widened to cover the rows of a queued frame that is dropped unread,
+    where they are now (frame row + scroll_pos = list row)."""
+    _, size, _, top, stale_pos, _ = stale
+    shift = stale_pos - scroll_pos
+    stale_top, stale_bottom = max(0, top + shift), min(height, top + size[1] + shift)
+    if stale_top >= stale_bottom:
+        count("rows.lost")  # scrolled out of view before OCR got to them
+        return band
+    return min(band[0], stale_top), max(band[1], stale_bottom)
+
+
+class FrameQueue:
+    """Bounded queue that drops the oldest frame instead of blocking the producer."""
+
+    def __init__(self, maxsize=FRAME_QUEUE_SIZE):
+        self.maxsize = maxsize
+        self.frames = []
+        self.dropped = 0
+        self.cond = threading.Condition()
+
+    def take_stale(self):
+        """Remove and return the oldest frame if the queue is full, else None."""
+        with self.cond:
+            if len(self.frames) < self.maxsize:
+                return None
+            self.dropped += 1
+            return self.frames.pop(0)
+
+    def put(self, frame):
+        with self.cond:
+            if len(self.frames) >= self.maxsize:
+                self.frames.pop(0)
+                self.dropped += 1
+            self.frames.append(frame)
+            self.cond.notify()
+
+    def get(self, timeout=None):
+        with self.cond:
+            if not self.frames:
+                self.cond.wait(timeout)
+            return self.frames.pop(0) if self.frames else None
+
+
+class OCRPipeline:
+    """Capture producer → frame queue → OCR process pool → single aggregator.
+
+    capture() returns a frame of the capture region (see rust_capture.sources).
+    The producer skips unchanged frames and crops to the band a scroll
+    revealed before queueing, aligned to whole list rows given row_pitch;
+    CaptureScheduler paces it from change activity, OCR latency and CPU use.
+    IDs reach `results` only once IDConsensus has confirmed them.
+    At most `workers` frames are in flight; newer frames replace queued
+    ones, so memory stays bounded however slow OCR is; the band of a
+    replaced frame is merged into its successor's (shifted by the scroll
+    in between), so its rows still on screen are read rather than lost.
+    The aggregator thread adds to `results` (a CaptureResults) and calls
+    on_new([(sid, name)]), on_boxes(frame_top, boxes) with every box in
+    view (frame coordinates) and on_timings({region: ms}) after each
+    frame. With `regions` (see rust_capture.regions) each frame's
+    columns are OCR'd concurrently.
+    """
+
+    def __init__(self, capture, results=None, on_new=None, on_boxes=None,
+                 workers=OCR_WORKERS, queue_size=FRAME_QUEUE_SIZE,
+                 include_names=False, scheduler=None,
+                 regions=None, on_timings=None, row_pitch=0):
+        self.capture = capture
+        self.results = results if results is not None else CaptureResults()
+        self.on_new = on_new
+        self.on_boxes = on_boxes
+        self.on_timings = on_timings
+        self.regions = regions
+        self.workers = max(1, workers)
+        self.include_names = include_names
+        # the producer thread's own CPU; the workers' comes back through add_work()
+        self.scheduler = scheduler or CaptureScheduler(workers=self.workers, cpu_clock=time.thread_time)
+
+        self.frames = FrameQueue(queue_size)
+        self.done = queue.Queue()
+        self.in_flight = threading.BoundedSemaphore(self.workers)
+        self.detector = FrameChangeDetector()
+        self.scroll = ScrollTracker(row_pitch=row_pitch)
+        self.scroll_pos = 0
+        self.height = 0
+        self.boxes = []  # overlay boxes in list coordinates (frame y + scroll_pos)
+        self.consensus = IDConsensus()
+        self.running = False
+        self._closed = False
+        self.captured = 0
+        self.processed = 0
+        self._threads = []
+        self._executor = None
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self._closed = False
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        self._threads = [
+            threading.Thread(target=target, daemon=True, name=f"ocr-{target.__name__.strip('_')}")
+            for target in (self._produce, self._dispatch, self._aggregate)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def stop(self, timeout=5):
+        """Stop capturing, let in-flight frames finish, then stop the aggregator."""
+        if not self._threads:
+            return  # never started
+        self.running = False
+        with self.frames.cond:
+            self.frames.cond.notify_all()
+        producer, dispatcher, aggregator = self._threads
+        producer.join(timeout)
+        dispatcher.join(timeout)
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._closed = True
+        aggregator.join(timeout)
+        self._threads = []
+
+    def _produce(self):
+        while self.running:
+            start, cpu_start = time.perf_counter(), self.scheduler.cpu_clock()
+            with section("capture_loop.produce"):
+                with timer("capture"):
+                    raw = self.capture()
+                self.captured += 1
+                height = self.height = frame_size(raw)[1]
+                band = None
+                with timer("detect"):
+                    changed = self.detector.changed(raw)
+                if changed:
+                    with timer("scroll"):
+                        band = self.scroll.plan(raw)
+                    self.scroll_pos += self.scroll.last_offset or 0
+                    band = self.consensus.plan_band(band, self.scroll_pos, height)
+                if band is not None:
+                    stale = self.frames.take_stale()
+                    if stale is not None:
+                        band = merge_band(band, stale, self.scroll_pos, height)
+                    top, bottom = band
+                    if (top, bottom) != (0, height):
+                        raw = crop_rows(raw, top, bottom)
+                    # the queued frame outlives the capture buffer: tobytes() is its one copy
+                    mode = raw.mode if hasattr(raw, "mode") else "RGB"
+                    self.frames.put((mode, frame_size(raw), raw.tobytes(), top, self.scroll_pos, time.perf_counter()))
+            self.scheduler.wait(changed, start, cpu_start)  # outside the section: sleeping isn't capture work
+
+    def _dispatch(self):
+        while self.running:
+            frame = self.frames.get(timeout=0.2)
+            if frame is None:
+                continue
+            self.in_flight.acquire()  # backpressure: at most `workers` frames in flight
+            if not self.running:
+                self.in_flight.release()
+                break
+            mode, size, data, top, scroll_pos, queued = frame
+            try:
+                future = self._executor.submit(ocr_frame, mode, size, data, top, self.include_names, self.regions)
+            except RuntimeError:  # pool shut down
+                self.in_flight.release()
+                break
+            band = (top, top + size[1])
+            future.add_done_callback(lambda f, band=band, pos=scroll_pos, queued=queued: self._finished(f, band, pos, queued))
+
+    def _finished(self, future, band, scroll_pos, queued):
+        self.in_flight.release()
+        try:
+            entries, timings, cpu = future.result()
+            latency = time.perf_counter() - queued
+            self.scheduler.add_work(cpu, latency=latency)
+            record("ocr.latency", latency)  # queue wait + worker OCR
+            record("ocr.cpu", cpu)
+            self.done.put((band, scroll_pos, (entries, timings)))
+        except Exception as e:
+            print(f"[OCR] Worker failed: {e}")
+
+    def _aggregate(self):
+        while not (self._closed and self.done.empty()):
+            try:
+                (top, bottom), scroll_pos, (entries, timings) = self.done.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            with section("capture_loop.aggregate"):
+                self.processed += 1
+                new = []
+                with timer("consensus"):
+                    committed = self.consensus.observe(entries, scroll_pos)
+                for sid, name in committed:
+                    if self.results.add(sid, name):
+                        new.append((sid, name))
+                if new and self.on_new:
+                    count("ids.committed", len(new))
+                    with timer("on_new"):  # save_csv + fetch spawn
+                        self.on_new(new)
+                if self.on_boxes:
+                    self.on_boxes(top, self._overlay_boxes(top, bottom, scroll_pos, entries))
+                if timings and self.on_timings:
+                    self.on_timings(timings)
+
+    def _overlay_boxes(self, top, bottom, scroll_pos, entries):
+        """Boxes in view after a frame, in its coordinates: earlier ones that
+        only scrolled, with those in the frame's band replaced by its reads."""
+        kept = [
+            (l, t, r, b) for l, t, r, b in self.boxes
+            if t - scroll_pos >= 0 and b - scroll_pos <= self.height
+            and (b - scroll_pos <= top or t - scroll_pos >= bottom)
+        ]
+        kept += [(l, t + scroll_pos, r, b + scroll_pos) for _, _, (l, t, r, b), _ in entries]
+        self.boxes = kept
+        return [(l, t - scroll_pos, r, b - scroll_pos) for l, t, r, b in kept]
+
+    def stats(self):
+        return (
+            f"{self.captured} captured, {self.detector.skipped} unchanged, "
+            f"{self.frames.dropped} dropped as stale, {self.processed} OCR'd by {self.workers} workers"
+        )
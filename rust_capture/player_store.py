@@ -0,0 +1,36 @@
+import json
+import os
+
+from rust_capture.paths import PLAYER_JSON
+
+KEPT_FLAGS = ("flagged", "flagged_at")  # set in the dashboard; a fetch never overrides them
+
+
+def read_players(path=PLAYER_JSON):
+    """player_data.json entries; [] if the file does not exist yet."""
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_players(players, path=PLAYER_JSON):
+    """Replace the file whole, so readers never see half of it. Callers that
+    read, change and write it back hold PLAYER_JSON_LOCK (file_lock)."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(players, f, indent=4)
+    os.replace(tmp, path)
+
+
+def merge_players(current, fetched):
+    """current (the file as it is now) with fetched entries added. An ID
+    already in current takes the fetched data but keeps its dashboard flags."""
+    merged = {p["steam_id"]: p for p in current}
+    for player in fetched:
+        old = merged.get(player["steam_id"])
+        if old is not None:
+            kept = {k: v for k, v in old.get("flags", {}).items() if k in KEPT_FLAGS}
+            player = dict(player, flags={**player.get("flags", {}), **kept})
+        merged[player["steam_id"]] = player
+    return list(merged.values())
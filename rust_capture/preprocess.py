@@ -0,0 +1,173 @@
+import os
+import threading
+import numpy as np
+from PIL import Image, ImageOps, ImageFilter
+
+from rust_capture.sources import to_image
+
+try:
+    import cv2  # optional, faster blur/resize
+except ImportError:
+    cv2 = None
+
+UPSCALE_FACTOR = 2
+PREPROCESS_ENGINE = os.environ.get("RUST_PREPROCESS", "pil")  # pil | numpy
+AUTOCONTRAST_CUTOFF = 2   # percent clipped from each end of the histogram
+SHARPEN_AMOUNT = 1.5      # UnsharpMask percent=150
+SHARPEN_THRESHOLD = 3
+
+
+def preprocess(img):
+    """Grey, sharpened, upscaled capture (PIL image or RGB array).
+
+    The NumPy engine works in this thread's buffers and returns its output
+    array, which the thread's next call overwrites: OCR it before then (the
+    backends take arrays and make a PIL image only if they need one), or
+    copy it. The PIL engine returns a new image.
+    """
+    if PREPROCESS_ENGINE == "numpy":
+        return numpy_preprocessor()(img)
+    return preprocess_pil(to_image(img))
+
+
+def preprocess_pil(img):
+    gray = ImageOps.grayscale(img)
+    gray = ImageOps.autocontrast(gray, cutoff=AUTOCONTRAST_CUTOFF)
+    gray = gray.filter(ImageFilter.UnsharpMask(radius=1, percent=int(SHARPEN_AMOUNT * 100), threshold=SHARPEN_THRESHOLD))
+    if UPSCALE_FACTOR > 1:
+        w, h = gray.size
+        gray = gray.resize((w * UPSCALE_FACTOR, h * UPSCALE_FACTOR), Image.LANCZOS)
+    return gray
+
+
+class NumpyPreprocessor:
+    """The PIL chain on reused NumPy buffers.
+
+    Buffers are allocated once per frame size, so steady-state capture does
+    no full-frame allocations. The returned array is one of those buffers:
+    it is overwritten by the next call. Upscaling is nearest-neighbour (or
+    linear with OpenCV) instead of LANCZOS, and threshold=True binarizes
+    with Otsu, which is all digit OCR needs.
+    """
+
+    def __init__(self, upscale=UPSCALE_FACTOR, threshold=False, interpolation="nearest"):
+        self.upscale = upscale
+        self.threshold = threshold
+        self.interpolation = interpolation
+        self.shape = None
+
+    def _allocate(self, h, w):
+        self.shape = (h, w)
+        self.acc = np.empty((h, w), np.uint16)
+        self.tmp = np.empty((h, w), np.uint16)
+        self.gray = np.empty((h, w), np.uint8)
+        self.blur = np.empty((h, w), np.int16)
+        self.diff = np.empty((h, w), np.int16)
+        self.out = np.empty((h * self.upscale, w * self.upscale), np.uint8)
+
+    # --- stages ---
+    def to_gray(self, img):
+        if hasattr(img, "convert"):
+            img = img.convert("L")  # PIL's C converter beats any NumPy formulation
+        rgb = np.asarray(img)
+        if rgb.ndim == 2:
+            if rgb.shape != self.shape:
+                self._allocate(*rgb.shape)
+            np.copyto(self.gray, rgb)
+            return self.gray
+        if rgb.shape[:2] != self.shape:
+            self._allocate(*rgb.shape[:2])
+        # ITU-R 601 luma in 8-bit fixed point, like PIL's convert("L")
+        np.multiply(rgb[..., 0], 77, out=self.acc, dtype=np.uint16)
+        np.multiply(rgb[..., 1], 150, out=self.tmp, dtype=np.uint16)
+        self.acc += self.tmp
+        np.multiply(rgb[..., 2], 29, out=self.tmp, dtype=np.uint16)
+        self.acc += self.tmp
+        np.right_shift(self.acc, 8, out=self.acc)
+        np.copyto(self.gray, self.acc, casting="unsafe")
+        return self.gray
+
+    def autocontrast(self, gray):
+        hist = np.bincount(gray[::2, ::2].ravel(), minlength=256)  # every 4th pixel is plenty
+        cdf = np.cumsum(hist)
+        cut = cdf[-1] * AUTOCONTRAST_CUTOFF / 100
+        lo = int(np.searchsorted(cdf, cut, side="right"))
+        hi = int(np.searchsorted(cdf, cdf[-1] - cut, side="left"))
+        if hi <= lo:
+            return gray
+        lut = np.clip((np.arange(256) - lo) * 255.0 / (hi - lo), 0, 255).astype(np.uint8)
+        np.take(lut, gray, out=gray)
+        return gray
+
+    def sharpen(self, gray):
+        """Unsharp mask with a 3x3 blur (radius 1)."""
+        if cv2 is not None:
+            self.blur[:] = cv2.blur(gray, (3, 3))
+        else:
+            b = self.blur
+            b[:] = gray
+            b[1:-1] += gray[:-2]
+            b[1:-1] += gray[2:]
+            b[1:-1] //= 3
+            self.diff[:] = b
+            b[:, 1:-1] += self.diff[:, :-2]
+            b[:, 1:-1] += self.diff[:, 2:]
+            b[:, 1:-1] //= 3
+        d = self.diff
+        np.subtract(gray, self.blur, out=d, dtype=np.int16)
+        d[np.abs(d) < SHARPEN_THRESHOLD] = 0
+        d *= int(SHARPEN_AMOUNT * 2)
+        d //= 2
+        d += gray
+        np.clip(d, 0, 255, out=d)
+        np.copyto(gray, d, casting="unsafe")
+        return gray
+
+    def upscale_to_out(self, gray):
+        f = self.upscale
+        if f == 1:
+            np.copyto(self.out, gray)
+        elif cv2 is not None and self.interpolation == "linear":
+            cv2.resize(gray, (self.out.shape[1], self.out.shape[0]), dst=self.out, interpolation=cv2.INTER_LINEAR)
+        else:
+            for dx in range(f):
+                self.out[::f, dx::f] = gray
+            for dy in range(1, f):
+                self.out[dy::f] = self.out[::f]
+        return self.out
+
+    def binarize(self, gray):
+        """Otsu threshold in place."""
+        hist = np.bincount(gray[::2, ::2].ravel(), minlength=256).astype(np.float64)
+        total = hist.sum()
+        levels = np.arange(256)
+        w0 = np.cumsum(hist)
+        m0 = np.cumsum(hist * levels)
+        w1 = total - w0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            between = (m0[-1] * w0 / total - m0) ** 2 / (w0 * w1)
+        if np.isnan(between).all():
+            return gray  # a single grey level, nothing to split
+        t = int(np.nanargmax(between))
+        lut = np.where(levels > t, 255, 0).astype(np.uint8)
+        np.take(lut, gray, out=gray)
+        return gray
+
+    def __call__(self, img):
+        gray = self.to_gray(img)
+        self.autocontrast(gray)
+        self.sharpen(gray)
+        if self.threshold:
+            self.binarize(gray)  # before upscaling: a quarter of the pixels
+        return self.upscale_to_out(gray)
+
+
+_local = threading.local()
+
+
+def numpy_preprocessor():
+    """Per-thread NumpyPreprocessor (its buffers are not shareable)."""
+    pre = getattr(_local, "pre", None)
+    if pre is None:
+        pre = _local.pre = NumpyPreprocessor()
+    return pre
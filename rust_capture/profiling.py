@@ -0,0 +1,144 @@
+import atexit
+import cProfile
+import functools
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+PROFILE_ENV = "RUST_PROFILE"
+PROFILE_DIR = Path(os.environ.get("RUST_PROFILE_DIR", Path(__file__).parent.parent / "profiles"))
+PROFILE_HOTKEY = "F7"
+TOP_FUNCTIONS = 15  # printed per section when a run is written
+
+_NOT_PROFILING = nullcontext()
+
+
+class Profiler:
+    """Opt-in cProfile hooks around named hot paths.
+
+    section(name) / @profiled(name) profile the wrapped call while enabled;
+    calls nested in an already profiled section on the same thread are
+    part of the outer profile. Each thread gets its own cProfile.Profile
+    per section (a Profile must not run on two threads at once), and
+    write() merges them into one pstats file per section under
+    PROFILE_DIR/<run>/. Open them with pstats, snakeviz, or convert for
+    speedscope.
+
+    Turning profiling on also sets RUST_PROFILE in the environment, so
+    scripts launched afterwards (getPlayerData.py) profile themselves.
+    """
+
+    def __init__(self, enabled=None, directory=PROFILE_DIR):
+        if enabled is None:
+            enabled = os.environ.get(PROFILE_ENV, "0") != "0"
+        self.enabled = enabled
+        self.directory = Path(directory)
+        self.lock = threading.Lock()
+        self.profiles = []  # (section, Profile) across all threads
+        self.local = threading.local()
+        self.started = time.strftime("%Y%m%d-%H%M%S")
+
+    def _profile(self, name):
+        profiles = getattr(self.local, "profiles", None)
+        if profiles is None:
+            profiles = self.local.profiles = {}
+        prof = profiles.get(name)
+        if prof is None:
+            prof = profiles[name] = cProfile.Profile()
+            with self.lock:
+                self.profiles.append((name, prof))
+        return prof
+
+    def section(self, name):
+        if not self.enabled:
+            return _NOT_PROFILING
+        return self._section(name)
+
+    @contextmanager
+    def _section(self, name):
+        if getattr(self.local, "active", False):
+            yield
+            return
+        prof = self._profile(name)
+        try:
+            prof.enable()
+        except ValueError:  # another profiler owns this interpreter (Python 3.12+)
+            yield
+            return
+        self.local.active = True
+        try:
+            yield
+        finally:
+            prof.disable()
+            self.local.active = False
+
+    def profiled(self, name):
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with self._section(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def start(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self.started = time.strftime("%Y%m%d-%H%M%S")
+        os.environ[PROFILE_ENV] = "1"
+        print(f"[PROFILE] Profiling on ({PROFILE_HOTKEY} to stop and write)")
+
+    def stop(self):
+        if not self.enabled:
+            return None
+        self.enabled = False
+        os.environ[PROFILE_ENV] = "0"
+        return self.write()
+
+    def toggle(self):
+        return self.stop() if self.enabled else self.start()
+
+    def write(self, label=None):
+        """Write one .prof file per section and clear the profiles; returns the run directory."""
+        with self.lock:
+            profiles, self.profiles = self.profiles, []
+        self.local = threading.local()  # threads start fresh Profiles for the next run
+        if not profiles:
+            return None
+        run_dir = self.directory / f"{self.started}-{label or os.getpid()}"
+        run_dir.mkdir(parents=True, exist_ok=True)
+        merged = {}
+        for name, prof in profiles:
+            try:
+                stats = pstats.Stats(prof)
+            except TypeError:  # profile never recorded anything
+                continue
+            if name in merged:
+                merged[name].add(stats)
+            else:
+                merged[name] = stats
+        for name, stats in merged.items():
+            path = run_dir / f"{name}.prof"
+            stats.dump_stats(str(path))
+            print(f"[PROFILE] {name}: {path}")
+            stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        return run_dir
+
+
+profiler = Profiler()
+section = profiler.section
+profiled = profiler.profiled
+
+
+def _write_at_exit():
+    if profiler.enabled:
+        profiler.write()
+
+
+atexit.register(_write_at_exit)
@@ -0,0 +1,126 @@
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from rust_capture.preprocess import preprocess, UPSCALE_FACTOR
+from rust_capture.ocr_backends import get_backend
+from rust_capture.parsing import parse_words
+from rust_capture.digits import read_words
+from rust_capture.sources import frame_size, crop
+
+# The mute list is two columns: a narrow one on the left (first third of the
+# panel) and a wide one on the right. They overlap by a few pixels so a row
+# cut at the boundary is whole in at least one of them.
+COLUMN_SPLIT = 1 / 3
+OVERLAP_PIXELS = 4
+COLUMN_PSMS = (6, 4)   # uniform block of text | single column of varying sizes
+MULTI_REGION = os.environ.get("RUST_OCR_REGIONS", "1") != "0"
+
+# box is (left, top, right, bottom) relative to the captured frame
+Region = namedtuple("Region", "name box psm")
+
+
+def column_boxes(left, top, right, bottom, split=COLUMN_SPLIT, overlap=OVERLAP_PIXELS):
+    """The two-column layout of a (left, top, right, bottom) box."""
+    mid = left + int((right - left) * split)
+    return [
+        (left, top, mid + overlap, bottom),
+        (mid - overlap, top, right, bottom),
+    ]
+
+
+def column_regions(width, height, psms=COLUMN_PSMS):
+    """Regions for a width x height frame of the mute list panel."""
+    return [Region(f"col{i + 1}", box, psm) for i, (box, psm) in enumerate(zip(column_boxes(0, 0, width, height), psms))]
+
+
+def regions_from_boxes(boxes, origin, psms=COLUMN_PSMS):
+    """Regions from absolute screen boxes, relative to a frame captured at origin (x, y)."""
+    ox, oy = origin
+    return [
+        Region(f"col{i + 1}", (l - ox, t - oy, r - ox, b - oy), psms[min(i, len(psms) - 1)])
+        for i, (l, t, r, b) in enumerate(boxes)
+    ]
+
+
+def dedupe(entries):
+    """One entry per SteamID; IDs read in both columns' overlap strip keep the
+    read with a name, then the more confident one."""
+    best = {}
+    for e in entries:
+        sid, name, box, conf = e
+        cur = best.get(sid)
+        if cur is None or ((name != sid), conf) > ((cur[1] != sid), cur[3]):
+            best[sid] = e
+    return list(best.values())
+
+
+class RegionOCR:
+    """OCRs each region of a frame concurrently, each with its own psm.
+
+    Regions are cropped from the raw frame, preprocessed and read on a
+    thread pool (Tesseract releases the GIL). read() returns
+    [(sid, name, box, conf)] with boxes in frame coordinates, deduped across
+    regions; per-region wall times of the last frame are in `timings` (ms)
+    and the pool threads' CPU seconds so far in `cpu`, which the caller's
+    own thread clock doesn't see.
+    """
+
+    def __init__(self, regions, include_names=False, backend=None):
+        self.regions = list(regions)
+        self.include_names = include_names
+        self.backend = backend or get_backend()
+        self.pool = ThreadPoolExecutor(max_workers=max(1, len(self.regions)), thread_name_prefix="ocr-region")
+        self.timings = {}
+        self.totals = {r.name: 0.0 for r in self.regions}
+        self.frames = 0
+        self.cpu = 0.0
+
+    def _read_region(self, region, part, x0, y0):
+        start, cpu_start = time.perf_counter(), time.thread_time()
+        img = preprocess(part)
+        words = read_words(img, self.backend, self.include_names, psm=region.psm)
+        entries = []
+        for sid, name, w in parse_words(words, self.include_names):
+            box = (
+                x0 + w["x"] // UPSCALE_FACTOR,
+                y0 + w["y"] // UPSCALE_FACTOR,
+                x0 + (w["x"] + w["w"]) // UPSCALE_FACTOR,
+                y0 + (w["y"] + w["h"]) // UPSCALE_FACTOR,
+            )
+            entries.append((sid, name, box, w.get("conf", 0)))
+        return entries, (time.perf_counter() - start) * 1000, time.thread_time() - cpu_start
+
+    def read(self, img, top=0):
+        """OCR a frame, or a band of one whose first row is frame row `top`.
+        Returns once every region is read, so img may be a capture buffer view."""
+        futures = {}
+        width, height = frame_size(img)
+        for region in self.regions:
+            l, t, r, b = region.box
+            l, r = max(0, l), min(width, r)
+            t, b = max(0, t - top), min(height, b - top)
+            if r - l < 8 or b - t < 8:
+                continue  # region outside this band
+            part = crop(img, (l, t, r, b))
+            futures[region.name] = self.pool.submit(self._read_region, region, part, l, top + t)
+
+        entries, timings = [], {}
+        for name, future in futures.items():
+            region_entries, ms, cpu = future.result()
+            entries.extend(region_entries)
+            timings[name] = ms
+            self.totals[name] += ms
+            self.cpu += cpu
+        self.timings = timings
+        self.frames += 1
+        return dedupe(entries)
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+
+    def stats(self):
+        if not self.frames:
+            return "no frames"
+        return ", ".join(f"{name} {total / self.frames:.1f} ms/frame" for name, total in self.totals.items())
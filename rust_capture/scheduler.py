@@ -0,0 +1,105 @@
+import os
+import threading
+import time
+from collections import deque
+
+MIN_INTERVAL = float(os.environ.get("RUST_CAPTURE_MIN_INTERVAL", 0.05))  # s, fastest rate while scrolling
+MAX_INTERVAL = float(os.environ.get("RUST_CAPTURE_MAX_INTERVAL", 1.0))   # s, idle rate
+CPU_BUDGET = float(os.environ.get("RUST_CPU_BUDGET", 0.5))  # fraction of one core capture + OCR may use
+IDLE_GRACE = 3      # unchanged frames at full rate after activity (scrolls come in bursts)
+BACKOFF = 1.5       # interval growth per further unchanged frame
+WINDOW = 5.0        # s of history for the CPU estimate
+LATENCY_ALPHA = 0.2
+
+
+class CaptureScheduler:
+    """Picks the delay before the next capture.
+
+    While frames change it captures at MIN_INTERVAL; once they stop it
+    keeps that rate for IDLE_GRACE frames, then backs off geometrically to
+    MAX_INTERVAL. Two floors apply on top: no faster than the OCR stage
+    can keep up with (latency / workers), and no faster than the CPU
+    budget allows, given the CPU time per frame over the last WINDOW
+    seconds. The budget floor is not capped by MAX_INTERVAL. An
+    iteration's CPU time is read from cpu_clock (see wait()), the capture
+    thread's own by default: a process-wide clock would also count the
+    dashboard and fetcher threads. Work done elsewhere (OCR worker
+    processes or threads, tesseract subprocesses) is reported with
+    add_work().
+    """
+
+    def __init__(self, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL,
+                 cpu_budget=CPU_BUDGET, workers=1, cpu_clock=time.thread_time):
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.cpu_budget = max(0.01, cpu_budget)
+        self.workers = max(1, workers)
+        self.cpu_clock = cpu_clock
+        self.interval = min_interval
+        self.unchanged = 0
+        self.latency = 0.0
+        self.work = deque()    # (time, seconds of work)
+        self.frames = deque()  # capture times
+        self.captures = 0
+        self.started = time.monotonic()
+        self.lock = threading.Lock()  # add_work() comes from the pipeline's aggregator thread
+
+    def add_work(self, seconds, latency=None):
+        """Report work done for a frame elsewhere (and its end-to-end latency)."""
+        with self.lock:
+            self.work.append((time.monotonic(), seconds))
+            if latency is not None:
+                self.latency += LATENCY_ALPHA * (latency - self.latency)
+
+    def _trim(self, now):
+        while self.work and now - self.work[0][0] > WINDOW:
+            self.work.popleft()
+        while self.frames and now - self.frames[0] > WINDOW:
+            self.frames.popleft()
+
+    def cpu_fraction(self):
+        now = time.monotonic()
+        with self.lock:
+            self._trim(now)
+            work = sum(s for _, s in self.work)
+        return work / (min(WINDOW, now - self.started) or 1e-6)
+
+    def next_delay(self, changed, elapsed, cpu=None):
+        """Seconds to sleep after a capture iteration that took `elapsed` s
+        of wall time and `cpu` s of CPU time (elapsed if not measured)."""
+        now = time.monotonic()
+        with self.lock:
+            self.captures += 1
+            self.frames.append(now)
+            self.work.append((now, elapsed if cpu is None else cpu))
+            self._trim(now)
+            per_frame = sum(s for _, s in self.work) / len(self.frames)
+            latency = self.latency
+
+        if changed:
+            self.unchanged = 0
+            self.interval = self.min_interval
+        else:
+            self.unchanged += 1
+            if self.unchanged > IDLE_GRACE:
+                self.interval = min(self.max_interval, self.interval * BACKOFF)
+
+        interval = min(self.max_interval, max(self.interval, latency / self.workers))
+        interval = max(interval, per_frame / self.cpu_budget)  # the budget wins over the idle rate
+        return max(0.0, interval - elapsed)
+
+    def wait(self, changed, start, cpu_start=None):
+        """Sleep until the next capture; start is the iteration's perf_counter()
+        and cpu_start its cpu_clock() reading."""
+        elapsed = time.perf_counter() - start
+        cpu = None if cpu_start is None else self.cpu_clock() - cpu_start
+        time.sleep(self.next_delay(changed, elapsed, cpu))
+
+    def stats(self):
+        runtime = time.monotonic() - self.started
+        rate = self.captures / runtime if runtime else 0.0
+        return (
+            f"{self.captures} captures ({rate:.1f}/s), current interval {self.interval * 1000:.0f} ms, "
+            f"OCR latency {self.latency * 1000:.0f} ms, CPU {self.cpu_fraction() * 100:.0f}% "
+            f"of a core (budget {self.cpu_budget * 100:.0f}%)"
+        )
@@ -0,0 +1,168 @@
+import numpy as np
+
+MAX_SHIFT = 400        # largest scroll (px) searched between two frames
+MIN_SCORE = 0.9        # correlation needed to trust an offset
+MIN_OVERLAP = 0.4      # fraction of the frame that must overlap for a match
+PROFILE_STRIPS = 4     # vertical strips, so rows of similar ink don't alias
+COARSE = 4             # first pass searches every COARSE-th shift on pooled profiles
+ROW_DIFF = 6.0         # mean abs diff (0-255) above which an aligned row changed
+BAND_MARGIN = 72       # extra px around the band so cut-off rows (name + ID) are read whole
+FULL_FRACTION = 0.7    # OCR the whole frame when the band would be bigger than this
+GAP_INK = 0.05         # folded ink, as a fraction of its range, that still counts as a gap between rows
+
+
+def to_gray(img):
+    if hasattr(img, "convert"):
+        img = img.convert("L")
+    arr = np.asarray(img)
+    if arr.ndim == 3:
+        arr = arr[..., :3].mean(axis=2)
+    return arr.astype(np.float32)
+
+
+def row_phase(profiles, pitch):
+    """Offset (0..pitch) of the gaps between list rows: the middle of the
+    widest blank run of the ink profile folded at the pitch. The gap
+    between rows is wider than the one between a name and its ID."""
+    n = len(profiles) // pitch * pitch if pitch > 0 else 0
+    if n == 0:
+        return None
+    ink = np.abs(profiles[:n] - np.median(profiles, axis=0)).sum(axis=1)
+    folded = ink.reshape(-1, pitch).sum(axis=0)
+    blank = folded <= folded.min() + GAP_INK * (folded.max() - folded.min())
+    if blank.all():
+        return None  # no rows in view
+    start = int(np.argmin(blank))  # an inked row: runs can't wrap past it
+    rolled = np.roll(blank, -start)
+    runs = _runs_of(rolled)
+    first, last = max(runs, key=lambda r: r[1] - r[0])
+    return (start + (first + last) // 2) % pitch
+
+
+def _runs_of(flags):
+    """(start, end) of each run of True in a 1-d boolean array."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], flags.astype(np.int8), [0]))))
+    return list(zip(edges[::2], edges[1::2]))
+
+
+def row_profiles(gray, strips=PROFILE_STRIPS):
+    """Mean intensity of every row in each of `strips` vertical strips (h x strips)."""
+    h, w = gray.shape
+    edges = np.linspace(0, w, strips + 1).astype(int)
+    return np.stack([gray[:, a:b].mean(axis=1) for a, b in zip(edges[:-1], edges[1:])], axis=1)
+
+
+def _ncc(a, b):
+    a = a - a.mean()
+    b = b - b.mean()
+    denom = np.sqrt((a * a).sum() * (b * b).sum())
+    return float((a * b).sum() / denom) if denom > 1e-6 else 0.0
+
+
+def _search(p, c, shifts, min_rows):
+    n = min(len(p), len(c))
+    best_dy, best_score = 0, -1.0
+    for dy in shifts:
+        lo, hi = max(0, -dy), min(n, n - dy)
+        if hi - lo < min_rows:
+            continue
+        score = _ncc(c[lo:hi], p[lo + dy:hi + dy])
+        if score > best_score:
+            best_dy, best_score = dy, score
+    return best_dy, best_score
+
+
+def estimate_scroll_offset(prev, curr, max_shift=MAX_SHIFT):
+    """Vertical offset between two frames by cross-correlating row profiles.
+
+    prev/curr are grayscale arrays or row_profiles() output. Returns
+    (dy, score) where curr[y] ≈ prev[y + dy]: dy > 0 means the content moved
+    up (list scrolled down) and new rows appeared at the bottom. A coarse
+    pass on COARSE-row pooled profiles is refined at full resolution.
+    """
+    p = prev if prev.ndim == 2 and prev.shape[1] == PROFILE_STRIPS else row_profiles(prev)
+    c = curr if curr.ndim == 2 and curr.shape[1] == PROFILE_STRIPS else row_profiles(curr)
+    n = min(len(p), len(c)) // COARSE * COARSE
+    min_rows = int(n * MIN_OVERLAP)
+    pc = p[:n].reshape(-1, COARSE, p.shape[1]).mean(axis=1)
+    cc = c[:n].reshape(-1, COARSE, c.shape[1]).mean(axis=1)
+    coarse = max_shift // COARSE
+    dy, _ = _search(pc, cc, range(-coarse, coarse + 1), min_rows // COARSE)
+    dy *= COARSE
+    shifts = range(max(-max_shift, dy - COARSE), min(max_shift, dy + COARSE) + 1)
+    return _search(p, c, shifts, min_rows)
+
+
+class ScrollTracker:
+    """Works out which horizontal band of a frame actually needs OCR.
+
+    The previous processed frame is aligned to the current one using the
+    estimated scroll offset; rows that are newly revealed or differ after
+    alignment form the band. Everything else was already read. With the
+    list's row_pitch (from the calibration) the band is widened to whole
+    list rows, its edges moved out to the gaps between rows, instead of
+    by a fixed margin.
+    """
+
+    def __init__(self, margin=BAND_MARGIN, max_shift=MAX_SHIFT, min_score=MIN_SCORE, row_pitch=0):
+        self.row_pitch = row_pitch
+        self.margin = 0 if row_pitch else margin
+        self.max_shift = max_shift
+        self.min_score = min_score
+        self.prev = None
+        self.prev_profiles = None
+        self.last_offset = None
+        self.pixels_total = 0
+        self.pixels_ocr = 0
+
+    def reset(self):
+        self.prev = None
+        self.prev_profiles = None
+
+    def plan(self, img):
+        """Return (top, bottom) rows of img to OCR and remember img as reference."""
+        gray = to_gray(img)
+        profiles = row_profiles(gray)
+        h = gray.shape[0]
+        band = (0, h)
+        self.last_offset = None
+
+        if self.prev is not None and self.prev.shape == gray.shape:
+            dy, score = estimate_scroll_offset(self.prev_profiles, profiles, self.max_shift)
+            if score >= self.min_score:
+                self.last_offset = dy
+                band = self._changed_band(self.prev, gray, dy)
+
+        self.prev, self.prev_profiles = gray, profiles
+        self.pixels_total += h
+        if band is None:
+            return None
+        top, bottom = band
+        if self.row_pitch and (top, bottom) != (0, h):
+            top, bottom = self._align(top, bottom, h, profiles)
+        if bottom - top > FULL_FRACTION * h:
+            top, bottom = 0, h
+        self.pixels_ocr += bottom - top
+        return top, bottom
+
+    def _align(self, top, bottom, h, profiles):
+        pitch, phase = self.row_pitch, row_phase(profiles, self.row_pitch)
+        if phase is None:
+            return max(0, top - BAND_MARGIN), min(h, bottom + BAND_MARGIN)
+        top = phase + (top - phase) // pitch * pitch
+        bottom = phase - (phase - bottom) // pitch * pitch
+        return max(0, top), min(h, bottom)
+
+    def _changed_band(self, prev, curr, dy):
+        h = curr.shape[0]
+        lo, hi = max(0, -dy), min(h, h - dy)
+        changed = np.ones(h, dtype=bool)  # rows with no counterpart are new
+        changed[lo:hi] = np.abs(curr[lo:hi] - prev[lo + dy:hi + dy]).mean(axis=1) > ROW_DIFF
+        rows = np.flatnonzero(changed)
+        if rows.size == 0:
+            return None  # nothing new once aligned
+        return max(0, int(rows[0]) - self.margin), min(h, int(rows[-1]) + 1 + self.margin)
+
+    @property
+    def ocr_fraction(self):
+        return self.pixels_ocr / self.pixels_total if self.pixels_total else 1.0
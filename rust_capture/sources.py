@@ -0,0 +1,214 @@
+import io
+import json
+import os
+import threading
+import time
+import zipfile
+import numpy as np
+from PIL import Image
+
+# Frame archives are zip files: frames/000000.png ... plus manifest.json
+# {"version": 1, "bbox": [l, t, r, b] | null, "frames": [{"file", "t", "ids"}]}
+# where t is seconds since the first frame and ids (optional) are the
+# SteamIDs visible in the frame, used as benchmark labels.
+ARCHIVE_VERSION = 1
+
+REPLAY_PATH = os.environ.get("RUST_REPLAY")  # frame archive to capture from instead of the screen
+RECORD_PATH = os.environ.get("RUST_RECORD")  # frame archive to save captured frames to (never overwritten)
+
+
+class CaptureSource:
+    """Where capture frames come from. grab() returns a frame, or None once
+    a finite source is exhausted. A frame is a PIL image or an (h, w, 3)
+    RGB NumPy array; an array may be a view of the capture buffer that the
+    next grab() overwrites, so copy what has to outlive it (to_image,
+    tobytes)."""
+
+    def grab(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+def frame_size(frame):
+    """(width, height) of a frame."""
+    if isinstance(frame, np.ndarray):
+        return frame.shape[1], frame.shape[0]
+    return frame.size
+
+
+def crop_rows(frame, top, bottom):
+    """Rows top:bottom of a frame; a view for arrays."""
+    if isinstance(frame, np.ndarray):
+        return frame[top:bottom]
+    if (top, bottom) == (0, frame.height):
+        return frame
+    return frame.crop((0, top, frame.width, bottom))
+
+
+def crop(frame, box):
+    """The (left, top, right, bottom) part of a frame; a view for arrays."""
+    l, t, r, b = box
+    if isinstance(frame, np.ndarray):
+        return frame[t:b, l:r]
+    return frame.crop(box)
+
+
+def from_bytes(mode, size, data):
+    """A frame sent as (mode, size, tobytes()): an array over data for
+    L/RGB/RGBA, else a PIL image."""
+    if mode in ("L", "RGB", "RGBA"):
+        frame = np.frombuffer(data, np.uint8).reshape(size[1], size[0], -1)
+        return frame[..., 0] if mode == "L" else frame
+    return Image.frombytes(mode, size, data)
+
+
+def to_image(frame):
+    """A frame as a PIL image of its own (arrays are copied)."""
+    if isinstance(frame, np.ndarray):
+        return Image.fromarray(np.ascontiguousarray(frame))
+    return frame
+
+
+class ScreenSource(CaptureSource):
+    """Grabs bbox through a capture backend (see rust_capture.capture_backends)
+    as a view of the backend's buffer, without a per-frame image copy."""
+
+    def __init__(self, bbox, backend=None):
+        from rust_capture.capture_backends import get_capture_backend, CAPTURE_BACKEND
+        self.bbox = tuple(bbox)
+        if backend is None or isinstance(backend, str):
+            backend = get_capture_backend(self.bbox, backend or CAPTURE_BACKEND)
+        self.backend = backend
+
+    def grab(self):
+        return self.backend.grab_rgb()
+
+    def close(self):
+        print(f"[Capture] {self.backend.stats()}")
+        self.backend.close()
+
+
+def unused_path(path):
+    """path, or if it exists path with a timestamp (and counter) added:
+    rec.zip -> rec-20250101-120000.zip, rec-20250101-120000-2.zip, ..."""
+    root, ext = os.path.splitext(str(path))
+    candidate, stamp, n = str(path), time.strftime("%Y%m%d-%H%M%S"), 1
+    while os.path.exists(candidate):
+        candidate = f"{root}-{stamp}{f'-{n}' if n > 1 else ''}{ext}"
+        n += 1
+    return candidate
+
+
+class ArchiveWriter:
+    """Writes frames (and optional labels) to a frame archive. An existing
+    archive at path is kept and a new name picked, unless overwrite is set."""
+
+    def __init__(self, path, bbox=None, overwrite=False):
+        self.path = str(path) if overwrite else unused_path(path)
+        self.zip = zipfile.ZipFile(self.path, "w", zipfile.ZIP_STORED)  # PNGs are already compressed
+        self.manifest = {"version": ARCHIVE_VERSION, "bbox": list(bbox) if bbox else None, "frames": []}
+        self.start = None
+        self.lock = threading.Lock()
+
+    def add(self, img, ids=None, t=None):
+        now = time.monotonic()
+        with self.lock:
+            if self.start is None:
+                self.start = now
+            name = f"frames/{len(self.manifest['frames']):06d}.png"
+            buf = io.BytesIO()
+            to_image(img).save(buf, format="PNG", compress_level=6)
+            self.zip.writestr(name, buf.getvalue())
+            entry = {"file": name, "t": round(now - self.start if t is None else t, 3)}
+            if ids is not None:
+                entry["ids"] = sorted(ids)
+            self.manifest["frames"].append(entry)
+
+    def close(self):
+        with self.lock:
+            if self.zip.fp is None:
+                return
+            self.zip.writestr("manifest.json", json.dumps(self.manifest, indent=1))
+            self.zip.close()
+
+
+class RecordingSource(CaptureSource):
+    """Passes frames through from another source, saving each to an archive."""
+
+    def __init__(self, source, path, bbox=None):
+        self.source = source
+        self.writer = ArchiveWriter(path, bbox or getattr(source, "bbox", None))
+        print(f"[Capture] Recording frames to {self.writer.path}")
+
+    def grab(self):
+        img = self.source.grab()
+        if img is not None:
+            self.writer.add(img)
+        return img
+
+    def close(self):
+        self.writer.close()
+        self.source.close()
+        print(f"[Capture] Recorded {len(self.writer.manifest['frames'])} frames to {self.writer.path}")
+
+
+class ReplaySource(CaptureSource):
+    """Replays a frame archive, frame by frame, in recorded order.
+
+    With realtime=True grab() sleeps to reproduce the recorded timing,
+    otherwise frames come back as fast as they are asked for. loop=True
+    starts over at the end instead of returning None.
+    """
+
+    def __init__(self, path, loop=False, realtime=False):
+        self.path = str(path)
+        self.zip = zipfile.ZipFile(self.path)
+        manifest = json.loads(self.zip.read("manifest.json"))
+        self.bbox = manifest.get("bbox")
+        self.frames = manifest["frames"]
+        self.loop = loop
+        self.realtime = realtime
+        self.index = 0
+        self.start = None
+
+    def __len__(self):
+        return len(self.frames)
+
+    def labels(self, index):
+        """Visible SteamIDs of a frame, or None if the archive has no labels."""
+        ids = self.frames[index].get("ids")
+        return set(ids) if ids is not None else None
+
+    def frame(self, index):
+        with self.zip.open(self.frames[index]["file"]) as f:
+            img = Image.open(f)
+            img.load()
+        return img.convert("RGB")
+
+    def grab(self):
+        if self.index >= len(self.frames):
+            if not self.loop or not self.frames:
+                return None
+            self.index, self.start = 0, None
+        if self.realtime:
+            now = time.monotonic()
+            if self.start is None:
+                self.start = now - self.frames[self.index]["t"]
+            time.sleep(max(0.0, self.start + self.frames[self.index]["t"] - now))
+        img = self.frame(self.index)
+        self.index += 1
+        return img
+
+    def close(self):
+        self.zip.close()
+
+
+def open_source(bbox, replay=REPLAY_PATH, record=RECORD_PATH):
+    """Screen capture of bbox, or replay of an archive; optionally recorded."""
+    source = ReplaySource(replay, loop=True, realtime=True) if replay else ScreenSource(bbox)
+    if record:
+        source = RecordingSource(source, record, bbox)
+    return source
+
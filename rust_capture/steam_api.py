@@ -0,0 +1,52 @@
+import os
+import random
+import time
+
+import requests
+
+# Point RUST_STEAM_API at a stand-in (benchmarks/fake_steam_server.py) to fetch offline
+STEAM_API_BASE = os.environ.get("RUST_STEAM_API", "https://api.steampowered.com").rstrip("/")
+STEAM_KEY = os.environ.get("RUST_STEAM_KEY", "2D01D80224108A449432583EA81C08B3")
+PLAYER_SUMMARY_URL = f"{STEAM_API_BASE}/ISteamUser/GetPlayerSummaries/v2/"
+OWNED_GAMES_URL = f"{STEAM_API_BASE}/IPlayerService/GetOwnedGames/v1/"
+RUST_APP_ID = 252490
+
+REQUEST_TIMEOUT = float(os.environ.get("RUST_STEAM_TIMEOUT", 10))  # s per request
+MAX_RETRIES = 3        # after the first attempt, on 429/5xx and timeouts
+RETRY_BACKOFF = 1.0    # s before the first retry, doubled each time
+MAX_RETRY_WAIT = 30.0  # s; cap on backoff and on the server's Retry-After
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def retry_wait(attempt, response=None):
+    """Seconds to wait before retry number attempt + 1: the server's
+    Retry-After when it sends one, else jittered exponential backoff."""
+    if response is not None:
+        try:
+            return min(MAX_RETRY_WAIT, max(0.0, float(response.headers["Retry-After"])))
+        except (KeyError, ValueError):
+            pass
+    return min(MAX_RETRY_WAIT, RETRY_BACKOFF * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+def steam_get(url, params, session=None, timeout=REQUEST_TIMEOUT, retries=MAX_RETRIES):
+    """GET a Steam Web API method and return its JSON.
+
+    Rate limiting (429), server errors and timeouts are retried up to
+    retries times; the last failure is raised as a requests exception.
+    """
+    session = session or requests
+    params = dict(params, key=STEAM_KEY)
+    for attempt in range(retries + 1):
+        try:
+            r = session.get(url, params=params, timeout=timeout)
+        except (requests.Timeout, requests.ConnectionError):
+            if attempt == retries:
+                raise
+            time.sleep(retry_wait(attempt))
+            continue
+        if r.status_code in RETRY_STATUS and attempt < retries:
+            time.sleep(retry_wait(attempt, r))
+            continue
+        r.raise_for_status()
+        return r.json()
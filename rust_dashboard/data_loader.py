@@ -1,29 +1,40 @@
 from pathlib import Path
 import json
 import pandas as pd
+from rust_capture.paths import PLAYER_JSON
 
-# Adjust the path to your JSON file
-JSON_FILE = Path(__file__).parent.parent / "player_data.json"
+JSON_FILE = PLAYER_JSON  # RUST_PLAYER_JSON overrides
 
-def load_data():
-    expected_columns = [
-        "steam_id", "name", "rust_hours_total", "rust_hours_2weeks",
-        "profile_url", "private_profile"
-    ]
+EXPECTED_COLUMNS = [
+    "steam_id", "name", "rust_hours_total", "rust_hours_2weeks",
+    "profile_url", "private_profile", "flagged", "flagged_at"
+]
+
+def load_data(path=None):
+    expected_columns = EXPECTED_COLUMNS
+    path = Path(path or JSON_FILE)
 
     # Return empty DataFrame if file doesn't exist
-    if not JSON_FILE.exists():
-        print(f"[WARN] {JSON_FILE} not found, returning empty DataFrame")
+    if not path.exists():
+        print(f"[WARN] {path} not found, returning empty DataFrame")
         return pd.DataFrame(columns=expected_columns)
 
     # Read JSON safely
     try:
-        with open(JSON_FILE, "r", encoding="utf-8") as f:
+        with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
     except Exception as e:
         print(f"[WARN] Failed to load JSON: {e}")
         return pd.DataFrame(columns=expected_columns)
 
+    df = players_frame(data)
+    print(f"[load_data] Loaded {len(df)} players from JSON")
+    return df
+
+def players_frame(data):
+    """DataFrame of player_data.json entries (a list, or a dict of them)."""
+    expected_columns = EXPECTED_COLUMNS
+
     # Ensure data is a list
     if isinstance(data, dict):
         data = list(data.values())
@@ -43,10 +54,10 @@ def load_data():
             "rust_hours_total": pd.to_numeric(entry.get("rust_hours_total", 0), errors="coerce"),
             "rust_hours_2weeks": pd.to_numeric(entry.get("rust_hours_2weeks", 0), errors="coerce"),
             "profile_url": str(entry.get("profile_url", "")),
-            "private_profile": entry.get("flags", {}).get("private_profile", False)
+            "private_profile": entry.get("flags", {}).get("private_profile", False),
+            "flagged": bool(entry.get("flags", {}).get("flagged", False)),
+            "flagged_at": str(entry.get("flags", {}).get("flagged_at") or "")
         }
         cleaned_data.append(cleaned_entry)
 
-    df = pd.DataFrame(cleaned_data, columns=expected_columns)
-    print(f"[load_data] Loaded {len(df)} players from JSON")
-    return df
+    return pd.DataFrame(cleaned_data, columns=expected_columns)
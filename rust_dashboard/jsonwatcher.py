@@ -1,9 +1,9 @@
 import json
-from pathlib import Path
 from PySide6.QtCore import QObject, QTimer
-import pandas as pd
+from rust_capture.paths import PLAYER_JSON
+from rust_dashboard.snapshot import publish
 
-DATA_JSON = Path(r"C:\Users\GordanRamsey\Desktop\RustLobbyTracker\player_data.json")
+DATA_JSON = PLAYER_JSON
 
 
 class JSONWatcher(QObject):
@@ -38,27 +38,14 @@ class JSONWatcher(QObject):
             with open(DATA_JSON, "r", encoding="utf-8") as f:
                 data = json.load(f)
 
-            df = pd.DataFrame(data)
-
-            # Ensure required columns exist
-            if "rust_hours_total" not in df.columns:
-                df["rust_hours_total"] = 0
-            if "rust_hours_2weeks" not in df.columns:
-                df["rust_hours_2weeks"] = 0
-            if "flags" not in df.columns:
-                df["flags"] = [{} for _ in range(len(df))]
-
-            # Flatten flags for easy access in GUI
-            df["flagged"] = df["flags"].apply(lambda f: f.get("flagged", False) if isinstance(f, dict) else False)
-            df["private_profile"] = df["flags"].apply(lambda f: f.get("private_profile", False) if isinstance(f, dict) else False)
-
-            # Refresh dashboard and tabs
-            self.dashboard.refresh_data(df)
+            # One snapshot per change; tabs the dashboard already refreshed skip it
+            snapshot = publish(data)
+            self.dashboard.refresh_data(snapshot)
             for tab in self.tabs:
                 if hasattr(tab, "refresh_data"):
-                    tab.refresh_data(df)
+                    tab.refresh_data(snapshot)
                 elif hasattr(tab, "update_data"):
-                    tab.update_data(df)
+                    tab.update_data(snapshot)
 
         except Exception as e:
             print("[Watcher] Error:", e)
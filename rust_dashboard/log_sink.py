@@ -0,0 +1,82 @@
+import threading
+from collections import deque
+
+# Log levels, lowest first
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARN": 30, "ERROR": 40}
+
+MAX_LINES = 5000  # ring buffer size (oldest lines are dropped first)
+
+
+def guess_level(line):
+    """Infer a level from the [TAG] prefixes used by print() across the app."""
+    head = line[:24].upper()
+    if "ERROR" in head or head.startswith("[!]") or "TRACEBACK" in head:
+        return LEVELS["ERROR"]
+    if "WARN" in head:
+        return LEVELS["WARN"]
+    if "DEBUG" in head:
+        return LEVELS["DEBUG"]
+    return LEVELS["INFO"]
+
+
+class LogSink:
+    """Bounded, thread-safe line buffer.
+
+    Any thread may call write(); only the GUI thread should call drain().
+    deque.append/popleft are atomic in CPython, so no lock is taken on the
+    hot path and a burst of output can never grow memory past MAX_LINES.
+    """
+
+    def __init__(self, max_lines=MAX_LINES, min_level="INFO"):
+        self.lines = deque(maxlen=max_lines)
+        self.min_level = LEVELS.get(str(min_level).upper(), LEVELS["INFO"])
+        self.pushed = 0  # stats only; races between writers may undercount
+        self._drained = 0
+        self._local = threading.local()  # per-thread partial line (print writes "\n" separately)
+
+    def set_level(self, level):
+        self.min_level = LEVELS.get(str(level).upper(), self.min_level)
+
+    def push(self, line, level=None):
+        if level is None:
+            level = guess_level(line)
+        elif isinstance(level, str):
+            level = LEVELS.get(level, LEVELS["INFO"])
+        if level < self.min_level:
+            return
+        self.lines.append(line)
+        self.pushed += 1
+
+    def write(self, text):
+        """File-like write: splits text into lines, keeps a trailing partial."""
+        if not text:
+            return
+        text = getattr(self._local, "pending", "") + text
+        *complete, self._local.pending = text.split("\n")
+        for line in complete:
+            line = line.rstrip()
+            if line.strip():
+                self.push(line)
+
+    def flush(self):
+        pending = getattr(self._local, "pending", "")
+        if pending.strip():
+            self.push(pending.rstrip())
+        self._local.pending = ""
+
+    def drain(self, max_lines=None):
+        """Pop up to max_lines buffered lines (all of them if None)."""
+        out = []
+        popleft = self.lines.popleft
+        try:
+            while max_lines is None or len(out) < max_lines:
+                out.append(popleft())
+        except IndexError:
+            pass
+        self._drained += len(out)
+        return out
+
+    @property
+    def dropped(self):
+        """Lines lost to the ring buffer overflowing since startup."""
+        return max(0, self.pushed - self._drained - len(self.lines))
@@ -0,0 +1,111 @@
+import os
+import time
+from PySide6.QtCore import QTimer, Qt, QRect, Signal
+from PySide6.QtWidgets import QWidget, QApplication
+from PySide6.QtGui import QPainter, QColor, QRegion
+
+OVERLAY_MAX_FPS = float(os.environ.get("RUST_OVERLAY_FPS", 10))  # debug overlay repaints per second, at most
+
+
+class OCRDebugOverlay(QWidget):
+    """Click-through full-screen overlay: OCR columns with their timings,
+    and a highlight on every box read in the last frame.
+
+    Nothing repaints on a timer. update_regions()/update_timings() may be
+    called from the capture threads; signals hand them to the GUI thread,
+    where changes are coalesced, flushed at most OVERLAY_MAX_FPS times a
+    second, and repainted only in the rects of boxes that appeared or went
+    away (and labels whose timing changed).
+    """
+
+    regions_changed = Signal(object)
+    timings_changed = Signal(object)
+    BOX_MARGIN = 2     # px past a box its fill may reach (antialiasing)
+    LABEL_HEIGHT = 18  # px above a column for its timing label
+
+    def __init__(self, regions, columns=None, max_fps=OVERLAY_MAX_FPS):
+        super().__init__()
+        self.regions = list(regions)
+        self.columns = columns or []  # OCR regions (screen boxes), outlined with their timings
+        self.timings = {}
+        self.pending_regions = None
+        self.pending_timings = None
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.last_flush = 0.0
+        self.repaints = 0
+        self.setWindowFlags(
+            Qt.FramelessWindowHint |
+            Qt.WindowStaysOnTopHint |
+            Qt.Tool |
+            Qt.WindowTransparentForInput
+        )
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        screen = QApplication.primaryScreen()
+        self.setGeometry(0, 0, screen.size().width(), screen.size().height())
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.timeout.connect(self.flush)
+        self.regions_changed.connect(self._queue_regions)
+        self.timings_changed.connect(self._queue_timings)
+
+    def paintEvent(self, event):
+        if not self.regions and not self.columns:
+            return
+        with QPainter(self) as painter:
+            painter.setPen(QColor(255, 200, 0, 200))
+            for i, (l, t, r, b) in enumerate(self.columns):
+                painter.drawRect(l, t, r - l, b - t)
+                ms = self.timings.get(f"col{i + 1}")
+                if ms is not None:
+                    painter.drawText(l + 4, t - 4, f"col{i + 1}: {ms:.0f} ms")
+            if not self.regions:
+                return
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(255, 0, 0, 50))
+            dirty = event.rect()
+            for l, t, r, b in self.regions:
+                box = QRect(l, t, r - l, b - t)
+                if box.intersects(dirty):
+                    painter.drawRect(box)
+
+    # Any thread
+    def update_regions(self, regions):
+        self.regions_changed.emit(list(regions))
+
+    def update_timings(self, timings):
+        self.timings_changed.emit(dict(timings))
+
+    # GUI thread
+    def _queue_regions(self, regions):
+        self.pending_regions = regions
+        self._schedule()
+
+    def _queue_timings(self, timings):
+        self.pending_timings = timings
+        self._schedule()
+
+    def _schedule(self):
+        if self.flush_timer.isActive():
+            return  # coalesced into the flush already due
+        wait = self.min_interval - (time.monotonic() - self.last_flush)
+        self.flush_timer.start(max(0, int(wait * 1000)))
+
+    def flush(self):
+        self.last_flush = time.monotonic()
+        dirty = QRegion()
+        m = self.BOX_MARGIN
+        if self.pending_regions is not None:
+            regions, self.pending_regions = self.pending_regions, None
+            for l, t, r, b in set(self.regions).symmetric_difference(regions):
+                dirty = dirty.united(QRect(l - m, t - m, r - l + 2 * m, b - t + 2 * m))
+            self.regions = regions
+        if self.pending_timings is not None:
+            timings, self.pending_timings = self.pending_timings, None
+            for i, (l, t, r, b) in enumerate(self.columns):
+                name = f"col{i + 1}"
+                if round(timings.get(name, -1)) != round(self.timings.get(name, -1)):
+                    dirty = dirty.united(QRect(l, t - self.LABEL_HEIGHT, r - l, self.LABEL_HEIGHT))
+            self.timings = timings
+        if not dirty.isEmpty():
+            self.repaints += 1
+            self.update(dirty)
@@ -1,14 +1,24 @@
-from PySide6.QtWidgets import QWidget, QPushButton, QVBoxLayout, QTextEdit, QSizePolicy, QSpacerItem
+from PySide6.QtWidgets import QWidget, QPushButton, QVBoxLayout, QTextEdit, QSizePolicy, QSpacerItem, QComboBox
 from PySide6.QtCore import Qt, QTimer, QRect, QPoint
 from PySide6.QtGui import QGuiApplication
 import ctypes
+import os
 import subprocess
 import threading
+from rust_dashboard.log_sink import LogSink, LEVELS
+from rust_capture.metrics import metrics
+
+LOG_DRAIN_MS = 100        # GUI drains the log sink at this rate
+LOG_BATCH_LINES = 500     # max lines appended per drain tick
+LOG_MAX_BLOCKS = 2000     # lines kept in the terminal widget
+LOG_LEVEL = os.environ.get("RUST_LOG_LEVEL", "INFO").upper()  # lowest level shown: DEBUG | INFO | WARN | ERROR
+METRICS_REFRESH_MS = 1000  # metrics panel refresh while it is open
+METRICS_PANEL_HEIGHT = 230
 
 # Windows constants for native dragging
 WM_NCLBUTTONDOWN = 0xA1
 HTCAPTION = 2
-user32 = ctypes.windll.user32
+user32 = ctypes.windll.user32 if hasattr(ctypes, "windll") else None  # None off Windows
 
 class InGameOverlay(QWidget):
     EDGE_MARGIN = 6
@@ -64,7 +74,28 @@ class InGameOverlay(QWidget):
         )
         self.terminal.setFixedHeight(0)
         self.terminal.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.terminal.document().setMaximumBlockCount(LOG_MAX_BLOCKS)
+
+        # Log pipeline: worker threads push into the sink, GUI drains in batches
+        self.log_sink = LogSink(min_level=LOG_LEVEL)
+
+        # Level filter, shown with the terminal; starts at RUST_LOG_LEVEL
+        self.level_box = QComboBox()
+        self.level_box.addItems(list(LEVELS))
+        self.level_box.setCurrentText(LOG_LEVEL if LOG_LEVEL in LEVELS else "INFO")
+        self.level_box.setStyleSheet("background-color: rgba(0,0,0,220); color:#00FF00; border-radius:6px;")
+        self.level_box.currentTextChanged.connect(self.set_log_level)
+        self.level_box.hide()
+        self.layout.addWidget(self.level_box)
         self.layout.addWidget(self.terminal)
+        self._reported_dropped = 0
+        self.log_timer = QTimer(self)
+        self.log_timer.timeout.connect(self.drain_logs)
+        self.log_timer.start(LOG_DRAIN_MS)
+
+        self.scroll_target = 0
+        self.scroll_timer = QTimer(self)
+        self.scroll_timer.timeout.connect(self.step_scroll)
 
         # Spacer between terminal and dropdown
         self.layout.addItem(QSpacerItem(0, 6, QSizePolicy.Minimum, QSizePolicy.Fixed))
@@ -76,9 +107,29 @@ class InGameOverlay(QWidget):
         self.dropdown_btn.toggled.connect(self.toggle_terminal)
         self.layout.addWidget(self.dropdown_btn)
 
+        # Metrics panel (only with RUST_METRICS=1): per-stage latency percentiles
+        self.metrics_btn = QPushButton("Show Metrics")
+        self.metrics_btn.setStyleSheet(btn_style)
+        self.metrics_btn.setCheckable(True)
+        self.metrics_btn.toggled.connect(self.toggle_metrics)
+        self.metrics_view = QTextEdit()
+        self.metrics_view.setReadOnly(True)
+        self.metrics_view.setLineWrapMode(QTextEdit.NoWrap)
+        self.metrics_view.setStyleSheet(
+            "background-color: rgba(0,0,0,220); color:#FFD700; font-family: Consolas; font-size:9pt; border-radius:6px;"
+        )
+        self.metrics_view.hide()
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.timeout.connect(self.refresh_metrics)
+        if metrics.enabled:
+            self.layout.addWidget(self.metrics_btn)
+            self.layout.addWidget(self.metrics_view)
+        else:
+            self.metrics_btn.hide()
+
         # Default/expanded sizes
         self.default_width = 240
-        self.default_height = 180
+        self.default_height = 180 + (40 if metrics.enabled else 0)
         self.expanded_width = 600
         self.expanded_height = 400
         self.resize(self.default_width, self.default_height)
@@ -87,7 +138,7 @@ class InGameOverlay(QWidget):
         #mouse tracking for cursor changes
         self.container.setMouseTracking(True)
         self.setMouseTracking(True)
-        for w in [self.start_btn, self.stop_btn, self.dropdown_btn, self.terminal]:
+        for w in [self.start_btn, self.stop_btn, self.dropdown_btn, self.terminal, self.level_box, self.metrics_btn, self.metrics_view]:
             w.setMouseTracking(True)
             w.installEventFilter(self)
         # Top-right anchor
@@ -166,9 +217,12 @@ class InGameOverlay(QWidget):
             self.resize_edge = (left, right, top, bottom)
         elif event.button() == Qt.LeftButton:
             # 3️⃣ Drag window
-            hwnd = self.winId().__int__()
-            user32.ReleaseCapture()
-            user32.SendMessageW(hwnd, WM_NCLBUTTONDOWN, HTCAPTION, 0)
+            if user32:
+                hwnd = self.winId().__int__()
+                user32.ReleaseCapture()
+                user32.SendMessageW(hwnd, WM_NCLBUTTONDOWN, HTCAPTION, 0)
+            elif self.windowHandle():
+                self.windowHandle().startSystemMove()
         event.accept()
 
 
@@ -226,43 +280,87 @@ class InGameOverlay(QWidget):
     # Toggle terminal
     # ---------------------
     def toggle_terminal(self, checked):
+        extra = METRICS_PANEL_HEIGHT if self.metrics_btn.isChecked() else 0
         if checked:
             new_width = self.expanded_width
             new_height = self.expanded_height
-            self.terminal.setFixedHeight(new_height - 100)
-            self.resize(new_width, new_height)
-            self.container.resize(new_width, new_height)
+            self.terminal.setFixedHeight(new_height - 130)
+            self.level_box.show()
+            self.resize(new_width, new_height + extra)
+            self.container.resize(new_width, new_height + extra)
             self.move(self.top_right_x - new_width, self.top_right_y)
             self.dropdown_btn.setText("Hide Logs")
         else:
+            width = self.expanded_width if extra else self.default_width
             self.terminal.setFixedHeight(0)
-            self.resize(self.default_width, self.default_height)
-            self.container.resize(self.default_width, self.default_height)
-            self.move(self.top_right_x - self.default_width, self.top_right_y)
+            self.level_box.hide()
+            self.resize(width, self.default_height + extra)
+            self.container.resize(width, self.default_height + extra)
+            self.move(self.top_right_x - width, self.top_right_y)
             self.dropdown_btn.setText("Show Logs")
 
+    # ---------------------
+    # Metrics panel
+    # ---------------------
+    def toggle_metrics(self, checked):
+        self.metrics_view.setVisible(checked)
+        if checked:
+            self.refresh_metrics()
+            self.metrics_timer.start(METRICS_REFRESH_MS)
+            self.metrics_view.setFixedHeight(METRICS_PANEL_HEIGHT - 10)
+            width, height = self.expanded_width, self.height() + METRICS_PANEL_HEIGHT
+            self.metrics_btn.setText("Hide Metrics")
+        else:
+            self.metrics_timer.stop()
+            width = self.expanded_width if self.dropdown_btn.isChecked() else self.default_width
+            height = self.height() - METRICS_PANEL_HEIGHT
+            self.metrics_btn.setText("Show Metrics")
+        self.resize(width, height)
+        self.container.resize(width, height)
+        self.move(self.top_right_x - width, self.top_right_y)
+
+    def refresh_metrics(self):
+        self.metrics_view.setPlainText(metrics.format())
+
     # ---------------------
     # Logging with smooth scroll
     # ---------------------
     def log(self, text):
-        self.terminal.append(text)
-        self.smooth_scroll_to_bottom()
+        """Thread-safe: queue text for the next drain tick."""
+        self.log_sink.write(text if text.endswith("\n") else text + "\n")
+
+    def set_log_level(self, level):
+        """Lines below level are dropped from now on; shown lines stay."""
+        self.log_sink.set_level(level)
+        print(f"[LOG] Showing {level} and above")
+
+    def drain_logs(self):
+        lines = self.log_sink.drain(LOG_BATCH_LINES)
+        dropped = self.log_sink.dropped
+        if dropped > self._reported_dropped:
+            lines.insert(0, f"[LOG] {dropped - self._reported_dropped} lines dropped (buffer full)")
+            self._reported_dropped = dropped
+        if not lines:
+            return
+        scroll = self.terminal.verticalScrollBar()
+        at_bottom = scroll.value() >= scroll.maximum() - 4
+        self.terminal.append("\n".join(lines))
+        if at_bottom:
+            self.smooth_scroll_to_bottom()
 
     def smooth_scroll_to_bottom(self):
+        self.scroll_target = self.terminal.verticalScrollBar().maximum()
+        if not self.scroll_timer.isActive():
+            self.scroll_timer.start(15)
+
+    def step_scroll(self):
         scroll = self.terminal.verticalScrollBar()
-        target = scroll.maximum()
         current = scroll.value()
-        step = max(1, (target - current) // 5)
-        def step_scroll():
-            nonlocal current
-            if current < target:
-                current += step
-                scroll.setValue(min(current, target))
-            else:
-                scroll_timer.stop()
-        scroll_timer = QTimer()
-        scroll_timer.timeout.connect(step_scroll)
-        scroll_timer.start(15)
+        if current >= self.scroll_target:
+            self.scroll_timer.stop()
+            return
+        step = max(1, (self.scroll_target - current) // 5)
+        scroll.setValue(min(current + step, self.scroll_target))
 
     # ---------------------
     # Run script
@@ -271,9 +369,9 @@ class InGameOverlay(QWidget):
         def reader(proc):
             for line in iter(proc.stdout.readline, b''):
                 try:
-                    self.log(line.decode().rstrip())
+                    self.log_sink.push(line.decode().rstrip())
                 except Exception:
-                    self.log(str(line).rstrip())
+                    self.log_sink.push(str(line).rstrip())
 
         proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=1)
         threading.Thread(target=reader, args=(proc,), daemon=True).start()
\ No newline at end of file
@@ -0,0 +1,163 @@
+import json
+import time
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from rust_capture.paths import PRESENCE_HISTORY
+
+HISTORY_FILE = PRESENCE_HISTORY
+OFFLINE_STATUSES = {"Offline", "Private", "Unknown"}
+UNKNOWN = ("Unknown", "—")  # written when the watcher stops, closing open runs
+
+
+class PresenceHistory:
+    """Run-length encoded presence log for flagged players.
+
+    Only status transitions are stored: each event starts a run that lasts
+    until the player's next event. On disk it is an append-only JSONL file
+    of [steam_id, unix_ts, status, game]; in memory every player has an
+    array of timestamps and an array of interned (status, game) codes.
+    """
+
+    def __init__(self, path=HISTORY_FILE):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._states = []     # code -> (status, game)
+        self._state_ids = {}  # (status, game) -> code
+        self._times = {}      # steam_id -> array of unix seconds
+        self._codes = {}      # steam_id -> array of state codes
+        self._file = None
+        self.load()
+
+    # ---------------- STORAGE ---------------- #
+    def _code(self, state):
+        code = self._state_ids.get(state)
+        if code is None:
+            code = self._state_ids[state] = len(self._states)
+            self._states.append(state)
+        return code
+
+    def _append(self, sid, ts, state):
+        codes = self._codes.get(sid)
+        if codes is None:
+            self._times[sid] = array("q")
+            codes = self._codes[sid] = array("H")
+        code = self._code(state)
+        if codes and codes[-1] == code:
+            return False
+        if self._times[sid] and ts < self._times[sid][-1]:
+            ts = self._times[sid][-1]  # clock went backwards; keep the log sorted
+        self._times[sid].append(ts)
+        codes.append(code)
+        return True
+
+    def load(self):
+        if not self.path.exists():
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    sid, ts, status, game = json.loads(line)
+                except Exception:
+                    continue  # partially written line (crash mid-append)
+                self._append(sid, int(ts), (status, game))
+
+    def _open_append(self):
+        """Open the log for appending, first ending a partial last line (a
+        crash mid-write) so the next event doesn't merge into it."""
+        partial = False
+        if self.path.exists() and self.path.stat().st_size:
+            with open(self.path, "rb") as f:
+                f.seek(-1, 2)
+                partial = f.read(1) != b"\n"
+        f = open(self.path, "a", encoding="utf-8")
+        if partial:
+            f.write("\n")
+        return f
+
+    def record(self, steam_id, info, ts=None):
+        """Store info's (status, game) if it differs from the last event."""
+        return self.record_many({steam_id: info}, ts)
+
+    def record_many(self, changes, ts=None):
+        ts = int(ts if ts is not None else time.time())
+        lines = []
+        with self._lock:
+            for sid, info in changes.items():
+                state = (info["status"], info["game"])
+                if self._append(sid, ts, state):
+                    lines.append(json.dumps([sid, ts, state[0], state[1]], ensure_ascii=False))
+            if lines:
+                if self._file is None:
+                    self._file = self._open_append()
+                self._file.write("\n".join(lines) + "\n")
+                self._file.flush()
+        return len(lines)
+
+    def close(self, ts=None):
+        """Close every open run with an Unknown event (watcher stopping)."""
+        self.record_many(
+            {sid: {"status": UNKNOWN[0], "game": UNKNOWN[1]} for sid in self._codes},
+            ts,
+        )
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    # ---------------- QUERIES ---------------- #
+    def steam_ids(self):
+        return list(self._codes)
+
+    def current(self, steam_id):
+        codes = self._codes.get(steam_id)
+        if not codes:
+            return None
+        status, game = self._states[codes[-1]]
+        return {"status": status, "game": game, "since": self._times[steam_id][-1]}
+
+    def events(self, steam_id, start=None, end=None):
+        """Transitions in [start, end) as (ts, status, game)."""
+        times = self._times.get(steam_id)
+        if not times:
+            return []
+        lo = 0 if start is None else bisect_left(times, start)
+        hi = len(times) if end is None else bisect_left(times, end)
+        codes = self._codes[steam_id]
+        return [(times[i], *self._states[codes[i]]) for i in range(lo, hi)]
+
+    def intervals(self, steam_id, start, end):
+        """Runs overlapping [start, end), clipped, as (from, to, status, game)."""
+        times = self._times.get(steam_id)
+        if not times:
+            return []
+        codes = self._codes[steam_id]
+        i = max(0, bisect_right(times, start) - 1)
+        runs = []
+        while i < len(times) and times[i] < end:
+            run_end = times[i + 1] if i + 1 < len(times) else end
+            lo, hi = max(times[i], start), min(run_end, end)
+            if hi > lo:
+                runs.append((lo, hi, *self._states[codes[i]]))
+            i += 1
+        return runs
+
+    def online_seconds(self, steam_id, start, end):
+        return sum(hi - lo for lo, hi, status, _ in self.intervals(steam_id, start, end)
+                   if status not in OFFLINE_STATUSES)
+
+    def online_hours_per_day(self, steam_id, days=7, now=None):
+        """[(YYYY-MM-DD, hours)] for the last `days` UTC days, oldest first."""
+        now = int(now if now is not None else time.time())
+        today = datetime.fromtimestamp(now, timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        out = []
+        for d in range(days - 1, -1, -1):
+            day = today - timedelta(days=d)
+            start = int(day.timestamp())
+            end = min(start + 86400, now)
+            out.append((day.strftime("%Y-%m-%d"), round(self.online_seconds(steam_id, start, end) / 3600, 2)))
+        return out
@@ -0,0 +1,110 @@
+"""Versioned player data shared by the dashboard tabs.
+
+One DataSnapshot is built per data change and handed to every tab, which
+read it in place instead of taking their own copies. Derived views
+(public players, flagged players, statistics, leaderboards) are computed
+on first use and then shared as well. A tab given the snapshot it
+already shows does nothing.
+"""
+import itertools
+import threading
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from rust_dashboard.data_loader import EXPECTED_COLUMNS, players_frame
+from rust_dashboard.stats import public_players, sweatiness, leaderboards
+
+_versions = itertools.count(1)
+_versions_lock = threading.Lock()
+
+
+FLAG_DEFAULTS = {"private_profile": False, "flagged": False, "flagged_at": ""}
+
+
+def _flag_column(df, name):
+    default = FLAG_DEFAULTS[name]
+    if "flags" in df.columns:
+        return df["flags"].apply(lambda f: type(default)(f.get(name) or default) if isinstance(f, dict) else default)
+    return default
+
+
+def read_only(df):
+    """df with every column array marked read-only, without copying values."""
+    columns = {}
+    for name in df.columns:
+        values = df[name].array
+        np.asarray(values).flags.writeable = False
+        columns[name] = values
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+class DataSnapshot:
+    """Immutable player data: a DataFrame with EXPECTED_COLUMNS and a version.
+
+    The frame is shared by every reader. Its column arrays are read-only, so
+    writing a value (df.loc[...] = ...) raises; derive a new frame instead
+    (filters and sorts already do). Attributes can't be reassigned.
+    """
+
+    def __init__(self, df, version):
+        object.__setattr__(self, "df", read_only(df))
+        object.__setattr__(self, "version", version)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("DataSnapshot is immutable")
+
+    def __repr__(self):
+        return f"DataSnapshot(v{self.version}, {len(self.df)} players)"
+
+    @property
+    def empty(self):
+        return self.df.empty
+
+    @cached_property
+    def public(self):
+        return public_players(self.df)
+
+    @cached_property
+    def flagged(self):
+        return self.df[self.df["flagged"]] if not self.df.empty else self.df
+
+    @cached_property
+    def sweatiness(self):
+        return sweatiness(self.df, public=self.public)
+
+    @cached_property
+    def leaderboards(self):
+        return leaderboards(self.df)
+
+
+def _next_version():
+    with _versions_lock:
+        return next(_versions)
+
+
+EMPTY = DataSnapshot(pd.DataFrame(columns=EXPECTED_COLUMNS), 0)
+
+
+def publish(data):
+    """A new snapshot of data: player_data.json entries (list or dict) or a
+    DataFrame. A DataFrame is taken over without copying its values, which
+    become read-only; it only gains the flag columns it lacks."""
+    if isinstance(data, pd.DataFrame):
+        df = data.copy(deep=False)
+        for column in FLAG_DEFAULTS:
+            if column not in df.columns:
+                df[column] = _flag_column(df, column)
+    else:
+        df = players_frame(data)
+    return DataSnapshot(df, _next_version())
+
+
+def as_snapshot(data):
+    """data as a DataSnapshot: snapshots as they are, None as EMPTY, anything else published."""
+    if isinstance(data, DataSnapshot):
+        return data
+    if data is None:
+        return EMPTY
+    return publish(data)
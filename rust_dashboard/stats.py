@@ -0,0 +1,71 @@
+"""Player statistics behind the dashboard tabs and the headless reports.
+
+Plain pandas/NumPy, so it imports without Qt or matplotlib.
+"""
+import numpy as np
+
+NOOB_HOURS = 1000     # below: noob
+SWEATY_HOURS = 2000   # at or above: sweaty; in between: somewhat sweaty
+LEADERBOARD_SIZE = 10
+
+
+def gini(x):
+    array = np.sort(np.array(x))
+    n = len(array)
+    if n == 0: return 0
+    cumx = np.cumsum(array)
+    return (n + 1 - 2 * np.sum(cumx) / cumx[-1]) / n
+
+
+def public_players(df):
+    """Players with a public profile and some Rust hours."""
+    if df.empty:
+        return df
+    private = df["private_profile"] if "private_profile" in df.columns else False
+    return df[(private == False) & (df["rust_hours_total"] > 0)]
+
+
+def sweatiness(df, public=None):
+    """The Dashboard tab's metrics as a dict, or None with no public players.
+    public is public_players(df), if already at hand."""
+    df_public = public_players(df) if public is None else public
+    if df_public.empty:
+        return None
+
+    total_hours = df_public["rust_hours_total"]
+    recent_hours = df_public["rust_hours_2weeks"]
+    total_players = len(df_public)
+
+    noobs_count = int((total_hours < NOOB_HOURS).sum())
+    somewhat_sweaty_count = int(((total_hours >= NOOB_HOURS) & (total_hours < SWEATY_HOURS)).sum())
+    sweaty_count = int((total_hours >= SWEATY_HOURS).sum())
+    composite_index = min(
+        somewhat_sweaty_count / total_players * 50 +
+        sweaty_count / total_players * 110, 100
+    )
+    return {
+        "total_players": total_players,
+        "sweaty": sweaty_count,
+        "somewhat_sweaty": somewhat_sweaty_count,
+        "noobs": noobs_count,
+        "composite_index": float(composite_index),
+        "median_total": float(total_hours.median()),
+        "average_total": float(total_hours.mean()),
+        "median_recent": float(recent_hours.median()),
+        "average_recent": float(recent_hours.mean()),
+        "std_total": float(total_hours.std()) if total_players > 1 else 0.0,
+        "gini_total": float(gini(total_hours)),
+    }
+
+
+def leaderboards(df, n=LEADERBOARD_SIZE):
+    """The Leaderboard tab's four tables, {title: DataFrame}, in grid order."""
+    if df.empty:
+        return {}
+    return {
+        "Lowest Total Hours": df[df["rust_hours_total"] > 0].sort_values("rust_hours_total").head(n),
+        "Highest Total Hours": df.sort_values("rust_hours_total", ascending=False).head(n),
+        "Last 2 Weeks – Highest Hours": df.sort_values("rust_hours_2weeks", ascending=False).head(n),
+        "Last 2 Weeks – Lowest Hours": df[df["rust_hours_2weeks"] > 0].sort_values("rust_hours_2weeks").head(n),
+    }
+
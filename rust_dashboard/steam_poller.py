@@ -0,0 +1,164 @@
+import threading
+import time
+import requests
+from PySide6.QtCore import QObject, Signal, QCoreApplication
+from rust_capture.steam_api import steam_get, PLAYER_SUMMARY_URL
+
+MAX_IDS_PER_REQUEST = 100  # GetPlayerSummaries limit
+
+# Seconds until a player is polled again, by last known status
+IN_GAME_INTERVAL = 60
+ONLINE_INTERVAL = 120
+OFFLINE_INTERVAL = 5 * 60
+PRIVATE_INTERVAL = 15 * 60
+ERROR_RETRY_INTERVAL = 60
+MAX_WAIT = 5  # worker wakes at least this often to check for due players
+
+PERSONA_STATES = ["Offline", "Online", "Busy", "Away", "Snooze", "LTrade", "LPlay"]
+PRIVATE_STATUS = {"status": "Private", "game": "—", "private_profile": True}
+
+
+def status_from_player(player):
+    """Map a GetPlayerSummaries entry to the status dict shown in the table."""
+    if not player:
+        return dict(PRIVATE_STATUS)
+    private = player.get("communityvisibilitystate", 0) != 3
+    if private:
+        return dict(PRIVATE_STATUS)
+    state = player.get("personastate", 0)
+    return {
+        "status": PERSONA_STATES[state] if 0 <= state < len(PERSONA_STATES) else "Online",
+        "game": player.get("gameextrainfo", "—"),
+        "private_profile": False,
+    }
+
+
+def next_interval(info):
+    if info["private_profile"]:
+        return PRIVATE_INTERVAL
+    if info["game"] != "—":
+        return IN_GAME_INTERVAL
+    if info["status"] != "Offline":
+        return ONLINE_INTERVAL
+    return OFFLINE_INTERVAL
+
+
+def fetch_statuses(steam_ids, session=None):
+    """Fetch statuses in chunks of MAX_IDS_PER_REQUEST.
+
+    Returns {steam_id: status}. IDs from a chunk whose request failed are
+    left out, so a network error never overwrites a known status.
+    """
+    results = {}
+    for i in range(0, len(steam_ids), MAX_IDS_PER_REQUEST):
+        chunk = steam_ids[i:i + MAX_IDS_PER_REQUEST]
+        try:
+            data = steam_get(PLAYER_SUMMARY_URL, {"steamids": ",".join(chunk)}, session)
+            players = data.get("response", {}).get("players", [])
+        except Exception as e:
+            print(f"[FlaggedWatcher] Steam request failed for {len(chunk)} IDs: {e}")
+            continue
+        by_id = {p.get("steamid"): p for p in players}
+        for sid in chunk:
+            results[sid] = status_from_player(by_id.get(sid))
+    return results
+
+
+class SteamStatusPoller(QObject):
+    """Polls Steam for a set of IDs on a background thread.
+
+    Each ID has its own due time (see next_interval), so online players are
+    refreshed often and offline/private ones rarely. Only entries whose
+    status actually changed are emitted through statuses_changed. The
+    known statuses are guarded by the poller's lock; other threads read
+    copies through status() and statuses().
+    """
+
+    statuses_changed = Signal(dict)  # steam_id -> status dict
+    poll_finished = Signal(int)      # number of IDs polled this round
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._statuses = {}
+        self._due = {}  # steam_id -> monotonic time of next poll
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def set_ids(self, steam_ids):
+        """Replace the watched set; new IDs are polled immediately."""
+        with self._lock:
+            wanted = set(steam_ids)
+            for sid in list(self._due):
+                if sid not in wanted:
+                    del self._due[sid]
+                    self._statuses.pop(sid, None)
+            for sid in wanted:
+                self._due.setdefault(sid, 0)
+        self._wake.set()
+
+    def status(self, steam_id, default=None):
+        """A copy of steam_id's last known status, or default."""
+        with self._lock:
+            info = self._statuses.get(steam_id)
+            return dict(info) if info is not None else default
+
+    def statuses(self):
+        """A copy of every known status, {steam_id: status}."""
+        with self._lock:
+            return {sid: dict(info) for sid, info in self._statuses.items()}
+
+    def poll_now(self, steam_ids=None):
+        with self._lock:
+            for sid in (steam_ids if steam_ids is not None else list(self._due)):
+                if sid in self._due:
+                    self._due[sid] = 0
+        self._wake.set()
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        app = QCoreApplication.instance()
+        if app:
+            app.aboutToQuit.connect(self.stop)
+
+    def stop(self, timeout=2):
+        self._stop.set()
+        self._wake.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _run(self):
+        session = requests.Session()
+        while not self._stop.is_set():
+            now = time.monotonic()
+            with self._lock:
+                due = [sid for sid, t in self._due.items() if t <= now]
+                for sid in due:
+                    self._due[sid] = now + ERROR_RETRY_INTERVAL
+
+            if due:
+                results = fetch_statuses(due, session)
+                changed = {}
+                with self._lock:
+                    now = time.monotonic()
+                    for sid, info in results.items():
+                        if sid not in self._due:
+                            continue  # unflagged while the request was in flight
+                        self._due[sid] = now + next_interval(info)
+                        if self._statuses.get(sid) != info:
+                            self._statuses[sid] = info
+                            changed[sid] = dict(info)
+                if changed:
+                    self.statuses_changed.emit(changed)
+                self.poll_finished.emit(len(results))
+
+            with self._lock:
+                next_due = min(self._due.values(), default=None)
+            wait = MAX_WAIT if next_due is None else min(MAX_WAIT, max(0.0, next_due - time.monotonic()))
+            self._wake.wait(wait)
+            self._wake.clear()
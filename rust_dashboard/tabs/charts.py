@@ -2,11 +2,14 @@ from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 import matplotlib.pyplot as plt
 import pandas as pd
+from rust_capture.profiling import profiled
+from rust_dashboard.snapshot import as_snapshot
 
 class ChartsTab(QWidget):
     def __init__(self, df: pd.DataFrame = None):
         super().__init__()
-        self.df = df.copy() if df is not None else pd.DataFrame()
+        self.snapshot = as_snapshot(df)
+        self.df = self.snapshot.df
         self.layout = QVBoxLayout(self)
         self.setLayout(self.layout)
         self.canvas1 = None
@@ -24,11 +27,16 @@ class ChartsTab(QWidget):
         # Initial draw
         self.refresh_charts()
 
+    @profiled("tab.charts.update_data")
     def update_data(self, df: pd.DataFrame):
         """Update DataFrame and refresh charts."""
-        if df is not None and not df.empty:
-            self.df = df.copy()
-            self.refresh_charts()
+        if df is None:
+            return
+        snapshot = as_snapshot(df)
+        if snapshot is self.snapshot or snapshot.empty:
+            return  # already showing this version, or nothing to show
+        self.snapshot, self.df = snapshot, snapshot.df
+        self.refresh_charts()
 
     def refresh_charts(self):
         # Remove old canvases if they exist
@@ -43,11 +51,12 @@ class ChartsTab(QWidget):
             self.canvas2.deleteLater()
             self.canvas2 = None
 
-        if self.df.empty:
+        if self.snapshot.empty:
             return  # nothing to plot
 
-        # Top 10 by total hours
-        df_sorted_total = self.df.sort_values("rust_hours_total", ascending=False).head(10)
+        # Top 10s are the leaderboard's, shared through the snapshot
+        boards = self.snapshot.leaderboards
+        df_sorted_total = boards["Highest Total Hours"]
         fig1, ax1 = plt.subplots(figsize=(6, 4))
         ax1.barh(df_sorted_total["name"], df_sorted_total["rust_hours_total"], color="#7289DA")
         ax1.invert_yaxis()
@@ -56,7 +65,7 @@ class ChartsTab(QWidget):
         self.layout.insertWidget(1, self.canvas1)  # below first title
 
         # Top 10 by 2 weeks hours
-        df_sorted_2w = self.df.sort_values("rust_hours_2weeks", ascending=False).head(10)
+        df_sorted_2w = boards["Last 2 Weeks – Highest Hours"]
         fig2, ax2 = plt.subplots(figsize=(6, 4))
         ax2.barh(df_sorted_2w["name"], df_sorted_2w["rust_hours_2weeks"], color="#99AAB5")
         ax2.invert_yaxis()
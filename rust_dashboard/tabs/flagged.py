@@ -1,20 +1,19 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QHeaderView
-from PySide6.QtCore import QTimer
-import requests
-import json
-from pathlib import Path
-from datetime import datetime
-
-DATA_JSON = Path(r"C:\Users\GordanRamsey\Desktop\RustLobbyTracker\player_data.json")
-STEAM_API_KEY = "2D01D80224108A449432583EA81C08B3"
-CHECK_INTERVAL_MS = 5 * 60 * 1000  # 5 minutes
+from PySide6.QtCore import QCoreApplication
+from rust_dashboard.steam_poller import SteamStatusPoller, PRIVATE_STATUS
+from rust_dashboard.presence_history import PresenceHistory
+from rust_dashboard.snapshot import as_snapshot
 
 
 class FlaggedWatcherTab(QWidget):
-    def __init__(self):
+    """Live status of the flagged players of the shared DataSnapshot (its
+    `flagged` view); a new snapshot arrives through refresh_data()."""
+
+    def __init__(self, df=None):
         super().__init__()
+        self.snapshot = None
         layout = QVBoxLayout(self)
-        self.status_label = QLabel("Checking flagged profiles every 5 minutes...")
+        self.status_label = QLabel("Watching flagged profiles (online players are checked more often)...")
         layout.addWidget(self.status_label)
 
         self.table = QTableWidget(0, 5)
@@ -22,66 +21,72 @@ class FlaggedWatcherTab(QWidget):
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         layout.addWidget(self.table)
 
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.refresh_flagged_status)
-        self.timer.start(CHECK_INTERVAL_MS)
+        self.rows = {}  # steam_id -> table row
+        self.history = PresenceHistory()
 
-        self.refresh_flagged_status()
+        # Steam requests run on the poller's thread; results arrive as queued signals
+        self.poller = SteamStatusPoller(self)
+        self.poller.statuses_changed.connect(self.apply_statuses)
+        self.poller.poll_finished.connect(self.on_poll_finished)
+        self.poller.start()
+        if QCoreApplication.instance():
+            QCoreApplication.instance().aboutToQuit.connect(self.history.close)
 
-    # ---------------- JSON ---------------- #
-    def load_json_players(self):
-        try:
-            with open(DATA_JSON, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            self.status_label.setText(f"Error loading player data: {e}")
-            return []
-
-    # ---------------- STEAM API ---------------- #
-    def fetch_steam_statuses(self, steam_ids):
-        """Fetch live status from Steam API for a list of SteamIDs."""
-        if not steam_ids:
-            return {}
-        url = f"https://api.steampowered.com/ISteamUser/GetPlayerSummaries/v2/?key={STEAM_API_KEY}&steamids={','.join(steam_ids)}"
-        try:
-            data = requests.get(url, timeout=10).json()
-            players = data.get("response", {}).get("players", [])
-            results = {}
-            for sid in steam_ids:
-                player = next((p for p in players if p.get("steamid") == sid), None)
-                if not player:
-                    results[sid] = {"status": "Private", "game": "—", "private_profile": True}
-                    continue
-                private = player.get("communityvisibilitystate", 0) != 3
-                results[sid] = {
-                    "status": "Private" if private else ["Offline","Online","Busy","Away","Snooze","LTrade","LPlay"][player.get("personastate",0)],
-                    "game": "—" if private else player.get("gameextrainfo", "—"),
-                    "private_profile": private
-                }
-            return results
-        except Exception:
-            return {sid: {"status":"Private","game":"—","private_profile":True} for sid in steam_ids}
+        self.refresh_data(df)
+
+    def refresh_data(self, df):
+        snapshot = as_snapshot(df)
+        if snapshot is self.snapshot:
+            return  # already showing this version
+        self.snapshot = snapshot
+        self.refresh_flagged_status()
 
     # ---------------- UPDATE TABLE ---------------- #
     def refresh_flagged_status(self):
-        """Read JSON, fetch Steam API, and update table."""
-        players_json = self.load_json_players()
-        flagged = [p for p in players_json if p.get("flags", {}).get("flagged", False)]
-        steam_ids = [p["steam_id"] for p in flagged if "steam_id" in p]
-
-        statuses = self.fetch_steam_statuses(steam_ids)
+        """Rebuild the table from the snapshot's flagged players and hand
+        them to the poller."""
+        flagged = self.snapshot.flagged
 
+        self.rows = {}
         self.table.setRowCount(len(flagged))
-        for i, p in enumerate(flagged):
-            sid = p.get("steam_id", "—")
-            name = p.get("name", "Unknown")
-            flagged_at = p.get("flags", {}).get("flagged_at", "—")
-            info = statuses.get(sid, {"status":"Private","game":"—","private_profile":True})
+        for i, p in enumerate(flagged.itertuples(index=False)):
+            sid = p.steam_id
+            name = p.name or "Unknown"
+            flagged_at = p.flagged_at or "—"
+            info = self.poller.status(sid, PRIVATE_STATUS)
 
+            self.rows[sid] = i
             self.table.setItem(i, 0, QTableWidgetItem(name))
             self.table.setItem(i, 1, QTableWidgetItem(sid))
-            self.table.setItem(i, 2, QTableWidgetItem(info["status"]))
-            self.table.setItem(i, 3, QTableWidgetItem(info["game"]))
+            self.set_status_cells(i, sid, info)
             self.table.setItem(i, 4, QTableWidgetItem(flagged_at.replace("T", " ")))
 
-        self.status_label.setText(f"Updated — {len(flagged)} flagged total.")
+        self.poller.set_ids(list(self.rows))
+        self.status_label.setText(f"Watching {len(flagged)} flagged players...")
+
+    def refresh_single_player(self, steam_id):
+        """Called when a player was just flagged: poll it now. Its row comes
+        with the snapshot the Table tab publishes for the change."""
+        self.poller.poll_now([steam_id])
+
+    def apply_statuses(self, changes):
+        """Record transitions and repaint only rows whose status changed."""
+        self.history.record_many(changes)
+        for sid, info in changes.items():
+            row = self.rows.get(sid)
+            if row is None:
+                continue
+            self.set_status_cells(row, sid, info)
+
+    def set_status_cells(self, row, sid, info):
+        status_item = QTableWidgetItem(info["status"])
+        week = self.history.online_hours_per_day(sid, days=7)
+        status_item.setToolTip(
+            f"Online last 7 days: {sum(h for _, h in week):.1f} h\n"
+            + "\n".join(f"{day}: {h:.1f} h" for day, h in week)
+        )
+        self.table.setItem(row, 2, status_item)
+        self.table.setItem(row, 3, QTableWidgetItem(info["game"]))
+
+    def on_poll_finished(self, polled):
+        self.status_label.setText(f"Updated {polled} — {len(self.rows)} flagged total.")
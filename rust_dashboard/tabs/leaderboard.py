@@ -2,59 +2,48 @@ from PySide6.QtWidgets import QWidget, QGridLayout, QTableWidget, QTableWidgetIt
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QColor, QCursor, QGuiApplication
 import webbrowser
-import pandas as pd
+from rust_capture.profiling import profiled
+from rust_dashboard.snapshot import as_snapshot
 class LeaderboardTab(QWidget):
     def __init__(self, df=None):
         super().__init__()
-        self.df = df.copy() if df is not None else pd.DataFrame()
+        self.snapshot = None
         self.main_layout = QGridLayout(self)
         self.main_layout.setSpacing(30)
         self.main_layout.setContentsMargins(20, 20, 20, 20)
         self.main_layout.setAlignment(Qt.AlignCenter)
         self.widgets = []  # track dynamic widgets
-        self.refresh_data(self.df)
+        self.refresh_data(df)
 
+    @profiled("tab.leaderboard.update_data")
     def update_data(self, df):
         """Update the DataFrame and refresh tables."""
         if df is not None:
-            self.df = df.copy()
-            self.refresh_data(self.df)
+            self.refresh_data(df)
 
+    @profiled("tab.leaderboard.refresh_data")
     def refresh_data(self, df):
+        snapshot = as_snapshot(df)
+        if snapshot is self.snapshot:
+            return  # already showing this version
+        self.snapshot, self.df = snapshot, snapshot.df
+
         # Clear old widgets
         for w in self.widgets:
             self.main_layout.removeWidget(w)
             w.setParent(None)
         self.widgets.clear()
 
-        if df.empty:
+        if snapshot.empty:
             return
 
-        self.df = df.copy()
-
-        # Top-left: Lowest Total Hours (exclude 0)
-        low_total_df = self.df[self.df['rust_hours_total'] > 0].sort_values('rust_hours_total').head(10)
-        self.table_low_total = self.create_table(low_total_df, "Lowest Total Hours")
-        self.main_layout.addWidget(self.table_low_total, 0, 0, alignment=Qt.AlignCenter)
-        self.widgets.append(self.table_low_total)
-
-        # Top-right: Highest Total Hours
-        high_total_df = self.df.sort_values('rust_hours_total', ascending=False).head(10)
-        self.table_high_total = self.create_table(high_total_df, "Highest Total Hours")
-        self.main_layout.addWidget(self.table_high_total, 0, 1, alignment=Qt.AlignCenter)
-        self.widgets.append(self.table_high_total)
-
-        # Bottom-left: Last 2 Weeks – Highest Hours
-        last2w_high_df = self.df.sort_values('rust_hours_2weeks', ascending=False).head(10)
-        self.table_last2w_high = self.create_table(last2w_high_df, "Last 2 Weeks – Highest Hours")
-        self.main_layout.addWidget(self.table_last2w_high, 1, 0, alignment=Qt.AlignCenter)
-        self.widgets.append(self.table_last2w_high)
-
-        # Bottom-right: Last 2 Weeks – Lowest Hours (exclude 0)
-        last2w_low_df = self.df[self.df['rust_hours_2weeks'] > 0].sort_values('rust_hours_2weeks').head(10)
-        self.table_last2w_low = self.create_table(last2w_low_df, "Last 2 Weeks – Lowest Hours")
-        self.main_layout.addWidget(self.table_last2w_low, 1, 1, alignment=Qt.AlignCenter)
-        self.widgets.append(self.table_last2w_low)
+        # Lowest / highest total hours on top, last 2 weeks below (zero hours left out of "lowest")
+        attrs = ["table_low_total", "table_high_total", "table_last2w_high", "table_last2w_low"]
+        for i, ((title, subset), attr) in enumerate(zip(snapshot.leaderboards.items(), attrs)):
+            table = self.create_table(subset, title)
+            setattr(self, attr, table)
+            self.main_layout.addWidget(table, i // 2, i % 2, alignment=Qt.AlignCenter)
+            self.widgets.append(table)
 
     def create_table(self, df_subset, title):
         container = QWidget()
@@ -4,49 +4,26 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QCursor, QGuiApplication
-import pandas as pd
-import json
-from pathlib import Path
-
-DATA_JSON = Path(r"C:\Users\GordanRamsey\Desktop\RustLobbyTracker\player_data.json")
+from rust_capture.profiling import profiled
+from rust_dashboard.snapshot import as_snapshot
 
 class SearchTab(QWidget):
     def __init__(self, df=None):
         super().__init__()
-        self.df = df.copy() if df is not None else pd.DataFrame()
+        self.snapshot = as_snapshot(df)
+        self.df = self.snapshot.df
         self.init_ui()
-        self.start_json_watcher()
 
-    # Called when JSON updates
+    # Called by the dashboard's JSONWatcher when the JSON updates
+    @profiled("tab.search.refresh_data")
     def refresh_data(self, df):
         """Update tab with new data."""
-        self.df = df.copy()
+        snapshot = as_snapshot(df)
+        if snapshot is self.snapshot:
+            return  # already showing this version
+        self.snapshot, self.df = snapshot, snapshot.df
         self.update_results()
 
-    def start_json_watcher(self):
-        """Watch JSON file and refresh automatically."""
-        self.last_mtime = 0
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.check_json)
-        self.timer.start(1000)  # every second
-
-    def check_json(self):
-        try:
-            if DATA_JSON.exists():
-                mtime = DATA_JSON.stat().st_mtime
-                if mtime != self.last_mtime:
-                    self.last_mtime = mtime
-                    with open(DATA_JSON, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                    df = pd.DataFrame(data)
-                    # Ensure essential columns exist
-                    for col in ["rust_hours_total", "rust_hours_2weeks", "flags"]:
-                        if col not in df.columns:
-                            df[col] = 0 if "hours" in col else [{}]
-                    self.refresh_data(df)
-        except Exception as e:
-            print("[Watcher] Error:", e)
-
     def show_copied_message(self, parent_widget):
         msg = QLabel("Copied!", parent_widget)
         msg.setStyleSheet("""
@@ -152,17 +129,13 @@ class SearchTab(QWidget):
                 w.setParent(None)
                 w.deleteLater()
 
+    @profiled("tab.search.update_results")
     def update_results(self):
         self.clear_results()
         text = self.search_input.text().lower() if self.search_input.text() else ""
         if self.df.empty:
             return
 
-        # Add missing columns to avoid errors
-        for col in ["rust_hours_total", "rust_hours_2weeks"]:
-            if col not in self.df.columns:
-                self.df[col] = 0
-
         matches = self.df[
             self.df["name"].str.lower().str.contains(text) |
             self.df["steam_id"].astype(str).str.contains(text)
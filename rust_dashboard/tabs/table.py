@@ -3,20 +3,31 @@ from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QColor
 from functools import partial
 from datetime import datetime
-import json
-from pathlib import Path
 import pandas as pd
+from rust_capture.profiling import profiled
+from rust_capture.paths import PLAYER_JSON, PLAYER_JSON_LOCK
+from rust_capture.file_lock import file_lock
+from rust_capture.player_store import read_players, write_players
+from rust_dashboard.snapshot import as_snapshot
 
-DATA_JSON = Path(r"C:\Users\GordanRamsey\Desktop\RustLobbyTracker\player_data.json")
+DATA_JSON = PLAYER_JSON
 
 
 def set_flag(steam_id, flagged):
+    """Flag or unflag a player in the JSON, under the same write lock as
+    getPlayerData.py; returns the players written, or None if it failed."""
     try:
-        with open(DATA_JSON, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except Exception:
-        data = []
+        with file_lock(PLAYER_JSON_LOCK):
+            data = read_players(DATA_JSON)
+            _set_flag(data, steam_id, flagged)
+            write_players(data, DATA_JSON)
+    except (OSError, ValueError) as e:  # TimeoutError is an OSError
+        print(f"[TableTab] Could not save flag for {steam_id}: {e}")
+        return None
+    return data
 
+
+def _set_flag(data, steam_id, flagged):
     player = next((p for p in data if p.get("steam_id") == steam_id), None)
     if not player:
         player = {"steam_id": steam_id, "name": "Unknown", "flags": {}}
@@ -29,23 +40,24 @@ def set_flag(steam_id, flagged):
     else:
         player["flags"].pop("flagged_at", None)
 
-    with open(DATA_JSON, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
-
 
 class TableTab(QWidget):
     flagUpdated = Signal(str, bool)  # steam_id, new_flag_value
 
     def __init__(self, df: pd.DataFrame = None):
         super().__init__()
-        self.df = df.copy() if df is not None else pd.DataFrame()
+        self.snapshot = as_snapshot(df)
+        self.df = self.snapshot.df
         self._suppress_checkbox = False
         self.init_ui()
 
-        # Ensure dataframe has these columns for safe updating
-        for col in ["flags", "flagged", "private_profile"]:
-            if col not in self.df.columns:
-                self.df[col] = [{} if col == "flags" else False for _ in range(len(self.df))]
+    @profiled("tab.table.refresh_data")
+    def refresh_data(self, df):
+        snapshot = as_snapshot(df)
+        if snapshot is self.snapshot:
+            return  # already showing this version
+        self.snapshot, self.df = snapshot, snapshot.df
+        self.update_table()
 
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -60,33 +72,26 @@ class TableTab(QWidget):
 
         self.update_table()
 
-    def is_flagged(self, steam_id):
-        """Check JSON directly for current flagged status."""
-        try:
-            with open(DATA_JSON, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            for p in data:
-                if p.get("steam_id") == steam_id:
-                    return p.get("flags", {}).get("flagged", False)
-        except Exception:
-            return False
-        return False
-
     def toggle_flag(self, steam_id, state):
-        flagged = state == Qt.Checked
-        set_flag(steam_id, flagged)  # persists JSON
+        flagged = Qt.CheckState(state) == Qt.Checked  # stateChanged passes an int
+        data = set_flag(steam_id, flagged)  # persists JSON
+        if data is None:
+            return
 
         print(f"[TableTab] toggled {steam_id} → {flagged}")
 
-        # Refresh the flagged watcher tab
-        if hasattr(self.parent(), "tabs") and "Flagged" in self.parent().tabs:
-            flagged_tab = self.parent().tabs["Flagged"]
-            if flagged:
-                flagged_tab.refresh_single_player(steam_id)
-            else:
-                flagged_tab.refresh_flagged_status()
+        # Publish the players just written rather than waiting for the JSON
+        # watcher's next poll, so the Flagged tab shows the change right away
+        dashboard = self.parent()
+        if hasattr(dashboard, "refresh_data"):
+            dashboard.refresh_data(data)
+
+        # Poll a newly flagged player now
+        if flagged and hasattr(dashboard, "tabs") and "Flagged" in dashboard.tabs:
+            dashboard.tabs["Flagged"].refresh_single_player(steam_id)
 
 
+    @profiled("tab.table.update_table")
     def update_table(self):
         if self.df.empty:
             self.table.clear()
@@ -120,7 +125,7 @@ class TableTab(QWidget):
 
             checkbox = QCheckBox()
             self._suppress_checkbox = True
-            checkbox.setChecked(self.is_flagged(row.steam_id))
+            checkbox.setChecked(bool(row.flagged))
             self._suppress_checkbox = False
             checkbox.stateChanged.connect(partial(self.toggle_flag, row.steam_id))
             self.table.setCellWidget(i, 4, checkbox)
@@ -1,129 +1,157 @@
-import threading
 import time
 import os
-import csv
-import keyboard
-from PIL import Image, ImageGrab, ImageOps, ImageFilter
-import re
-import tempfile
+from PIL import Image, ImageGrab
 import subprocess
-from pathlib import Path
-from PySide6.QtCore import QObject, QTimer, Qt, QMetaObject, Q_ARG
-from PySide6.QtWidgets import QWidget, QApplication
-from PySide6.QtGui import QPainter, QColor
+from rust_capture.preprocess import preprocess, UPSCALE_FACTOR
+from rust_capture.ocr_backends import get_backend, child_cpu
+from rust_capture.change_detect import FrameChangeDetector
+from rust_capture.scroll import ScrollTracker
+from rust_capture.parsing import parse_words
+from rust_capture.pipeline import OCRPipeline, OCR_WORKERS
+from rust_capture.digits import read_words, line_cache
+from rust_capture.capture_log import CaptureLogWriter
+from rust_capture.paths import MUTE_CSV, PLAYER_JSON
+from rust_capture.sources import open_source, frame_size, crop_rows, to_image, REPLAY_PATH
+from rust_capture.consensus import IDConsensus
+from rust_capture.scheduler import CaptureScheduler
+from rust_capture.metrics import metrics, timer, record, count
+from rust_capture.profiling import profiler, section, PROFILE_HOTKEY
+from rust_capture.engine import get_engine, STARTING, STOPPING, IDLE
+from rust_capture.regions import RegionOCR, MULTI_REGION, OVERLAP_PIXELS, column_boxes, column_regions, regions_from_boxes
+from rust_capture import calibration as calib
 
 # --- Globals ---
-running = False
-final_results = {}  # steamid64 -> name
 debug_overlay = None
+capture_log = None  # CaptureLogWriter for SAVE_CSV, opened on first save
+capture_source = None  # CaptureSource, opened on first capture
 
-SAVE_CSV = r"C:\Users\GordanRamsey\Desktop\RustLobbyTracker\mute_list.csv"
-DATA_JSON = Path(r"C:\Users\GordanRamsey\Desktop\RustLobbyTracker\player_data.json")
-
-LEFT, TOP, RIGHT, BOTTOM = 580, 385, 1877, 1178
-UPSCALE_FACTOR = 2
-
-steamid_re = re.compile(r"7656119\d{10}")
-TESSERACT_CMD = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-
-# --- Ensure CSV exists ---
-if not os.path.exists(SAVE_CSV):
-    with open(SAVE_CSV, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["name", "steamid", "profile_url"])
-    print(f"[INFO] Created {SAVE_CSV}")
-
-
-# --- Overlay ---
-class OCRDebugOverlay(QWidget):
-    def __init__(self, regions):
-        super().__init__()
-        self.regions = regions
-        self.setWindowFlags(
-            Qt.FramelessWindowHint |
-            Qt.WindowStaysOnTopHint |
-            Qt.Tool |
-            Qt.WindowTransparentForInput
-        )
-        self.setAttribute(Qt.WA_TranslucentBackground)
-        screen = QApplication.primaryScreen()
-        self.setGeometry(0, 0, screen.size().width(), screen.size().height())
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update)
-        self.timer.start(50)
-
-    def paintEvent(self, event):
-        if not self.regions:
-            return
-        with QPainter(self) as painter:
-            painter.setPen(Qt.NoPen)
-            painter.setBrush(QColor(255, 0, 0, 50))
-            left = min(r[0] for r in self.regions)
-            top = min(r[1] for r in self.regions)
-            right = max(r[2] for r in self.regions)
-            bottom = max(r[3] for r in self.regions)
-            painter.drawRect(left, top, right - left, bottom - top)
-
-    def update_regions(self, regions):
-        self.regions = regions
-        self.update()
+SAVE_CSV = str(MUTE_CSV)  # created with its header by the first save
+DATA_JSON = PLAYER_JSON
 
+DEFAULT_BOX = (580, 385, 1877, 1178)  # hand-measured; calibrateScreen.py --auto stores tighter boxes
+LEFT, TOP, RIGHT, BOTTOM = DEFAULT_BOX
+OCR_REGIONS = None  # mute list columns, relative to the capture box (None = one full-page pass)
+ROW_PITCH = 0  # px between list rows, from the calibration (0 = unknown)
+calibration = None  # rust_capture.calibration.Calibration in use, if any
+calibrated_for = False  # screen resolution the boxes were last chosen for (False: not yet)
 
 # --- Helpers ---
 def capture_region():
-    return ImageGrab.grab(bbox=(LEFT, TOP, RIGHT, BOTTOM))
+    """Next frame of the capture box: the screen, or RUST_REPLAY's archive
+    (recorded to RUST_RECORD when set, see rust_capture.sources)."""
+    global capture_source
+    if capture_source is None:
+        capture_source = open_source((LEFT, TOP, RIGHT, BOTTOM))
+    return capture_source.grab()
+
+
+def close_capture_source():
+    global capture_source
+    if capture_source is not None:
+        capture_source.close()
+        capture_source = None
+
+
+def apply_calibration(resolution=None):
+    """Point capture and OCR at the stored calibration for the current screen
+    resolution (the hand-set DEFAULT_BOX when there is none). Called again
+    at each capture start, so a resolution change picks up its own boxes."""
+    resolution = resolution or calib.screen_resolution()
+    found = calib.load(resolution)
+    if resolution == calibrated_for and found == calibration:
+        return calibration
+    return use_calibration(found, resolution)
+
+
+def use_calibration(found, resolution):
+    global LEFT, TOP, RIGHT, BOTTOM, OCR_REGIONS, ROW_PITCH, calibration, calibrated_for
+    ROW_PITCH = found.row_pitch if found else 0
+    if found:
+        LEFT, TOP, RIGHT, BOTTOM = found.box
+        OCR_REGIONS = regions_from_boxes(found.columns, (LEFT, TOP)) if MULTI_REGION else None
+        print(f"[CALIBRATION] {calib.resolution_key(found.resolution)}: capture box {found.box}, {len(found.columns)} columns")
+    else:
+        print(f"[CALIBRATION] No calibration for {resolution}; using {DEFAULT_BOX} (run calibrateScreen.py --auto)")
+        LEFT, TOP, RIGHT, BOTTOM = DEFAULT_BOX
+        OCR_REGIONS = column_regions(RIGHT - LEFT, BOTTOM - TOP) if MULTI_REGION else None
+    if found != calibration:
+        close_capture_source()  # reopened on the new box at the next capture
+    calibration, calibrated_for = found, resolution
+    return calibration
+
+
+def verify_calibration():
+    """Check the first frame of the capture box against the calibration.
+    When there is none, or the box doesn't show the list (a moved or
+    resized panel), detect the list on the whole screen and use what is
+    found; it is stored only if the resolution had no calibration yet."""
+    frame = capture_region()
+    if frame is None or (calibration and calib.check(frame, calibration)):
+        return calibration
+    reason = "no calibration" if calibration is None else f"capture box {calibration.box} doesn't show the list"
+    # a replay only has the recorded box
+    screen, origin = frame, tuple((getattr(capture_source, "bbox", None) or (LEFT, TOP))[:2])
+    if not REPLAY_PATH:
+        try:
+            screen, origin = ImageGrab.grab(), (0, 0)
+        except Exception as e:
+            print(f"[CALIBRATION] Can't grab the screen to detect the list: {e}")
+            return calibration
+    found = calib.detect(screen, origin=origin, resolution=calibrated_for or None)
+    if found is not None:
+        (l, t, r, b), (ox, oy) = found.box, origin
+        if not calib.check(to_image(screen).crop((l - ox, t - oy, r - ox, b - oy)), found):
+            found = None
+    if found is None:
+        print(f"[CALIBRATION] {reason}, and no mute list found on screen; keeping {(LEFT, TOP, RIGHT, BOTTOM)}")
+        return calibration
+    print(f"[CALIBRATION] {reason}; detected the list at {found.box}")
+    if calibration is None:
+        calib.save(found)
+    return use_calibration(found, calibrated_for)
+
+
+def region_boxes():
+    """Screen boxes of the OCR columns, for the debug overlay."""
+    if OCR_REGIONS:
+        return [(LEFT + l, TOP + t, LEFT + r, TOP + b) for _, (l, t, r, b), _ in OCR_REGIONS]
+    return column_boxes(LEFT, TOP, RIGHT, BOTTOM)
 
 
-def preprocess(img):
-    gray = ImageOps.grayscale(img)
-    gray = ImageOps.autocontrast(gray, cutoff=2)
-    gray = gray.filter(ImageFilter.UnsharpMask(radius=1, percent=150, threshold=3))
-    if UPSCALE_FACTOR > 1:
-        w, h = gray.size
-        gray = gray.resize((w * UPSCALE_FACTOR, h * UPSCALE_FACTOR), Image.LANCZOS)
-    return gray
+def ocr_full_tsv(img):
+    """Full-page OCR through the configured backend (see rust_capture.ocr_backends)."""
+    return get_backend().image_to_words(img, psm=3)
 
 
-def clean_name(name_raw):
-    return re.sub(r"[^A-Za-z0-9_\- ]", " ", name_raw).strip()
+def split_columns(img):
+    """Left and right column images of a preprocessed capture, overlap included."""
+    if not hasattr(img, "crop"):
+        img = Image.fromarray(img)
+    w, h = img.size
+    return tuple(img.crop(box) for box in column_boxes(0, 0, w, h, overlap=OVERLAP_PIXELS * UPSCALE_FACTOR))
 
 
-def ocr_full_tsv(img):
-    tmp_file = os.path.join(tempfile.gettempdir(), "tmp_full.png")
-    img.save(tmp_file)
-    out_base = tmp_file + "_out"
-    try:
-        subprocess.run(
-            [TESSERACT_CMD, tmp_file, out_base, "--oem", "1", "--psm", "3", "tsv"],
-            check=True,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
-        )
-        words = []
-        with open(out_base + ".tsv", "r", encoding="utf-8", errors="ignore") as f:
-            for line in f.readlines()[1:]:
-                parts = line.strip().split("\t")
-                if len(parts) < 12 or not parts[11].strip():
-                    continue
-                words.append({
-                    "text": parts[11].strip(),
-                    "x": int(parts[6]),
-                    "y": int(parts[7]),
-                    "w": int(parts[8]),
-                    "h": int(parts[9])
-                })
-        return words
-    except subprocess.CalledProcessError:
-        return []
-
-
-def save_csv():
-    with open(SAVE_CSV, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["name", "steamid", "profile_url"])
-        for sid, name in final_results.items():
-            writer.writerow([name, sid, f"https://steamcommunity.com/profiles/{sid}"])
-    print(f"[INFO] Saved {len(final_results)} entries to {SAVE_CSV}")
+def ocr_image(img, psm=3):
+    """Words in a preprocessed image, read with the given page-segmentation mode."""
+    return read_words(img, get_backend(), include_names=True, psm=psm)
+
+
+def parse_ocr(words):
+    """[(name, steamid)] from ocr_image() words."""
+    return [(name, sid) for sid, name, _ in parse_words(words, include_names=True)]
+
+
+def save_csv(entries=None):
+    """Append [(sid, name)] to SAVE_CSV; with no entries, just fsync what is pending."""
+    global capture_log
+    if capture_log is None:
+        capture_log = CaptureLogWriter(SAVE_CSV)
+    if entries is None:
+        capture_log.sync()
+        return
+    written = capture_log.append(entries)
+    if written:
+        print(f"[INFO] Appended {written} entries to {SAVE_CSV}")
 
 
 def log_capture(sid, name=None):
@@ -135,57 +163,185 @@ def log_capture(sid, name=None):
 
 # --- Capture Loop ---
 def capture_loop(controller, include_names=False):
+    apply_calibration()
+    verify_calibration()
+    if OCR_WORKERS > 0:
+        return pipelined_capture_loop(controller, include_names)
+
     global debug_overlay
     print("\n[+] Capture started — scroll the mute list in Rust...\n")
-
-    while controller.running:
-        img = preprocess(capture_region())
-        words = ocr_full_tsv(img)
-        absolute_boxes = []
-        new_entries = 0
-
-        steam_words = [w for w in words if steamid_re.fullmatch(w["text"])]
-
-        for steam in steam_words:
-            sid = steam["text"]
-            sx, sy, sw, sh = steam["x"], steam["y"], steam["w"], steam["h"]
-
-            name = sid
-            if include_names:
-                candidates = [
-                    w for w in words
-                    if w["y"] < sy and sy - w["y"] < 90
-                    and abs((w["x"] + w["w"]//2) - (sx + sw//2)) < 300
-                ]
-                if candidates:
-                    name = clean_name(sorted(candidates, key=lambda w: sy - w["y"])[0]["text"])
-
-            if sid not in final_results:
-                final_results[sid] = name
-                new_entries += 1
+    detector = FrameChangeDetector()
+    scroll = ScrollTracker(row_pitch=ROW_PITCH)
+    region_ocr = RegionOCR(OCR_REGIONS, include_names) if OCR_REGIONS else None
+    consensus = IDConsensus()
+    scheduler = CaptureScheduler(cpu_clock=time.thread_time)  # this thread's CPU; OCR done off it is add_work()ed
+    scroll_pos = 0  # running scroll offset: frame row + scroll_pos = list row
+    absolute_boxes = []
+
+    def step(start):
+        """One capture iteration; returns whether the frame changed."""
+        nonlocal scroll_pos, absolute_boxes
+        with timer("capture"):
+            raw = capture_region()
+        with timer("detect"):
+            changed = detector.changed(raw)
+        if not changed:
+            return False  # same frame as last OCR pass, nothing new to read
+
+        # Only OCR the band the scroll revealed; the rest was read last pass,
+        # except rows of IDs still waiting for consensus votes
+        with timer("scroll"):
+            band = scroll.plan(raw)
+        dy = scroll.last_offset or 0
+        scroll_pos += dy
+        height = frame_size(raw)[1]
+        band = consensus.plan_band(band, scroll_pos, height)
+        if band is None:
+            return True  # moved, but nothing new revealed
+        top, bottom = band
+        # Keep overlay boxes of rows that only moved; the band gets fresh ones
+        absolute_boxes = [
+            (l, t - dy, r, b - dy) for l, t, r, b in absolute_boxes
+            if t - dy >= TOP and b - dy <= TOP + height
+            and (b - dy <= TOP + top or t - dy >= TOP + bottom)
+        ]
+        raw = crop_rows(raw, top, bottom)  # a view: OCR'd below, before the next grab
+
+        if region_ocr:
+            with timer("ocr"):  # preprocess + OCR + parse, per column in parallel
+                entries = region_ocr.read(raw, top)
+        else:
+            entries = []
+            with timer("preprocess"):
+                img = preprocess(raw)
+            with timer("ocr"):
+                words = read_words(img, get_backend(), include_names)
+            with timer("parse"):
+                parsed = parse_words(words, include_names)
+            for sid, name, w in parsed:
+                # word boxes are in upscaled band coordinates
+                x0, y0 = w["x"] // UPSCALE_FACTOR, top + w["y"] // UPSCALE_FACTOR
+                box = (x0, y0, x0 + w["w"] // UPSCALE_FACTOR, y0 + w["h"] // UPSCALE_FACTOR)
+                entries.append((sid, name, box, w.get("conf", 0)))
+        new_entries = []
+
+        # Single-frame reads are only candidates until consensus confirms them
+        with timer("consensus"):
+            committed = consensus.observe(entries, scroll_pos)
+        for sid, name in committed:
+            if final_results.add(sid, name):
+                new_entries.append((sid, name))
                 log_capture(sid, name if include_names else None)
-
-            absolute_boxes.append((LEFT + sx, TOP + sy, LEFT + sx + sw, TOP + sy + sh))
+        for _, _, (l, t, r, b), _ in entries:
+            absolute_boxes.append((LEFT + l, TOP + t, LEFT + r, TOP + b))
 
         if debug_overlay:
             debug_overlay.update_regions(absolute_boxes)
+            if region_ocr:
+                debug_overlay.update_timings(region_ocr.timings)
 
-        if new_entries > 0:
-            save_csv()
+        if new_entries:
+            count("ids.committed", len(new_entries))
+            with timer("save_csv"):
+                save_csv(new_entries)
             try:
-                subprocess.Popen(["python", "getPlayerData.py"])
+                with timer("fetch_spawn"):
+                    subprocess.Popen(["python", "getPlayerData.py"])
             except Exception:
                 pass
 
-        time.sleep(0.15)
+        record("frame", time.perf_counter() - start)
+        return True
 
+    def offloaded_cpu():
+        """CPU the thread clock misses: region pool threads, tesseract subprocesses."""
+        return child_cpu() + (region_ocr.cpu if region_ocr else 0.0)
+
+    while controller.running:
+        start, cpu_start, offloaded_start = time.perf_counter(), scheduler.cpu_clock(), offloaded_cpu()
+        with section("capture_loop"):
+            changed = step(start)
+        offloaded = offloaded_cpu() - offloaded_start
+        if offloaded:
+            scheduler.add_work(offloaded)
+        scheduler.wait(changed, start, cpu_start)  # outside the section: sleeping isn't capture work
+
+    close_capture_source()
     print("\n[+] Capture stopped.")
+    print(f"[OCR] {detector.stats()}")
+    print(f"[OCR] OCR'd {scroll.ocr_fraction * 100:.0f}% of captured rows")
+    print(f"[OCR] Consensus: {consensus.stats()}")
+    print(f"[OCR] Scheduler: {scheduler.stats()}")
+    if metrics.enabled:
+        print("[METRICS]\n" + metrics.format())
+        metrics.dump()
+    if region_ocr:
+        print(f"[OCR] Regions: {region_ocr.stats()}")
+        region_ocr.close()
+    if line_cache():
+        print(f"[OCR] Line cache: {line_cache().stats()}")
     save_csv()
 
 
+def pipelined_capture_loop(controller, include_names=False):
+    """Same job as capture_loop, with OCR spread over RUST_OCR_WORKERS processes."""
+    print(f"\n[+] Capture started ({OCR_WORKERS} OCR workers) — scroll the mute list in Rust...\n")
+
+    def on_new(entries):
+        for sid, name in entries:
+            log_capture(sid, name if include_names else None)
+        save_csv(entries)
+        try:
+            subprocess.Popen(["python", "getPlayerData.py"])
+        except Exception:
+            pass
+
+    def on_boxes(top, boxes):
+        if debug_overlay:
+            debug_overlay.update_regions([
+                (LEFT + l, TOP + t, LEFT + r, TOP + b) for l, t, r, b in boxes
+            ])
+
+    def on_timings(timings):
+        if debug_overlay:
+            debug_overlay.update_timings(timings)
+
+    pipeline = OCRPipeline(
+        capture_region, results=final_results, on_new=on_new, on_boxes=on_boxes,
+        workers=OCR_WORKERS, include_names=include_names,
+        regions=OCR_REGIONS, on_timings=on_timings, row_pitch=ROW_PITCH,
+    )
+    pipeline.start()
+    while controller.running:
+        time.sleep(0.1)
+    pipeline.stop()
+
+    close_capture_source()
+    print("\n[+] Capture stopped.")
+    print(f"[OCR] {pipeline.stats()}")
+    print(f"[OCR] Consensus: {pipeline.consensus.stats()}")
+    print(f"[OCR] Scheduler: {pipeline.scheduler.stats()}")
+    if metrics.enabled:
+        print("[METRICS]\n" + metrics.format())
+        metrics.dump()
+    save_csv()
+
+
+# --- Engine ---
+# One capture loop per process: hotkeys, overlay buttons and the dashboard all go through it
+engine = get_engine(capture_loop)
+final_results = engine.results  # steamid64 -> name
+
+
 # --- Hotkeys / Thread ---
-def start_ocr_thread(controller):
+def start_ocr_thread(capture=None):
     global debug_overlay
+    # Qt and keyboard load here, not at import: OCR worker processes
+    # re-import the main module under spawn (Windows), e.g. this script
+    import keyboard
+    from PySide6.QtCore import QObject, QMetaObject, Qt, Q_ARG
+    from rust_dashboard.ocr_overlay import OCRDebugOverlay
+    capture = capture or engine
     if not debug_overlay:
         debug_overlay = OCRDebugOverlay([])
         debug_overlay.hide()
@@ -201,22 +357,24 @@ def start_ocr_thread(controller):
 
     overlay_controller = OverlayController()
 
-    def start_capture():
-        if not controller.running:
-            controller.running = True
+    def on_state(state):
+        if state == STARTING:
             overlay_controller.toggle(True)
-            threading.Thread(target=capture_loop, args=(controller, True), daemon=True).start()
+        elif state in (STOPPING, IDLE):
+            overlay_controller.toggle(False)
+
+    capture.on_state(on_state)
+
+    def start_capture():
+        if capture.start():
             print("[HOTKEY] F8 → Capture started")
 
     def stop_capture():
-        if controller.running:
-            controller.running = False
-            overlay_controller.toggle(False)
+        if capture.stop():
             print("[HOTKEY] F9 → Capture stopped")
 
     def exit_program():
-        controller.running = False
-        overlay_controller.toggle(False)
+        capture.stop()
         print("[HOTKEY] F10 → Exit")
         time.sleep(0.2)
         os._exit(0)
@@ -224,15 +382,15 @@ def start_ocr_thread(controller):
     keyboard.add_hotkey("F8", start_capture)
     keyboard.add_hotkey("F9", stop_capture)
     keyboard.add_hotkey("F10", exit_program)
+    keyboard.add_hotkey(PROFILE_HOTKEY, profiler.toggle)
 
 
 # --- Run ---
 if __name__ == "__main__":
+    from PySide6.QtWidgets import QApplication
     app = QApplication([])
 
-    from main import OCRController
-    ocr_controller = OCRController()
-
-    start_ocr_thread(ocr_controller)
+    engine.include_names = True
+    start_ocr_thread()
 
     app.exec()
\ No newline at end of file